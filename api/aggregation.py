@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ACCUMULATORS = ('$count', '$sum', '$min', '$max', '$avg')
+
+Specs = Dict[str, Tuple[str, Optional[str]]]
+
+
+def normalize(group_by: List[str], aggregates: Dict) -> Specs:
+    """
+    Brings the aggregates to the ``{name: (accumulator, column_id)}`` form.
+
+    Aggregates are named accumulators as in a Mongo ``$group`` stage:
+    ``{'rows': {'$count': {}}, 'total': {'$sum': 'co2'}, 'low': {'$min': 'co2'}}``.
+    ``$count`` of a column counts its non-null values, of ``{}`` the rows.
+    """
+    specs = {}
+    for name, aggregate in aggregates.items():
+        if not isinstance(aggregate, dict) or len(aggregate) != 1:
+            raise ValueError(f'Aggregate {name} must have one accumulator')
+        (accumulator, column_id), = aggregate.items()
+        if accumulator not in ACCUMULATORS:
+            raise ValueError(f'Unsupported accumulator {accumulator}')
+        if not isinstance(column_id, str):
+            if accumulator != '$count':
+                raise ValueError(f'{accumulator} needs a column')
+            column_id = None
+        if name in group_by:
+            raise ValueError(f'Aggregate {name} shadows a group-by column')
+        specs[name] = accumulator, column_id
+    return specs
+
+
+def column_ids(group_by: List[str], specs: Specs) -> List[str]:
+    """The columns the aggregation reads."""
+    return list(dict.fromkeys(group_by + [column_id for _, column_id in specs.values() if column_id]))
+
+
+def reduce(accumulator: str, values: Sequence):
+    """One accumulator over the values of a group; nulls are skipped, the builtins do the numeric work."""
+    # fixed-width columns of mapped tables have no nulls
+    present = values if isinstance(values, memoryview) else [value for value in values if value is not None]
+    if accumulator == '$count':
+        return len(present)
+    if accumulator == '$sum':
+        return sum(present)
+    if not present:
+        return None
+    if accumulator == '$min':
+        return min(present)
+    if accumulator == '$max':
+        return max(present)
+    return sum(present) / len(present)
+
+
+def aggregate(columns: Dict[str, Sequence], length: int, group_by: List[str], specs: Specs) -> List[Dict]:
+    """
+    Groups ``length`` aligned rows by the group-by columns and computes the aggregates of every group.
+
+    Rows are hashed into groups in one pass and each aggregated column is partitioned by group in
+    another, so that every accumulator runs over a plain sequence. Groups come in the order of their
+    first row; without group-by columns there is a single group, even for no rows.
+    """
+    if not group_by:
+        keys, partitions = [()], None
+    else:
+        group_keys = columns[group_by[0]] if len(group_by) == 1 else zip(*map(columns.__getitem__, group_by))
+        groups: Dict[object, int] = {}
+        codes = [groups.setdefault(key, len(groups)) for key in group_keys]
+        keys = [(key,) for key in groups] if len(group_by) == 1 else list(groups)
+        partitions = codes
+
+    def partition(values: Sequence) -> List[Sequence]:
+        if partitions is None:
+            return [values]
+        buckets = [[] for _ in keys]
+        for code, value in zip(partitions, values):
+            buckets[code].append(value)
+        return buckets
+
+    results = [dict(zip(group_by, key)) for key in keys]
+    partitioned: Dict[Optional[str], List[Sequence]] = {}
+    for name, (accumulator, column_id) in specs.items():
+        if column_id not in partitioned:
+            partitioned[column_id] = partition(range(length) if column_id is None else columns[column_id])
+        for result, values in zip(results, partitioned[column_id]):
+            result[name] = reduce(accumulator, values)
+    return results
+
+
+def mongo_pipeline(match: Dict, group_by: List[str], specs: Specs) -> List[Dict]:
+    """The same aggregation as a Mongo pipeline over row documents; group ids are the group-by values."""
+    group = {'_id': {column_id: f'${column_id}' for column_id in group_by} if group_by else None}
+    for name, (accumulator, column_id) in specs.items():
+        if accumulator == '$count':
+            group[name] = {'$sum': 1} if column_id is None else \
+                {'$sum': {'$cond': [{'$eq': [f'${column_id}', None]}, 0, 1]}}
+        else:
+            group[name] = {accumulator: f'${column_id}'}
+    return [{'$match': match}, {'$group': group}]
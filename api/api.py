@@ -1,14 +1,40 @@
-import inspect
+import json
+import threading
 import traceback
 from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from copy import deepcopy
+from bisect import bisect_right
 from functools import reduce
-from operator import getitem
+from itertools import chain, compress, count, islice, repeat
+from operator import and_, getitem, itemgetter
 from pydoc import locate
-from typing import List, Union, Dict, Optional, Iterable
-from pymongo import MongoClient
+from time import perf_counter
+from typing import List, Union, Dict, Optional, Iterable, Iterator, Tuple
+from pymongo import MongoClient, ReturnDocument
 from pymongo.database import Database as MongoDatabase
 from pymongo.database import Collection as MongoCollection
 
+import aggregation
+import columnar
+import exporter
+import importer
+import joins
+import planner
+import query
+import stats
+from indexes import INDEX_TYPES, Index, SortedIndex
+from columnar import MappedTable
+from layouts import CHUNK_SIZE, LAYOUTS, MONGO_BATCH_SIZE, Layout, RowLayout
+from locks import TreeLocks
+from mvcc import History, Snapshot, materialize
+from stats import ColumnStats
+from storage import Storage
+from validators import Pipeline, TypeValidator
+from write_behind import MongoWriter
+
 
 class Node(ABC):
     pass
@@ -20,6 +46,9 @@ class IdNode(Node, ABC):
 
 
 class Branch(dict, ABC):
+    # children of other types that are made elsewhere than create and added with an explicit id
+    mounted_types: Tuple[type, ...] = ()
+
     @property
     @abstractmethod
     def children_type(self):
@@ -31,27 +60,30 @@ class Branch(dict, ABC):
             self.add(child)
 
     def add(self, child: IdNode, id_=None):
-        assert type(child) == self.children_type, (type(child), self.children_type)
+        assert type(child) in (self.children_type, *self.mounted_types), (type(child), self.children_type)
         if id_ is None:
             id_ = child.id_
         if id_ in self:
             raise Exception('Already exist')
-        self[id_] = child
+        self._insert(id_, child)
+
+    def _insert(self, key, value):
+        dict.__setitem__(self, key, value)
 
     def __getitem__(self, item):
         if isinstance(item, (tuple, list)):
-            child = reduce(getitem, item, self)
+            return reduce(getitem, item, self)
         else:
-            child = dict.__getitem__(self, item)
-
-        if isinstance(child, Branch):
-            child.children = [child[child_id] for child_id in child.keys()]
-        return child
+            return dict.__getitem__(self, item)
 
     def __setitem__(self, key, value):
-        call_func = inspect.stack()[1][3]
-        assert call_func == 'add'
-        dict.__setitem__(self, key, value)
+        raise TypeError(f'{type(self).__name__} children can only be added through add()')
+
+    def setdefault(self, key, default=None):
+        raise TypeError(f'{type(self).__name__} children can only be added through add()')
+
+    def update(self, *args, **kwargs):
+        raise TypeError(f'{type(self).__name__} children can only be added through add()')
 
 
 class IdBranch(IdNode, Branch, ABC):
@@ -68,25 +100,57 @@ class IdBranch(IdNode, Branch, ABC):
 
 
 mongo_client: Optional[MongoClient] = None
+# the embedded alternative to Mongo, see create_tree
+storage: Optional[Storage] = None
+
+mongo_writer = MongoWriter()
+
+PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 100_000
+# the Root mutators a batch can run
+BATCH_OPS = ('create', 'create_rows', 'create_rows_from_columns', 'create_columns', 'create_index',
+             'update_row', 'update_column', 'delete', 'delete_index')
+
+
+def chunked(values: Iterable, chunk_size: int) -> Iterator[List]:
+    values = iter(values)
+    chunk = list(islice(values, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(values, chunk_size))
+
+
+def encode_cursor(row_id: int) -> str:
+    return urlsafe_b64encode(json.dumps({'after': row_id}).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    row_id = json.loads(urlsafe_b64decode(cursor.encode()))['after']
+    assert isinstance(row_id, int)
+    return row_id
 
 
 class Schema(dict):
-    def __init__(self, raw_schema: Dict, mongo_collection: MongoCollection):
+    def __init__(self, raw_schema: Dict, mongo_collection: MongoCollection, layout: str = RowLayout.name):
         super().__init__()
+        # the validator defs each pipeline was compiled from, so that edits of the defs are noticed
+        self.pipelines: Dict[str, Tuple[List[Dict], Pipeline]] = {}
         if mongo_client:
             self.mongo_collection = mongo_collection
         self.update(raw_schema)
         if not raw_schema:
             self['columns'] = {}
             self['row_index'] = -1
+            if layout != RowLayout.name:
+                assert layout in LAYOUTS
+                self['layout'] = layout
+                self['chunk_size'] = CHUNK_SIZE
 
             if mongo_client:
-                self.mongo_collection.update_one(
+                mongo_writer.update_one(
+                    self.mongo_collection,
                     {'id': 'schema'},
-                    {'$set':
-                        {'columns': self['columns'],
-                         'row_index': self['row_index']}
-                     },
+                    {'$set': dict(self)},
                     upsert=True
                 )
 
@@ -96,15 +160,25 @@ class Schema(dict):
     def id_to_idx(self, column_id):
         return self.column_ids.index(column_id)
 
-    def validators(self, column_id):
-        validators = []
-        for validator_def in self['columns'][column_id]['validator_defs']:
-            # the validators module contains safe classes
-            validator_type = locate(f'validators.{validator_def["name"]}')
-            assert isinstance(validator_type, type)
-
-            validators.append(validator_type(**validator_def['params']))
-        return validators
+    def validators(self, column_id) -> Pipeline:
+        validator_defs = self['columns'][column_id]['validator_defs']
+        if column_id not in self.pipelines or self.pipelines[column_id][0] != validator_defs:
+            pipeline = Pipeline()
+            for validator_def in validator_defs:
+                # the validators module contains safe classes
+                validator_type = locate(f'validators.{validator_def["name"]}')
+                assert isinstance(validator_type, type)
+
+                pipeline.append(validator_type(**validator_def['params']))
+            self.pipelines[column_id] = deepcopy(validator_defs), pipeline
+        return self.pipelines[column_id][1]
+
+    def column_type(self, column_id) -> Optional[type]:
+        """The type enforced by the column's TypeValidator, if any."""
+        for validator in self.validators(column_id):
+            if isinstance(validator, TypeValidator):
+                return validator.type_
+        return None
 
     @property
     def column_ids(self):
@@ -117,10 +191,19 @@ class Schema(dict):
     @row_index.setter
     def row_index(self, new_index):
         assert 'row_index' not in self or abs(new_index - self['row_index']) == 1
+        self.set_row_index(new_index)
+
+    def allocate_row_ids(self, count: int) -> range:
+        start = self['row_index'] + 1
+        self.set_row_index(self['row_index'] + count)
+        return range(start, start + count)
+
+    def set_row_index(self, new_index):
         self['row_index'] = new_index
 
         if mongo_client:
-            self.mongo_collection.update_one(
+            mongo_writer.update_one(
+                self.mongo_collection,
                 {'id': 'schema'},
                 {'$set': {'row_index': self['row_index']}},
                 upsert=True
@@ -129,19 +212,68 @@ class Schema(dict):
     def add(self, column_id: str, validator_defs: List[Dict]):
         assert column_id not in self['columns']
         self['columns'][column_id] = {'validator_defs': validator_defs}
+        self.pipelines.pop(column_id, None)
 
         if mongo_client:
-            self.mongo_collection.update_one(
+            mongo_writer.update_one(
+                self.mongo_collection,
                 {'id': 'schema'},
                 {'$set': {f'columns.{column_id}': self['columns'][column_id]}},
                 upsert=True
             )
 
+    def bump_version(self) -> int:
+        document = self.mongo_collection.find_one_and_update(
+            {'id': 'schema'},
+            {'$inc': {'version': 1}},
+            projection={'_id': 0, 'version': 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return document['version']
+
+    def add_index(self, column_id: str, kind: str):
+        assert column_id in self['columns']
+        self.setdefault('indexes', {})[column_id] = kind
+
+        if mongo_client:
+            mongo_writer.update_one(
+                self.mongo_collection,
+                {'id': 'schema'},
+                {'$set': {f'indexes.{column_id}': kind}},
+                upsert=True
+            )
+
+    def pop_index(self, column_id: str):
+        self['indexes'].pop(column_id)
+        if not self['indexes']:
+            del self['indexes']
+
+        if mongo_client:
+            mongo_writer.update_one(
+                self.mongo_collection,
+                {'id': 'schema'},
+                {'$unset': {f'indexes.{column_id}' if 'indexes' in self else 'indexes': 1}},
+                upsert=True
+            )
+
+    @property
+    def indexes(self) -> Dict[str, str]:
+        return self.get('indexes', {})
+
+    @property
+    def layout(self) -> str:
+        return self.get('layout', RowLayout.name)
+
     def pop(self, column_id):
+        if column_id in self.indexes:
+            self.pop_index(column_id)
         self['columns'].pop(column_id)
+        self.pipelines.pop(column_id, None)
 
         if mongo_client:
-            self.mongo_collection.update_one(
+            mongo_writer.update_one(
+                self.mongo_collection,
                 {'id': 'schema'},
                 {'$unset': {f'columns.{column_id}': 1}},
                 upsert=True
@@ -149,17 +281,19 @@ class Schema(dict):
 
     def update(self, elems, **kwargs):
         super().update(elems)
+        self.pipelines.clear()
         if mongo_client and elems:
-            self.mongo_collection.update_one({'id': 'schema'}, {'$set': self}, upsert=True)
+            mongo_writer.update_one(self.mongo_collection, {'id': 'schema'}, {'$set': dict(self)}, upsert=True)
 
 
 class Row(IdNode, list):
-    def __init__(self, id_: int, schema: Schema, raw_values: Iterable, mongo_collection: MongoCollection):
+    """A materialized view of one table row; writes go through to the table columns."""
+
+    def __init__(self, id_: int, table: 'Table', raw_values: Iterable):
         IdNode.__init__(self, id_)
         self.extend(raw_values)
-        self.schema = schema
-        if mongo_client:
-            self.mongo_collection = mongo_collection
+        self.table = table
+        self.schema = table.schema
 
     def item_to_id_idx(self, item):
         if isinstance(item, int):
@@ -176,73 +310,123 @@ class Row(IdNode, list):
     def __setitem__(self, item, value):
         column_id, column_idx = self.item_to_id_idx(item)
         list.__setitem__(self, column_idx, value)
-        if mongo_client:
-            self.mongo_collection.update_one({'id': self.id_}, {'$set': {column_id: value}})
+        self.table.set_value(self.id_, column_id, value)
 
-    # noinspection PyMethodOverriding
-    def pop(self, item):
-        return list.pop(self, self.item_to_id_idx(item)[1])
 
-    def insert(self, column_idx: int, value):
-        list.insert(self, column_idx, value)
-        if mongo_client:
-            self.mongo_collection.update_one({'id': self.id_}, {'$set': {self.schema.idx_to_id(column_idx): value}})
+class Table(planner.Executor, IdBranch):
+    """
+    Column-oriented table.
 
-
-class Table(IdBranch):
+    Values are kept in one list per column, aligned with the shared ``row_ids`` vector.
+    The dict itself maps a row id to its position in the column lists; ``Row`` objects
+    are only materialized when rows are accessed.
+    Deleted rows leave a tombstone (``live[pos] == 0``) until the table is compacted.
+    Row ids are allocated in increasing order, so ``row_ids`` stays sorted.
+    """
     children_type = Row
 
     def __init__(self, id_: str,
                  raw_schema: Optional[Dict] = None,
                  init_rows: Optional[List[Dict]] = None,
                  init_rows_unsafe: Optional[List] = None,
-                 mongo_collection: Optional[MongoCollection] = None):
+                 mongo_collection: Optional[MongoCollection] = None,
+                 layout: str = RowLayout.name):
         super().__init__(id_)
         self.mongo_collection = mongo_collection
 
         if mongo_client:
-            id_rows = list(mongo_collection.find({}, {'_id': 0}))
-            schema_idx = [i for i, row in enumerate(id_rows) if row['id'] == 'schema']
-            if len(schema_idx) == 0:
-                raw_schema = {}
-            elif len(schema_idx) == 1:
-                raw_schema = id_rows.pop(schema_idx[0])
-                raw_schema.pop('id')
-            else:
-                raise
+            mongo_writer.flush()
+            mongo_collection.create_index('id', unique=True)
+            raw_schema = mongo_collection.find_one({'id': 'schema'}, {'_id': 0, 'id': 0})
 
         if not raw_schema:
             raw_schema = {}
-        self.schema = Schema(raw_schema, mongo_collection)
+        self.version: Optional[int] = raw_schema.pop('version', 0)
+        self.schema = Schema(raw_schema, mongo_collection, layout)
+
+        self.row_ids: List[int] = []
+        self.live = bytearray()
+        self.history = History()
+        self.columns: Dict[str, List] = {column_id: [] for column_id in self.schema.column_ids}
+        self.indexes: Dict[str, Index] = {column_id: INDEX_TYPES[kind]()
+                                          for column_id, kind in self.schema.indexes.items()}
+        self.stats: Dict[str, ColumnStats] = {column_id: ColumnStats() for column_id in self.schema.column_ids}
 
         if mongo_client:
-            # noinspection PyUnboundLocalVariable
-            for row in id_rows:
-                row_id = row.pop('id')
-                self.add(row, row_id, init_fill=True)
+            self.layout: Layout = LAYOUTS[self.schema.layout](mongo_collection, mongo_writer, self.schema)
+            self._extend(*self.layout.load(self.schema.column_ids))
         if init_rows:
-            for r in init_rows:
-                self.add(r)
+            self.add_many(init_rows)
         if init_rows_unsafe:
-            for r in init_rows_unsafe:
-                self.add(dict(zip(self.schema.column_ids, r)))
+            self.add_many([dict(zip(self.schema.column_ids, r)) for r in init_rows_unsafe])
 
     def add(self, raw_row: Dict, row_id=None, init_fill=False):
         schema_column_ids = self.schema.column_ids
         if not init_fill:
             assert set(raw_row.keys()) == set(schema_column_ids)
-            assert all(validator(value) for column_id, value in raw_row.items()
-                       for validator in self.schema.validators(column_id))
+            assert all(self.schema.validators(column_id)(value) for column_id, value in raw_row.items())
+        self.check_indexable({column_id: [value] for column_id, value in raw_row.items()})
+        if not init_fill:
             if mongo_client:
-                self.mongo_collection.insert_one({'id': self.schema.row_index + 1, **raw_row})
+                self.layout.insert([self.schema.row_index + 1], {column_id: [raw_row[column_id]]
+                                                                 for column_id in schema_column_ids})
 
-        ordered_values = [raw_row[column_id] for column_id in schema_column_ids]
         if row_id is None:
-            row = Row(self.schema.row_index + 1, self.schema, ordered_values, self.mongo_collection)
+            row_id = self.schema.row_index + 1
             self.schema.row_index += 1
-        else:
-            row = Row(row_id, self.schema, ordered_values, self.mongo_collection)
-        IdBranch.add(self, row)
+        if row_id in self:
+            raise Exception('Already exist')
+
+        for column_id in schema_column_ids:
+            self.columns[column_id].append(raw_row[column_id])
+            self.stats[column_id].add(raw_row[column_id])
+        for column_id, index in self.indexes.items():
+            index.add(raw_row[column_id], row_id)
+        self.live.append(True)
+        self.row_ids.append(row_id)
+        self._insert(row_id, len(self.row_ids) - 1)
+
+    def add_many(self, raw_rows: List[Dict]):
+        if not raw_rows:
+            return
+
+        schema_column_ids = self.schema.column_ids
+        column_id_set = set(schema_column_ids)
+        assert all(raw_row.keys() == column_id_set for raw_row in raw_rows)
+
+        self.add_columns_values({column_id: list(map(itemgetter(column_id), raw_rows))
+                                 for column_id in schema_column_ids})
+
+    def add_columns_values(self, columns: Dict[str, List]):
+        """Appends rows given as equally long per-column value lists."""
+        schema_column_ids = self.schema.column_ids
+        assert columns.keys() == set(schema_column_ids)
+        row_count = len(columns[schema_column_ids[0]]) if schema_column_ids else 0
+        assert all(len(values) == row_count for values in columns.values())
+        if not row_count:
+            return
+
+        for column_id, values in columns.items():
+            assert self.schema.validators(column_id).validate_many(values)
+        self.check_indexable(columns)
+
+        row_ids = self.schema.allocate_row_ids(row_count)
+        if mongo_client:
+            self.layout.insert(list(row_ids), {column_id: columns[column_id] for column_id in schema_column_ids})
+        self._extend(list(row_ids), columns)
+
+    def _extend(self, row_ids: List[int], columns: Dict[str, List]):
+        assert self.keys().isdisjoint(row_ids), 'Already exist'
+
+        start = len(self.row_ids)
+        for column_id, values in columns.items():
+            self.columns[column_id].extend(values)
+            self.stats[column_id].add_many(values)
+        for column_id, index in self.indexes.items():
+            index.add_many(columns[column_id], row_ids)
+        self.live.extend(b'\x01' * len(row_ids))
+        self.row_ids.extend(row_ids)
+        dict.update(self, zip(row_ids, range(start, start + len(row_ids))))
 
     def add_column(self, column_id: str, description: Dict):
         assert column_id not in self.schema.column_ids
@@ -255,37 +439,171 @@ class Table(IdBranch):
         self.schema.add(column_id, validator_defs)
 
         try:
-            assert all(validator(value) for validator in self.schema.validators(column_id) for value in values)
+            assert self.schema.validators(column_id).validate_many(values)
         except Exception as e:
             self.schema.pop(column_id)
             raise e
 
-        column_idx = self.schema.id_to_idx(column_id)
-        for row, val in zip(self.values(), values):
-            row.insert(column_idx, val)
+        self.compact()
+        self.columns[column_id] = list(values)
+        self.stats[column_id] = ColumnStats(values)
+
+        if mongo_client:
+            self.layout.add_column(column_id, self.row_ids, self.columns[column_id])
+
+    def check_indexable(self, columns: Dict[str, Iterable]):
+        """Raises TypeError unless the indexes of the columns can take the values; nothing is changed before."""
+        for column_id, values in columns.items():
+            if column_id in self.indexes:
+                self.indexes[column_id].check(values)
+
+    def create_index(self, column_id: str, kind: str = 'hash'):
+        assert column_id in self.columns and column_id not in self.indexes
+        index = INDEX_TYPES[kind]()
+        index.add_many(self.column(column_id), self.keys())
+        self.schema.add_index(column_id, kind)
+        self.indexes[column_id] = index
+
+    def drop_index(self, column_id: str):
+        self.schema.pop_index(column_id)
+        self.indexes.pop(column_id)
+
+    def find(self, column_id: str, value) -> List[int]:
+        """Ids of the rows whose column equals the value."""
+        if column_id in self.indexes:
+            return self.indexes[column_id].find(value)
+        return [row_id for row_id, v in zip(self.keys(), self.column(column_id)) if v == value]
+
+    def find_range(self, column_id: str, low=None, high=None) -> List[int]:
+        """Ids of the rows whose column lies in [low, high]; a missing bound is unbounded."""
+        index = self.indexes.get(column_id)
+        if isinstance(index, SortedIndex):
+            return index.find_range(low, high)
+        return [row_id for row_id, v in zip(self.keys(), self.column(column_id))
+                if (low is None or low <= v) and (high is None or v <= high)]
+
+    def column_stats(self, column_id: str) -> ColumnStats:
+        """The column's statistics, rebuilt first when too much of it changed since they were built."""
+        if self.stats[column_id].stale:
+            self.stats[column_id] = ColumnStats(self.column(column_id))
+        return self.stats[column_id]
+
+    def statistics(self) -> Dict:
+        return stats.statistics({column_id: self.column_stats(column_id) for column_id in self.schema.column_ids},
+                                len(self))
+
+    @property
+    def column_ids(self) -> List[str]:
+        return self.schema.column_ids
+
+    def page(self, after: Optional[int] = None, page_size: int = PAGE_SIZE) -> Tuple[Dict[int, List], Optional[int]]:
+        """Up to page_size rows with ids greater than after, and the id to continue after (None on the last page)."""
+        start = 0 if after is None else bisect_right(self.row_ids, after)
+        positions = list(islice(compress(count(start), islice(self.live, start, None)), page_size))
+        columns = [self.columns[column_id] for column_id in self.schema.column_ids]
+        rows = {self.row_ids[position]: [column[position] for column in columns] for position in positions}
+        if positions and self.live.find(1, positions[-1] + 1) != -1:
+            return rows, self.row_ids[positions[-1]]
+        return rows, None
+
+    def snapshot(self) -> Snapshot:
+        """Pins the current version of the table; call it under the table's read lock."""
+        return Snapshot(self)
+
+    def touch(self):
+        """Bumps the persisted version so that other processes drop their cached copies."""
+        if not mongo_client:
+            return
+        if mongo_writer.mode == MongoWriter.SYNC and not mongo_writer.held:
+            version = self.schema.bump_version()
+            # someone else has written in between: this copy is stale too
+            self.version = version if self.version is not None and version == self.version + 1 else None
+        else:
+            # a buffered increment cannot report concurrent writers
+            mongo_writer.update_one(self.mongo_collection, {'id': 'schema'}, {'$inc': {'version': 1}}, upsert=True)
+            if self.version is not None:
+                self.version += 1
+
+    def position(self, row_id: int) -> int:
+        return dict.__getitem__(self, row_id)
+
+    def column(self, column_id: str) -> List:
+        column = self.columns[column_id]
+        if len(self) == len(column):
+            return column.copy()
+        return list(compress(column, self.live))
+
+    def set_value(self, row_id: int, column_id: str, value):
+        column, position = self.columns[column_id], self.position(row_id)
+        if column_id in self.indexes:
+            self.check_indexable({column_id: [value]})
+            self.indexes[column_id].remove(column[position], row_id)
+            self.indexes[column_id].add(value, row_id)
+        self.history.record(column_id, position, column[position])
+        self.stats[column_id].remove(column[position])
+        self.stats[column_id].add(value)
+        column[position] = value
+        if mongo_client:
+            self.layout.set_value(row_id, column_id, value)
+
+    def compact(self):
+        if len(self) == len(self.row_ids):
+            return
+        self.row_ids = list(compress(self.row_ids, self.live))
+        for column_id, column in self.columns.items():
+            self.columns[column_id] = list(compress(column, self.live))
+        self.live = bytearray(b'\x01' * len(self.row_ids))
+        # pinned snapshots keep the replaced lists, and their history
+        self.history = History()
+        dict.update(self, zip(self.row_ids, range(len(self.row_ids))))
+
+    def values(self):
+        columns = [self.column(column_id) for column_id in self.schema.column_ids]
+        rows = zip(*columns) if columns else repeat((), len(self))
+        return map(Row, self.keys(), repeat(self), rows)
+
+    def items(self):
+        return zip(self.keys(), self.values())
 
     def __getitem__(self, item):
         if isinstance(item, int):
-            return dict.__getitem__(self, item)
+            position = self.position(item)
+            return Row(item, self, [self.columns[column_id][position] for column_id in self.schema.column_ids])
         elif isinstance(item, str):
-            return {row_id: self[row_id][item] for row_id in self.keys()}
+            return dict(zip(self.keys(), self.column(item)))
         else:
             raise
 
     def pop(self, item):
         if isinstance(item, int):
-            dict.pop(self, item)
+            position = dict.pop(self, item)
+            if mongo_client:
+                self.layout.delete_row(item)
+            for column_id, index in self.indexes.items():
+                index.remove(self.columns[column_id][position], item)
+            self.history.record(None, position, self.live[position])
+            self.live[position] = False
+            for column_id, column in self.columns.items():
+                self.history.record(column_id, position, column[position])
+                self.stats[column_id].remove(column[position])
+                column[position] = None
+            if 2 * len(self) < len(self.row_ids):
+                self.compact()
         elif isinstance(item, str):
-            column_idx = self.schema.id_to_idx(column_id=item)
-            for row in self.values():
-                row.pop(column_idx)
             self.schema.pop(item)
+            self.columns.pop(item)
+            if mongo_client:
+                self.layout.drop_column(item)
+            self.indexes.pop(item, None)
+            self.stats.pop(item)
         else:
             raise
 
 
 class Base(IdBranch):
     children_type = Table
+    # see Root.open_table
+    mounted_types = (MappedTable,)
 
     def __init__(self, id_: str,
                  children: Optional[List[Table]] = None,
@@ -296,145 +614,818 @@ class Base(IdBranch):
 
     def __getitem__(self, table_id):
         if mongo_client:
-            return Table(id_=table_id, mongo_collection=self.mongo_base[table_id])
+            return table_cache.get(self.id_, table_id, self.mongo_base[table_id])
         else:
             return dict.__getitem__(self, table_id)
 
     def pop(self, table_id):
-        dict.pop(self, table_id)
+        table = dict.pop(self, table_id)
         if mongo_client:
-            self.mongo_base.drop_collection(table_id)
+            table_cache.invalidate(self.id_, table_id)
+            mongo_writer.drop(self.mongo_base[table_id])
+        return table
+
+
+class TableCache:
+    """
+    Per-process LRU cache of Mongo-backed tables.
+
+    A cached table is only reused while its version matches the one in the schema document,
+    which every mutating Root call bumps through Table.touch.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self.tables: OrderedDict = OrderedDict()
+        self.lock = threading.RLock()
+
+    def get(self, base_id: str, table_id: str, mongo_collection: MongoCollection) -> Table:
+        key = (base_id, table_id)
+        with self.lock:
+            table = self.tables.get(key)
+            if table is not None and table.version is not None and mongo_writer.pending(mongo_collection):
+                # the buffered writes were made through this copy, so it is the newest one
+                self.tables.move_to_end(key)
+                return table
+
+            mongo_writer.flush()
+            schema_document = mongo_collection.find_one({'id': 'schema'}, {'_id': 0, 'version': 1})
+            version = (schema_document or {}).get('version', 0)
+            if table is not None and table.version == version:
+                self.tables.move_to_end(key)
+                return table
+
+            table = Table(id_=table_id, mongo_collection=mongo_collection)
+            if self.max_size > 0:
+                self.tables[key] = table
+                self.tables.move_to_end(key)
+                while len(self.tables) > self.max_size:
+                    self.tables.popitem(last=False)
+            return table
+
+    def invalidate(self, base_id: str, table_id: Optional[str] = None):
+        with self.lock:
+            for key in [key for key in self.tables if key[0] == base_id and table_id in (None, key[1])]:
+                del self.tables[key]
+
+    def clear(self):
+        with self.lock:
+            self.tables.clear()
+
+
+table_cache = TableCache()
+
+
+class Transaction:
+    """
+    What Root.batch needs to roll back: the bases and tables its operations touch, as they were
+    before the first operation touching them.
+
+    An in-memory table is restored from a snapshot pinned on first touch, so only a rollback copies it.
+    Mongo-backed tables are only dropped from the cache: their writes are held back until the commit
+    and never reach Mongo.
+    """
+
+    def __init__(self, tree: 'Root'):
+        self.tree = tree
+        self.bases: Dict[str, Optional[Base]] = {}
+        self.tables: Dict[Tuple[str, str], Tuple[Optional[Table], Optional[Dict], Optional[Snapshot]]] = {}
+
+    def touch(self, path: List):
+        base_id = path[0]
+        if base_id not in self.bases:
+            self.bases[base_id] = dict.get(self.tree, base_id)
+        base = self.bases[base_id]
+        key = tuple(path[:2])
+        # the tables of a base created by the batch go with it
+        if len(path) < 2 or key in self.tables or base is None or dict.get(self.tree, base_id) is not base:
+            return
+        table = dict.get(base, path[1])
+        if table is None or mongo_client or isinstance(table, MappedTable):
+            self.tables[key] = table, None, None
+        else:
+            self.tables[key] = table, json.loads(json.dumps(table.schema)), table.snapshot()
+
+    def rollback(self):
+        for base_id, base in self.bases.items():
+            if base is None:
+                dict.pop(self.tree, base_id, None)
+                self.tree.locks.discard([base_id])
+                if mongo_client:
+                    table_cache.invalidate(base_id)
+                    mongo_client.drop_database(base_id)
+            else:
+                self.tree._insert(base_id, base)
+        for (base_id, table_id), (table, schema, snapshot) in self.tables.items():
+            base = self.bases[base_id]
+            if mongo_client:
+                table_cache.invalidate(base_id, table_id)
+            if table is None:
+                dict.pop(base, table_id, None)
+                self.tree.locks.discard([base_id, table_id])
+                if mongo_client:
+                    base.mongo_base.drop_collection(table_id)
+            elif snapshot is None:
+                base._insert(table_id, table)
+            else:
+                restored = Table(table_id, raw_schema=schema)
+                restored._extend(snapshot.keys(), {column_id: snapshot.column(column_id)
+                                                   for column_id in snapshot.column_ids})
+                base._insert(table_id, restored)
+
+    def release(self):
+        for _, _, snapshot in self.tables.values():
+            if snapshot is not None:
+                snapshot.release()
 
 
 class Root(Branch):
+    """
+    The tree; its methods are safe to call from many threads.
+
+    Reads of a table share its lock and writes take it exclusively, see locks.TreeLocks.
+    """
     children_type = Base
 
+    def __init__(self, children: Optional[List[Base]] = None):
+        super().__init__(children or [])
+        self.locks = TreeLocks()
+        # set while a batch runs the mutators, which then leave the logging to it
+        self.batching = False
+        # the mapped tables the running batch deleted
+        self.unmounted: List[MappedTable] = []
+
+    @contextmanager
+    def reading(self, path: List):
+        """Read-locks the tables under the path, e.g. while serializing what Root.read returned."""
+        with self.locks.tree.read():
+            if len(path) >= 2:
+                table_paths = [path[:2]]
+            else:
+                bases = [(path[0], self[path[0]])] if path else self.items()
+                table_paths = [[base_id, table_id] for base_id, base in bases for table_id in base.keys()]
+            with self.locks.reading(table_paths):
+                yield
+
+    @contextmanager
+    def snapshot(self, path: List):
+        """
+        Pins snapshots of the tables under the path and yields the table's Snapshot, the base's or the tree's
+        {table_id: Snapshot} dicts; the locks are only held while pinning, so long reads do not block writers.
+        """
+        with ExitStack() as stack:
+            with self.reading(path):
+                if len(path) > 2:
+                    node = self[path]
+                elif len(path) == 2:
+                    node = stack.enter_context(self[path].snapshot())
+                else:
+                    bases = {path[0]: self[path[0]]} if path else self
+                    node = {base_id: {table_id: stack.enter_context(base[table_id].snapshot())
+                                      for table_id in base.keys()}
+                            for base_id, base in bases.items()}
+                    if path:
+                        node = node[path[0]]
+            yield node
+
+    def _record(self, op: str, **args) -> Optional[str]:
+        """
+        The write-ahead log line of a mutation, encoded before the mutation is applied, so that
+        one that cannot be logged as it would replay is rejected; None when nothing is logged.
+        """
+        if storage is None or storage.replaying or self.batching:
+            return None
+        return storage.encode(op, self._loggable(op, args))
+
+    @staticmethod
+    def _loggable(op: str, args: Dict) -> Dict:
+        # JSON object keys are strings, so the log keeps [row_id, value] pairs
+        if op == 'update_column':
+            return {**args, 'sub_column': [[row_id, value] for row_id, value in args['sub_column'].items()]}
+        if op == 'batch':
+            return {'ops': [{'op': operation['op'], 'args': Root._loggable(*Root._batch_call(operation))}
+                            for operation in args['ops']]}
+        return args
+
+    @staticmethod
+    def _log(line: Optional[str]):
+        """Appends a successful mutation, encoded by _record, to the write-ahead log of the embedded storage."""
+        if line is not None:
+            storage.log(line)
+
+    def checkpoint(self):
+        """Snapshots the tree to the embedded storage and drops the log segments before it."""
+        with ExitStack() as stack:
+            with self.reading([]):
+                segment = storage.rotate()
+                tables = {base_id: {table_id: (json.loads(json.dumps(base[table_id].schema)),
+                                               stack.enter_context(base[table_id].snapshot()))
+                                    for table_id in base.keys()}
+                          for base_id, base in self.items()}
+            storage.write_snapshot({
+                'segment': segment,
+                'bases': {base_id: {table_id: {'mapped': snapshot.path} if isinstance(snapshot, MappedTable) else
+                                              {'schema': schema,
+                                               'row_ids': snapshot.keys(),
+                                               'columns': {column_id: snapshot.column(column_id)
+                                                           for column_id in snapshot.column_ids}}
+                                    for table_id, (schema, snapshot) in base.items()}
+                          for base_id, base in tables.items()}
+            })
+
+    def writing(self, path: List):
+        """Write-locks the tree for bases and tables themselves, else the table the path is in."""
+        return self.locks.tree.write() if len(path) <= 2 else self.locks.writing(path[:2])
+
     def pop(self, base_id):
-        dict.pop(self, base_id)
+        base = dict.pop(self, base_id)
         if mongo_client:
-            mongo_client.drop_database(base_id)
+            table_cache.invalidate(base_id)
+            mongo_writer.drop(mongo_client[base_id])
+        return base
+
+    def _unmount(self, node: Union[Base, Table, MappedTable]):
+        """Closes the mapped tables of a deleted base or table; in a batch, once it commits."""
+        tables = dict.values(node) if isinstance(node, Base) else [node]
+        mapped_tables = [table for table in tables if isinstance(table, MappedTable)]
+        if self.batching:
+            self.unmounted += mapped_tables
+        else:
+            for table in mapped_tables:
+                table.close()
 
-    def create(self, path: List) -> bool:
-        try:
-            branch = self.read(path[:-1])
-            id_ = path[-1]
+    @staticmethod
+    def flush():
+        """Sends the writes buffered by the write-behind layer to Mongo."""
+        mongo_writer.flush()
 
-            if mongo_client:
-                if isinstance(branch, Root):
-                    mongo = {'mongo_base': mongo_client[id_]}
-                elif isinstance(branch, Base):
-                    mongo = {'mongo_collection': mongo_client[branch.id_][id_]}
+    def create(self, path: List, layout: Optional[str] = None) -> bool:
+        """Creates a base or a table; tables stored in Mongo can use the 'chunks' layout instead of 'rows'."""
+        try:
+            with self.writing(path):
+                branch = self.read(path[:-1])
+                id_ = path[-1]
+
+                if mongo_client:
+                    if isinstance(branch, Root):
+                        mongo = {'mongo_base': mongo_client[id_]}
+                    elif isinstance(branch, Base):
+                        mongo = {'mongo_collection': mongo_client[branch.id_][id_]}
+                    else:
+                        mongo = {}
                 else:
                     mongo = {}
-            else:
-                mongo = {}
-
-            branch.add(branch.children_type(id_=id_, **mongo))
-            return True
+                if layout:
+                    assert isinstance(branch, Base) and layout in LAYOUTS
+                    mongo['layout'] = layout
+
+                record = self._record('create', path=path, layout=layout)
+                branch.add(branch.children_type(id_=id_, **mongo))
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
     def create_rows(self, table_path: List[str], rows: List[Dict]) -> bool:
         try:
-            table: Table = self.read(table_path)
-            for r in rows:
-                table.add(r)
-            return True
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                record = self._record('create_rows', table_path=table_path, rows=rows)
+                table.add_many(rows)
+                table.touch()
+                self._log(record)
+                return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    def create_rows_from_columns(self, table_path: List[str], columns: Dict[str, List]) -> bool:
+        try:
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                record = self._record('create_rows_from_columns', table_path=table_path, columns=columns)
+                table.add_columns_values(columns)
+                table.touch()
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
     def create_columns(self, table_path: List[str], columns: Dict[str, Dict]) -> bool:
         try:
-            table: Table = self.read(table_path)
-            for column_id, description in columns.items():
-                table.add_column(column_id, description)
-            return True
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                record = self._record('create_columns', table_path=table_path, columns=columns)
+                for column_id, description in columns.items():
+                    table.add_column(column_id, description)
+                table.touch()
+                self._log(record)
+                return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    def create_index(self, table_path: List[str], column_id: str, kind: str = 'hash') -> bool:
+        try:
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                record = self._record('create_index', table_path=table_path, column_id=column_id, kind=kind)
+                table.create_index(column_id, kind)
+                table.touch()
+                self._log(record)
+                return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    def batch(self, ops: List[Dict]) -> bool:
+        """
+        Runs operations, ``{'op': 'update_row', 'args': {'table_path': [...], 'row_id': 3, 'sub_row': {...}}}``,
+        see BATCH_OPS, as one transaction: under a single write lock of the tree, persisted as one
+        write-ahead log record or, with Mongo, writes held back and sent together at the end,
+        and rolled back as a whole when one of them fails.
+        """
+        try:
+            calls = list(map(self._batch_call, ops))
+            record = self._record('batch', ops=ops)
+            with self.locks.tree.write():
+                transaction = Transaction(self)
+                try:
+                    with ExitStack() as stack:
+                        if mongo_client:
+                            stack.enter_context(mongo_writer.holding())
+                        self.batching = True
+                        for op, args in calls:
+                            transaction.touch(args['path'] if 'path' in args else args['table_path'])
+                            assert getattr(self, op)(**args), (op, args)
+                except Exception:
+                    transaction.rollback()
+                    raise
+                finally:
+                    self.batching = False
+                    transaction.release()
+                    # a rollback mounts them again
+                    unmounted, self.unmounted = self.unmounted, []
+                for table in unmounted:
+                    table.close()
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
+    @staticmethod
+    def _batch_call(op: Dict) -> Tuple[str, Dict]:
+        assert op['op'] in BATCH_OPS, op['op']
+        args = dict(op['args'])
+        if op['op'] == 'update_column':
+            # JSON object keys are strings, and the log keeps [row_id, value] pairs
+            sub_column = args['sub_column']
+            args['sub_column'] = {int(row_id): value for row_id, value in
+                                  (sub_column.items() if isinstance(sub_column, dict) else sub_column)}
+        return op['op'], args
+
     def read(self, path: List) -> Union['Root', Table, Row]:
-        return self[path]
+        with self.reading(path):
+            return self[path]
 
     def read_columns(self, table_path: List[str]) -> Dict:
-        table: Table = self.read(table_path)
-        return dict(zip(table.schema.column_ids, map(list, zip(*table.values()))))
+        with self.snapshot(table_path) as snapshot:
+            return {column_id: snapshot.column(column_id) for column_id in snapshot.column_ids}
 
     def read_column(self, table_path: List[str], column_id: str) -> List:
-        table: Table = self.read(table_path)
-        column_idx = table.schema.id_to_idx(column_id)
-        return [row[column_idx] for row in table.values()]
+        with self.snapshot(table_path) as snapshot:
+            return snapshot.column(column_id)
+
+    def query(self, table_path: List[str], where: Optional[Dict] = None, column_ids: Optional[List[str]] = None,
+              limit: Optional[int] = None, offset: int = 0, order_by: Optional[List] = None,
+              explain: bool = False) -> Union[Dict[int, List], Tuple[Dict[int, List], Dict]]:
+        """The matching rows, see Table.query; with explain, also the executed plan as a dict."""
+        with self.reading(table_path):
+            layout = self._mongo_layout(table_path)
+            if layout and layout.pushdown:
+                plan = planner.Plan('mongo_find', None, where=where or {}, order=order_by or [])
+                rows = plan.run(self._query_mongo, table_path, where, column_ids, limit, offset, None, order_by)
+            else:
+                table: Table = self.read(table_path)
+                rows, plan = table.query(where, column_ids, limit, offset, order_by, explain=True)
+            return (rows, plan.to_dict()) if explain else rows
+
+    def aggregate(self, table_path: List[str], group_by: Optional[List[str]] = None,
+                  aggregates: Optional[Dict] = None, where: Optional[Dict] = None,
+                  explain: bool = False) -> Union[List[Dict], Tuple[List[Dict], Dict]]:
+        """
+        Groups the rows matching the where-predicate and returns one dict per group with its group-by
+        values and aggregates, see aggregation.normalize; by default the rows are counted.
+        With explain, also the executed plan as a dict.
+        """
+        group_by = list(group_by or [])
+        specs = aggregation.normalize(group_by, aggregates or {'count': {'$count': {}}})
+        with self.reading(table_path):
+            schema_column_ids = self._column_ids(table_path)
+            conditions = query.normalize(where, schema_column_ids)
+            query.check_columns(aggregation.column_ids(group_by, specs), schema_column_ids)
+            layout = self._mongo_layout(table_path)
+            if layout and layout.pushdown:
+                plan = planner.Plan('mongo_pipeline', None, where=where or {}, group_by=group_by)
+                groups = plan.run(self._aggregate_mongo, table_path, conditions, group_by, specs)
+                return (groups, plan.to_dict()) if explain else groups
+            plan = planner.plan_aggregate(self[table_path], conditions, group_by)
+
+        scan, *steps = plan.chain()
+        column_ids = aggregation.column_ids(group_by + list(conditions), specs)
+        with self.snapshot(table_path) as snapshot:
+            columns, length = scan.run(lambda: ({column_id: snapshot.column(column_id) for column_id in column_ids},
+                                                len(snapshot)), count=itemgetter(1))
+        if conditions:
+            columns, length = steps.pop(0).run(self._filter_columns, columns, length, conditions,
+                                               count=itemgetter(1))
+        groups = steps[0].run(aggregation.aggregate, columns, length, group_by, specs)
+        return (groups, plan.to_dict()) if explain else groups
+
+    @staticmethod
+    def _filter_columns(columns: Dict[str, List], length: int, conditions: Dict) -> Tuple[Dict[str, List], int]:
+        mask = [True] * length
+        for column_id, condition in conditions.items():
+            mask = list(map(and_, mask, map(query.compile_condition(condition), columns[column_id])))
+        return {column_id: list(compress(values, mask)) for column_id, values in columns.items()}, sum(mask)
+
+    def _aggregate_mongo(self, table_path: List[str], conditions: Dict, group_by: List[str],
+                         specs: aggregation.Specs) -> List[Dict]:
+        """Runs the aggregation as a Mongo pipeline, only the groups leave the database."""
+        base_id, table_id = table_path
+        pipeline = aggregation.mongo_pipeline(query.mongo_filter(conditions), group_by, specs)
+        groups = [{**(document.pop('_id') or {}), **document}
+                  for document in self[base_id].mongo_base[table_id].aggregate(pipeline)]
+        if not groups and not group_by:
+            return aggregation.aggregate({column_id: [] for column_id in aggregation.column_ids([], specs)},
+                                         0, [], specs)
+        return [{**{column_id: group.get(column_id) for column_id in group_by},
+                 **{name: group[name] for name in specs}} for group in groups]
+
+    def read_rows_page(self, table_path: List[str], cursor: Optional[str] = None,
+                       page_size: Optional[int] = None) -> Tuple[Dict[int, List], Optional[str]]:
+        """One page of rows in row id order and the opaque cursor of the next page (None on the last page)."""
+        page_size = page_size or PAGE_SIZE
+        assert 0 < page_size <= MAX_PAGE_SIZE
+        after = decode_cursor(cursor) if cursor else None
+        with self.reading(table_path):
+            layout = self._mongo_layout(table_path)
+            if layout and layout.pushdown:
+                # one extra row tells whether there is a next page
+                rows = self._query_mongo(table_path, None, None, page_size + 1, 0, after)
+                last_id = None
+                if len(rows) > page_size:
+                    rows.popitem()
+                    last_id = next(reversed(rows))
+            else:
+                table: Table = self.read(table_path)
+                rows, last_id = table.page(after, page_size)
+        return rows, None if last_id is None else encode_cursor(last_id)
+
+    def iter_rows(self, table_path: List[str], chunk_size: Optional[int] = None) -> Iterator[Dict[int, List]]:
+        rows, cursor = self.read_rows_page(table_path, page_size=chunk_size)
+        yield rows
+        while cursor is not None:
+            rows, cursor = self.read_rows_page(table_path, cursor, chunk_size)
+            yield rows
+
+    def iter_column(self, table_path: List[str], column_id: str, chunk_size: Optional[int] = None) -> Iterator[List]:
+        chunk_size = chunk_size or PAGE_SIZE
+        assert 0 < chunk_size <= MAX_PAGE_SIZE
+        layout = self._mongo_layout(table_path)
+        if layout:
+            values = layout.iter_column(column_id, chunk_size)
+        else:
+            values = self._iter_snapshot_column(table_path, column_id, chunk_size)
+        return chunked(values, chunk_size)
+
+    def _iter_snapshot_column(self, table_path: List[str], column_id: str, chunk_size: int) -> Iterator:
+        # the snapshot stays pinned until the values are consumed or closed, one chunk is copied at a time
+        with self.snapshot(table_path) as snapshot:
+            assert column_id in snapshot.column_ids, column_id
+            # no chunk outlives the loop, a mapped table closed meanwhile can then unmap all of its files
+            chunks = snapshot.chunks(chunk_size, [column_id])
+            yield from chain.from_iterable(columns[column_id] for _, columns in chunks)
+
+    def import_rows(self, table_path: List[str], data: Iterable[Union[str, bytes]], format_: str = 'csv',
+                    batch_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streams CSV or JSON Lines, given as text or UTF-8 pieces such as the lines of a file or upload chunks,
+        into the table, see importer.parse; batch_size rows are appended at a time, so that only one batch
+        is held in memory.
+
+        Yields a report after every batch, ``{'rows', 'seconds', 'rows_per_second', 'done', 'success'}``,
+        and a last one with ``done`` set; on failure, the batches before the failing one stay imported.
+        """
+        start, imported = perf_counter(), 0
+        batch_size = batch_size or importer.BATCH_SIZE
+        try:
+            assert 0 < batch_size <= MAX_PAGE_SIZE
+            with self.reading(table_path):
+                schema = self.read(table_path).schema
+                column_types = {column_id: schema.column_type(column_id) for column_id in schema.column_ids}
+            assert column_types, 'The table has no columns'
+            parsed = importer.parse(importer.split_lines(data), format_, column_types)
+            for columns in importer.batches(parsed, list(column_types), batch_size):
+                assert self.create_rows_from_columns(table_path, columns)
+                imported += len(next(iter(columns.values())))
+                yield importer.report(imported, start)
+            yield importer.report(imported, start, done=True)
+        except Exception:
+            print(traceback.format_exc())
+            yield importer.report(imported, start, done=True, success=False)
+
+    def export(self, table_path: List[str], format_: str = 'csv', chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Streams the table as CSV, JSON Lines or the columnar binary format, see exporter.encode, encoding
+        chunk_size rows at a time: a pinned snapshot is copied one chunk at a time, and Mongo layouts that
+        push queries down are read page by page like iter_rows, so memory does not grow with the table.
+        """
+        chunk_size = chunk_size or exporter.CHUNK_SIZE
+        assert format_ in exporter.FORMATS, format_
+        assert 0 < chunk_size <= MAX_PAGE_SIZE
+        layout = self._mongo_layout(table_path)
+        if layout and layout.pushdown:
+            return self._export_pages(table_path, format_, chunk_size)
+        return self._export_snapshot(table_path, format_, chunk_size)
+
+    def _export_snapshot(self, table_path: List[str], format_: str, chunk_size: int) -> Iterator[bytes]:
+        # the snapshot stays pinned until the export is consumed or closed
+        with self.snapshot(table_path) as snapshot:
+            yield from exporter.encode(format_, snapshot.column_ids, snapshot.column_types,
+                                       snapshot.chunks(chunk_size))
+
+    def _export_pages(self, table_path: List[str], format_: str, chunk_size: int) -> Iterator[bytes]:
+        base_id, table_id = table_path
+        mongo_collection = self[base_id].mongo_base[table_id]
+        schema = Schema(mongo_collection.find_one({'id': 'schema'}, {'_id': 0}), mongo_collection)
+        column_ids = schema.column_ids
+        chunks = ((list(rows), {column_id: [row[idx] for row in rows.values()]
+                                for idx, column_id in enumerate(column_ids)})
+                  for rows in self.iter_rows(table_path, chunk_size))
+        yield from exporter.encode(format_, column_ids, {column_id: schema.column_type(column_id)
+                                                         for column_id in column_ids}, chunks)
+
+    def _column_ids(self, table_path: List[str]) -> List[str]:
+        """The table's column ids, read from the schema document in Mongo mode without loading the table."""
+        if mongo_client:
+            mongo_writer.flush()
+            base_id, table_id = table_path
+            schema = self[base_id].mongo_base[table_id].find_one({'id': 'schema'}, {'_id': 0, 'columns': 1})
+            return list(schema['columns'])
+        table = self[table_path]
+        return table.schema.column_ids if isinstance(table, Table) else table.column_ids
+
+    def _mongo_layout(self, table_path: List[str]) -> Optional[Layout]:
+        """The layout of the table's Mongo collection, read without loading the table."""
+        if not mongo_client:
+            return None
+        mongo_writer.flush()
+        base_id, table_id = table_path
+        mongo_collection = self[base_id].mongo_base[table_id]
+        schema = mongo_collection.find_one({'id': 'schema'}, {'_id': 0, 'layout': 1, 'chunk_size': 1, 'row_index': 1})
+        return LAYOUTS[schema.get('layout', RowLayout.name)](mongo_collection, mongo_writer, schema)
+
+    def _query_mongo(self, table_path: List[str], where: Optional[Dict], column_ids: Optional[List[str]],
+                     limit: Optional[int], offset: int, after: Optional[int] = None,
+                     order_by: Optional[List] = None) -> Dict[int, List]:
+        """Pushes the predicate and the projection down to Mongo instead of loading the table."""
+        mongo_writer.flush()
+        base_id, table_id = table_path
+        mongo_collection = self[base_id].mongo_base[table_id]
+        schema_column_ids = self._column_ids(table_path)
+        conditions = query.normalize(where, schema_column_ids)
+        order = query.normalize_order(order_by, schema_column_ids)
+        query.check_columns(column_ids or [], schema_column_ids)
+        column_ids = column_ids or schema_column_ids
+
+        cursor = mongo_collection.find(query.mongo_filter(conditions, after),
+                                       {'_id': 0, 'id': 1, **{column_id: 1 for column_id in column_ids}})
+        # Mongo keeps the k first documents of a sort with a limit, equal keys in row id order
+        cursor = cursor.sort(order + [('id', 1)]).skip(offset)
+        cursor = cursor.batch_size(min(limit or MONGO_BATCH_SIZE, MONGO_BATCH_SIZE))
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return {document['id']: [document.get(column_id) for column_id in column_ids] for document in cursor}
+
+    def save_table(self, table_path: List[str], path: str) -> bool:
+        """Writes a consistent snapshot of the table in the memory-mappable columnar format."""
+        try:
+            with ExitStack() as stack:
+                with self.reading(table_path):
+                    table: Table = self[table_path]
+                    schema = json.loads(json.dumps(table.schema))
+                    snapshot = stack.enter_context(table.snapshot())
+                columnar.write_table(path, schema, snapshot)
+            return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    def open_table(self, table_path: List[str], path: str) -> bool:
+        """Mounts a table saved by save_table, read-only; its columns are read straight from the mapped files."""
+        try:
+            assert not mongo_client
+            with self.writing(table_path):
+                base_id, table_id = table_path
+                base: Base = self[base_id]
+                assert table_id not in base
+                record = self._record('open_table', table_path=table_path, path=path)
+                base.add(MappedTable(path), table_id)
+                self._log(record)
+                return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
+
+    def read_stats(self, table_path: List[str]) -> Dict:
+        """The row count and the statistics of every column, see stats.ColumnStats."""
+        with self.reading(table_path):
+            return self[table_path].statistics()
 
     def read_schema(self, table_path: List[str]):
-        return self.read(table_path).schema
+        with self.reading(table_path):
+            return self.read(table_path).schema
+
+    def read_column_ids(self, table_path: List[str]) -> List[str]:
+        """The table's column ids; unlike read_schema, this does not load a Mongo-backed table."""
+        with self.reading(table_path):
+            return self._column_ids(table_path)
 
     def update_row(self, table_path: List[str], row_id: int, sub_row: Dict):
         try:
-            table: Table = self.read(table_path)
-            assert set(sub_row.keys()) <= set(table.schema.column_ids)
-            for column_id in sub_row.keys():
-                column_validators = table.schema.validators(column_id)
-                assert all(validator(sub_row[column_id]) for validator in column_validators)
-                table[row_id][column_id] = sub_row[column_id]
-            return True
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                assert set(sub_row.keys()) <= set(table.schema.column_ids)
+                # all values are checked before the first one is written
+                assert all(table.schema.validators(column_id)(value) for column_id, value in sub_row.items())
+                table.check_indexable({column_id: [value] for column_id, value in sub_row.items()})
+                record = self._record('update_row', table_path=table_path, row_id=row_id, sub_row=sub_row)
+                row = table[row_id]
+                for column_id, value in sub_row.items():
+                    row[column_id] = value
+                table.touch()
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
     def update_column(self, table_path: List[str], column_id: str, sub_column: Dict[str, List]):
         try:
-            table: Table = self.read(table_path)
-            assert set(sub_column.keys()) <= set(table.keys())
-            column_validators = table.schema.validators(column_id)
-            assert all(validator(value) for validator in column_validators for value in sub_column.values())
-            for row_id in sub_column.keys():
-                table[row_id][column_id] = sub_column[row_id]
-            return True
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                assert set(sub_column.keys()) <= set(table.keys())
+                assert table.schema.validators(column_id).validate_many(sub_column.values())
+                table.check_indexable({column_id: sub_column.values()})
+                record = self._record('update_column', table_path=table_path, column_id=column_id,
+                                      sub_column=sub_column)
+                for row_id, value in sub_column.items():
+                    table.set_value(row_id, column_id, value)
+                table.touch()
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
     def delete(self, path: List) -> bool:
         try:
-            self.read(path[:-1]).pop(path[-1])
-            return True
+            with self.writing(path):
+                branch = self.read(path[:-1])
+                record = self._record('delete', path=path)
+                node = branch.pop(path[-1])
+                if isinstance(branch, Table):
+                    branch.touch()
+                else:
+                    self.locks.discard(path)
+                    self._unmount(node)
+                self._log(record)
+                return True
         except Exception:
             print(traceback.format_exc())
             return False
 
-    def intersect_tables(self, by_column_id: str, table1_path: List[str], table2_path: List[str],
-                         new_table_path: List[str]) -> bool:
+    def delete_index(self, table_path: List[str], column_id: str) -> bool:
         try:
-            tb1, tb2 = self.read(table1_path), self.read(table2_path)
-
-            tb1_column_ids = tb1.schema.column_ids
-            tb2_column_ids = tb2.schema.column_ids
+            with self.locks.writing(table_path):
+                table: Table = self.read(table_path)
+                record = self._record('delete_index', table_path=table_path, column_id=column_id)
+                table.drop_index(column_id)
+                table.touch()
+                self._log(record)
+                return True
+        except Exception:
+            print(traceback.format_exc())
+            return False
 
-            assert set(tb1_column_ids).intersection(tb2_column_ids) == {by_column_id}, \
-                (by_column_id, tb1_column_ids, tb2_column_ids)
+    def intersect_tables(self, by_column_id: Union[str, List[str]], table1_path: List[str], table2_path: List[str],
+                         new_table_path: List[str], algorithm: Optional[str] = None,
+                         explain: bool = False) -> Union[Optional[str], Tuple[Optional[str], Optional[Dict]]]:
+        """
+        Joins two tables into a new one and returns the used join algorithm, None on failure;
+        with explain, also the executed plan, see planner.plan_join.
+        """
+        try:
+            with self.locks.tree.write():
+                tb1, tb2 = self.read(table1_path), self.read(table2_path)
+                by_column_ids = [by_column_id] if isinstance(by_column_id, str) else list(by_column_id)
 
-            self.create(new_table_path)
-            new_column_ids = tb1_column_ids + tb2_column_ids
-            new_column_ids.remove(by_column_id)
-            self.create_columns(new_table_path, {column_id: {} for column_id in new_column_ids})
+                tb1_column_ids = tb1.column_ids
+                tb2_column_ids = tb2.column_ids
 
-            new_table = self.read(new_table_path)
-            by_column_idx1 = tb1.schema.id_to_idx(by_column_id)
-            by_column_idx2 = tb2.schema.id_to_idx(by_column_id)
-            for row1 in tb1.values():
-                for row2 in tb2.values():
-                    if row1[by_column_idx1] == row2[by_column_idx2]:
-                        new_table.add(dict(zip(tb1_column_ids + tb2_column_ids, row1 + row2)))
+                assert by_column_ids and set(tb1_column_ids).intersection(tb2_column_ids) == set(by_column_ids), \
+                    (by_column_ids, tb1_column_ids, tb2_column_ids)
 
-            return True
+                tb1_columns = {column_id: tb1.column(column_id) for column_id in tb1_column_ids}
+                tb2_columns = {column_id: tb2.column(column_id) for column_id in tb2_column_ids}
+                if len(by_column_ids) == 1:
+                    keys1, keys2 = tb1_columns[by_column_ids[0]], tb2_columns[by_column_ids[0]]
+                else:
+                    keys1 = list(zip(*map(tb1_columns.get, by_column_ids)))
+                    keys2 = list(zip(*map(tb2_columns.get, by_column_ids)))
+                # planned first, a forced algorithm that does not apply leaves no new table behind
+                plan = planner.plan_join(tb1, tb2, by_column_ids, keys1, keys2, algorithm)
+
+                assert self.create(new_table_path)
+                new_column_ids = [column_id for column_id in tb1_column_ids if column_id not in by_column_ids]
+                new_column_ids += tb2_column_ids
+                assert self.create_columns(new_table_path, {column_id: {} for column_id in new_column_ids})
+                positions1, positions2 = plan.run(self._join, plan, tb1, tb2, keys1, keys2,
+                                                  count=lambda positions: len(positions[0]))
+                algorithm = plan.details['algorithm']
+
+                new_columns = {column_id: list(map(tb2_columns[column_id].__getitem__, positions2))
+                               for column_id in tb2_column_ids}
+                new_columns.update({column_id: list(map(tb1_columns[column_id].__getitem__, positions1))
+                                    for column_id in new_column_ids if column_id not in new_columns})
+                new_table = self.read(new_table_path)
+                # the creation of the table and its columns were logged by the calls above
+                record = self._record('create_rows_from_columns', table_path=new_table_path, columns=new_columns)
+                new_table.add_columns_values(new_columns)
+                new_table.touch()
+                self._log(record)
+
+                return (algorithm, plan.to_dict()) if explain else algorithm
         except Exception:
             print(traceback.format_exc())
-            return False
+            return (None, None) if explain else None
+
+    @staticmethod
+    def _join(plan: planner.Plan, tb1: Table, tb2: Table, keys1: List, keys2: List) -> Tuple[List[int], List[int]]:
+        """The matching positions in both tables' live rows for a plan of planner.plan_join."""
+        if plan.operator == 'empty_join':
+            return [], []
+        if plan.operator == 'hash_join':
+            return joins.hash_join(keys1, keys2)
+        if plan.details['source'] == 'columns':
+            return joins.merge_join(keys1, keys2)
+        # merge the sorted indexes and map their row ids to positions in the live rows
+        sides = []
+        for table in (tb1, tb2):
+            index: SortedIndex = table.indexes[plan.details['column_id']]
+            live_positions = {row_id: position for position, row_id in enumerate(table.keys())}
+            sides.append((index.keys, [live_positions[row_id] for row_id in index.row_ids]))
+        (keys1, order1), (keys2, order2) = sides
+        positions1, positions2 = joins.merge_join(keys1, keys2)
+        return [order1[position] for position in positions1], [order2[position] for position in positions2]
+
+
+def recover_tree() -> Root:
+    """Rebuilds the tree from the embedded storage's snapshot and write-ahead log."""
+    state = storage.load_snapshot()
+    tree = Root()
+    for base_id, tables in state['bases'].items():
+        base = Base(base_id)
+        for table_id, table_state in tables.items():
+            if 'mapped' in table_state:
+                base.add(MappedTable(table_state['mapped']), table_id)
+                continue
+            table = Table(table_id, raw_schema=table_state['schema'])
+            table._extend(table_state['row_ids'], table_state['columns'])
+            base.add(table)
+        tree.add(base)
+
+    storage.replaying = True
+    try:
+        for op, args in storage.records(state['segment']):
+            if op == 'update_column':
+                args['sub_column'] = dict(args['sub_column'])
+            assert getattr(tree, op)(**args), (op, args)
+    finally:
+        storage.replaying = False
+    storage.open(state['segment'])
+    storage.start(tree.checkpoint)
+    return tree
 
 
 def create_tree() -> Root:
+    assert not (mongo_client and storage), 'Mongo and the embedded storage are exclusive'
+    if storage:
+        return recover_tree()
     if mongo_client:
         return Root(children=[
             Base(
@@ -0,0 +1,257 @@
+import json
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import stats
+from planner import Executor
+from stats import ColumnStats
+
+FORMAT_VERSION = 1
+HEADER = 'header.json'
+
+# fixed-width kinds are memoryview formats, in native byte order
+FIXED_KINDS = {int: 'q', float: 'd', bool: '?'}
+KIND_TYPES = {'q': int, 'd': float, '?': bool, 'str': str, 'json': None}
+
+
+def column_kind(values: Sequence) -> str:
+    types = set(map(type, values))
+    type_ = types.pop() if len(types) == 1 else None
+    if type_ is int and not all(-2 ** 63 <= value < 2 ** 63 for value in values):
+        return 'json'
+    return FIXED_KINDS.get(type_) or ('str' if type_ is str else 'json')
+
+
+def _write_fixed(path: str, kind: str, values: Sequence):
+    with open(path, 'wb') as file:
+        if kind == '?':
+            file.write(bytes(bytearray(values)))
+        else:
+            array(kind, values).tofile(file)
+
+
+def _write_variable(path: str, encoded: Iterator[bytes]):
+    offsets = array('q', [0])
+    with open(path + '.data', 'wb') as file:
+        for value in encoded:
+            file.write(value)
+            offsets.append(offsets[-1] + len(value))
+    with open(path + '.offsets', 'wb') as file:
+        offsets.tofile(file)
+
+
+def write_table(path: str, schema: Dict, snapshot) -> Dict:
+    """
+    Writes a table snapshot as one file per column and returns the header.
+
+    Columns whose values are all ints, floats or bools are fixed-width arrays; strings and any other
+    values (JSON-encoded) are an array of offsets plus the concatenated UTF-8 data.
+    """
+    os.makedirs(path, exist_ok=True)
+    row_ids = snapshot.keys()
+    _write_fixed(os.path.join(path, 'row_ids.bin'), 'q', row_ids)
+
+    kinds = {}
+    for idx, column_id in enumerate(snapshot.column_ids):
+        values = snapshot.column(column_id)
+        kinds[column_id] = kind = column_kind(values)
+        if kind in FIXED_KINDS.values():
+            _write_fixed(os.path.join(path, f'{idx}.bin'), kind, values)
+        elif kind == 'str':
+            _write_variable(os.path.join(path, str(idx)), (value.encode() for value in values))
+        else:
+            _write_variable(os.path.join(path, str(idx)), (json.dumps(value).encode() for value in values))
+
+    header = {'format': FORMAT_VERSION, 'length': len(row_ids), 'schema': schema,
+              'column_ids': snapshot.column_ids, 'kinds': kinds}
+    with open(os.path.join(path, HEADER), 'w') as file:
+        json.dump(header, file)
+    return header
+
+
+class VariableColumn(Sequence):
+    """A string or JSON column decoded one value at a time from the mapped data."""
+
+    def __init__(self, offsets: memoryview, data: memoryview, kind: str):
+        self.offsets = offsets
+        self.data = data
+        self.kind = kind
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        value = str(self.data[self.offsets[idx]:self.offsets[idx + 1]], 'utf-8')
+        return value if self.kind == 'str' else json.loads(value)
+
+
+class MappedRow(list):
+    """The values of a mapped table row, also by column id; read-only like the table."""
+
+    def __init__(self, id_: int, column_ids: List[str], values: Iterable):
+        super().__init__(values)
+        self.id_ = id_
+        self.column_ids = column_ids
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            item = self.column_ids.index(item)
+        return list.__getitem__(self, item)
+
+
+class MappedTable(Executor):
+    """
+    A read-only table opened from the files written by write_table.
+
+    Columns are memory-mapped: fixed-width columns are memoryviews over the file, variable-width ones
+    decode values on access, so opening does not depend on the table size. The table never changes,
+    so it is its own snapshot; close waits for the snapshots pinned before it. Row ids are sorted,
+    so rows are found by bisection; queries scan, there are no indexes.
+    """
+    indexes: Dict = {}
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, HEADER)) as file:
+            self.header = json.load(file)
+        assert self.header['format'] == FORMAT_VERSION, self.header['format']
+        self.schema: Dict = self.header['schema']
+        self.column_ids: List[str] = self.header['column_ids']
+        self.column_types: Dict[str, Optional[type]] = {column_id: KIND_TYPES[kind]
+                                                        for column_id, kind in self.header['kinds'].items()}
+        self.maps: List[mmap.mmap] = []
+        self.pins = 0
+        self.closing = False
+        self.lock = threading.Lock()
+        # built on first use, the table never changes
+        self.stats: Dict[str, ColumnStats] = {}
+
+        self.row_ids = self._map('row_ids.bin', 'q')
+        self.columns: Dict[str, Sequence] = {}
+        for idx, column_id in enumerate(self.column_ids):
+            kind = self.header['kinds'][column_id]
+            if kind in ('str', 'json'):
+                self.columns[column_id] = VariableColumn(self._map(f'{idx}.offsets', 'q'),
+                                                         self._map(f'{idx}.data', 'B'), kind)
+            else:
+                self.columns[column_id] = self._map(f'{idx}.bin', kind)
+
+    def _map(self, name: str, kind: str) -> memoryview:
+        with open(os.path.join(self.path, name), 'rb') as file:
+            if not os.fstat(file.fileno()).st_size:
+                return memoryview(b'').cast(kind)
+            self.maps.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        return memoryview(self.maps[-1]).cast(kind)
+
+    def snapshot(self) -> 'MappedTable':
+        with self.lock:
+            assert not self.closing, self.path
+            self.pins += 1
+        return self
+
+    def __enter__(self) -> 'MappedTable':
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.pins -= 1
+            closed = self.closing and not self.pins
+        if closed:
+            self._close()
+
+    def __len__(self):
+        return self.header['length']
+
+    def __contains__(self, row_id) -> bool:
+        position = bisect_left(self.row_ids, row_id)
+        return position < len(self) and self.row_ids[position] == row_id
+
+    def __getitem__(self, item):
+        if isinstance(item, int):
+            position = self.position(item)
+            return MappedRow(item, self.column_ids, [self.columns[column_id][position]
+                                                     for column_id in self.column_ids])
+        return dict(zip(self.row_ids, self.columns[item]))
+
+    @cached_property
+    def live(self) -> bytes:
+        # nothing is ever deleted
+        return b'\x01' * len(self)
+
+    def position(self, row_id: int) -> int:
+        if row_id not in self:
+            raise KeyError(row_id)
+        return bisect_left(self.row_ids, row_id)
+
+    def page(self, after: Optional[int], page_size: int) -> Tuple[Dict[int, List], Optional[int]]:
+        """As Table.page."""
+        start = 0 if after is None else bisect_right(self.row_ids, after)
+        stop = min(start + page_size, len(self))
+        columns = [self.columns[column_id] for column_id in self.column_ids]
+        rows = {self.row_ids[position]: [column[position] for column in columns] for position in range(start, stop)}
+        return rows, self.row_ids[stop - 1] if stop < len(self) else None
+
+    def keys(self) -> memoryview:
+        return self.row_ids
+
+    def column(self, column_id: str) -> Sequence:
+        return self.columns[column_id]
+
+    def values(self) -> Iterator[List]:
+        columns = [self.columns[column_id] for column_id in self.column_ids]
+        return map(list, zip(*columns)) if columns else iter([[]] * len(self))
+
+    def items(self) -> Iterator[Tuple[int, List]]:
+        return zip(self.row_ids, self.values())
+
+    def chunks(self, chunk_size: int,
+               column_ids: Optional[List[str]] = None) -> Iterator[Tuple[Sequence, Dict[str, Sequence]]]:
+        """Row ids and column values of every chunk_size rows; fixed-width ones are slices of the mapped files."""
+        for start in range(0, len(self), chunk_size):
+            end = min(start + chunk_size, len(self))
+            yield self.row_ids[start:end], {column_id: self.columns[column_id][start:end]
+                                            for column_id in column_ids or self.column_ids}
+
+    def column_stats(self, column_id: str) -> ColumnStats:
+        if column_id not in self.stats:
+            self.stats[column_id] = ColumnStats(self.columns[column_id])
+        return self.stats[column_id]
+
+    def statistics(self) -> Dict:
+        return stats.statistics({column_id: self.column_stats(column_id) for column_id in self.column_ids}, len(self))
+
+    def close(self):
+        """Unmaps the files, once the snapshots pinned so far are released; closing again does nothing."""
+        with self.lock:
+            if self.closing:
+                return
+            self.closing = True
+            closed = not self.pins
+        if closed:
+            self._close()
+
+    def _close(self):
+        self.row_ids.release()
+        for column in self.columns.values():
+            if isinstance(column, VariableColumn):
+                column.offsets.release()
+                column.data.release()
+            else:
+                column.release()
+        for map_ in self.maps:
+            try:
+                map_.close()
+            except BufferError:
+                # column slices handed out still point into the map, it is closed when the last one is gone
+                pass
@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from columnar import FIXED_KINDS, column_kind
+
+FORMATS = ('csv', 'jsonl', 'binary')
+CHUNK_SIZE = 10_000
+MIME_TYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson', 'binary': 'application/octet-stream'}
+
+BINARY_FORMAT = 'dbms-columns'
+BINARY_VERSION = 1
+# every binary message is its JSON header's length, the header and the buffers the header lists the sizes of
+LENGTH = struct.Struct('<I')
+
+Chunk = Tuple[Sequence[int], Dict[str, Sequence]]
+
+
+def csv_field(value):
+    """The CSV text of a value as importer.csv_converter reads it back: bools in lowercase, containers as JSON."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def encode_csv(column_ids: List[str], column_types: Dict[str, Optional[type]],
+               chunks: Iterable[Chunk]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(column_ids)
+    # None is written as an empty field already
+    plain = [column_types.get(column_id) in (int, float, str) for column_id in column_ids]
+    for _, columns in chunks:
+        writer.writerows(zip(*(columns[column_id] if is_plain else map(csv_field, columns[column_id])
+                               for column_id, is_plain in zip(column_ids, plain))))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def encode_jsonl(column_ids: List[str], chunks: Iterable[Chunk]) -> Iterator[bytes]:
+    for _, columns in chunks:
+        yield ''.join(json.dumps(dict(zip(column_ids, row))) + '\n'
+                      for row in zip(*(columns[column_id] for column_id in column_ids))).encode()
+
+
+def fixed_buffer(kind: str, values: Sequence) -> bytes:
+    """The raw values in native byte order; slices of mapped columns already are."""
+    if isinstance(values, memoryview):
+        return values.tobytes()
+    if kind == '?':
+        return bytes(bytearray(values))
+    return array(kind, values).tobytes()
+
+
+def variable_buffers(kind: str, values: Sequence) -> Tuple[bytes, bytes]:
+    """The offsets of the values into their concatenated UTF-8 data, and the data, as the columnar files."""
+    encoded = [value.encode() for value in values] if kind == 'str' else [json.dumps(value).encode()
+                                                                           for value in values]
+    offsets = array('q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return offsets.tobytes(), b''.join(encoded)
+
+
+def message(header: Dict, buffers: Sequence[bytes] = ()) -> bytes:
+    header = json.dumps({**header, 'sizes': [len(buffer) for buffer in buffers]}).encode()
+    return b''.join([LENGTH.pack(len(header)), header, *buffers])
+
+
+def encode_binary(column_ids: List[str], chunks: Iterable[Chunk]) -> Iterator[bytes]:
+    """
+    A stream header naming the columns, then one record batch per chunk: the row ids and every column
+    in the layout of columnar.write_table, each batch choosing the kinds of its own values.
+    """
+    yield message({'format': BINARY_FORMAT, 'version': BINARY_VERSION, 'column_ids': column_ids,
+                   'byte_order': sys.byteorder})
+    for row_ids, columns in chunks:
+        kinds, buffers = {}, [fixed_buffer('q', row_ids)]
+        for column_id in column_ids:
+            values = columns[column_id]
+            kind = kinds[column_id] = values.format if isinstance(values, memoryview) else column_kind(values)
+            if kind in FIXED_KINDS.values():
+                buffers.append(fixed_buffer(kind, values))
+            else:
+                buffers.extend(variable_buffers(kind, values))
+        yield message({'length': len(row_ids), 'kinds': kinds}, buffers)
+
+
+def encode(format_: str, column_ids: List[str], column_types: Dict[str, Optional[type]],
+           chunks: Iterable[Chunk]) -> Iterator[bytes]:
+    """
+    The table's chunks encoded one at a time. CSV has a header row of the column ids and JSON Lines one object
+    per row, both as importer.parse reads them; the binary format also has the row ids, see encode_binary.
+    """
+    assert format_ in FORMATS, format_
+    if format_ == 'csv':
+        return encode_csv(column_ids, column_types, chunks)
+    if format_ == 'jsonl':
+        return encode_jsonl(column_ids, chunks)
+    return encode_binary(column_ids, chunks)
+
+
+def decode_values(kind: str, buffers: Iterator[bytes]) -> List:
+    if kind == '?':
+        return list(map(bool, next(buffers)))
+    if kind in FIXED_KINDS.values():
+        return memoryview(next(buffers)).cast(kind).tolist()
+    offsets, data = memoryview(next(buffers)).cast('q'), next(buffers)
+    values = [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+    return values if kind == 'str' else list(map(json.loads, values))
+
+
+def decode_binary(pieces: Iterable[bytes]) -> Iterator[Tuple[List[int], Dict[str, List]]]:
+    """The record batches of a binary export cut into pieces anywhere, as row ids and column values."""
+    pieces = iter(pieces)
+    pending = bytearray()
+
+    def take(size: int, last: bool = False) -> Optional[bytes]:
+        # only the end of a message may be the end of the stream
+        while len(pending) < size:
+            piece = next(pieces, None)
+            if piece is None:
+                if last and not pending:
+                    return None
+                raise ValueError('Truncated binary export')
+            pending.extend(piece)
+        data = bytes(pending[:size])
+        del pending[:size]
+        return data
+
+    def read_message(last: bool = True) -> Optional[Tuple[Dict, Iterator[bytes]]]:
+        length = take(LENGTH.size, last)
+        if length is None:
+            return None
+        header = json.loads(take(LENGTH.unpack(length)[0]))
+        return header, iter([take(size) for size in header['sizes']])
+
+    stream_header, _ = read_message(last=False)
+    if stream_header.get('format') != BINARY_FORMAT or stream_header['version'] != BINARY_VERSION:
+        raise ValueError('Not a binary export')
+    if stream_header['byte_order'] != sys.byteorder:
+        raise ValueError(f'The export is {stream_header["byte_order"]}-endian')
+    for header, buffers in iter(read_message, None):
+        row_ids = decode_values('q', buffers)
+        yield row_ids, {column_id: decode_values(header['kinds'][column_id], buffers)
+                        for column_id in stream_header['column_ids']}
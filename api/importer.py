@@ -0,0 +1,98 @@
+import codecs
+import csv
+import json
+import re
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+FORMATS = ('csv', 'jsonl')
+BATCH_SIZE = 10_000
+
+BOOLEANS = {'true': True, 'false': False, '1': True, '0': False}
+# what repr writes for ints and finite floats; int() and float() also take '1_000', ' 5 ', 'nan' and 'inf'
+INT_PATTERN = re.compile(r'-?(?:0|[1-9][0-9]*)')
+FLOAT_PATTERN = re.compile(r'-?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?')
+
+
+def split_lines(pieces: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """The lines, ends kept, of text or UTF-8 cut into pieces anywhere, e.g. into upload chunks."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    rest = ''
+    for piece in pieces:
+        *complete, rest = (rest + (decoder.decode(piece) if isinstance(piece, bytes) else piece)).split('\n')
+        for line in complete:
+            yield line + '\n'
+    rest += decoder.decode(b'', final=True)
+    if rest:
+        yield rest
+
+
+def infer(text: str):
+    """A CSV field of an untyped column: empty is null, then an int or a float if it is written as one, else str."""
+    if text == '':
+        return None
+    if INT_PATTERN.fullmatch(text):
+        return int(text)
+    if FLOAT_PATTERN.fullmatch(text):
+        return float(text)
+    return text
+
+
+def csv_converter(type_: Optional[type]) -> Callable[[str], object]:
+    """Parses the CSV fields of a column of the type its TypeValidator enforces."""
+    if type_ is None:
+        return infer
+    if type_ is str:
+        return str
+    if type_ is bool:
+        return lambda text: None if text == '' else BOOLEANS[text.lower()]
+    return lambda text: None if text == '' else type_(text)
+
+
+def json_converter(type_: Optional[type]) -> Optional[Callable]:
+    """JSON has one number type: integral numbers of float columns are widened, the rest is kept."""
+    if type_ is float:
+        return lambda value: float(value) if type(value) is int else value
+    return None
+
+
+def parse(lines: Iterable[str], format_: str, column_types: Dict[str, Optional[type]]) -> Iterator[Dict]:
+    """
+    Rows parsed one line at a time, with the values converted to the column types.
+
+    A CSV header names the columns, a JSON Lines row is an object; both must have exactly the table's columns.
+    """
+    assert format_ in FORMATS, format_
+    if format_ == 'csv':
+        rows = csv.DictReader(lines)
+        converters = {column_id: csv_converter(type_) for column_id, type_ in column_types.items()}
+    else:
+        rows = (json.loads(line) for line in lines if line.strip())
+        converters = {column_id: json_converter(type_) for column_id, type_ in column_types.items()}
+        converters = {column_id: converter for column_id, converter in converters.items() if converter is not None}
+
+    for number, row in enumerate(rows, 1):
+        if row.keys() != column_types.keys():
+            raise ValueError(f'Row {number} has the columns {sorted(row)}, not {sorted(column_types)}')
+        for column_id, converter in converters.items():
+            row[column_id] = converter(row[column_id])
+        yield row
+
+
+def batches(rows: Iterable[Dict], column_ids: List[str], batch_size: int) -> Iterator[Dict[str, List]]:
+    """The rows as per-column value lists of at most batch_size rows each."""
+    columns = {column_id: [] for column_id in column_ids}
+    for row in rows:
+        for column_id, values in columns.items():
+            values.append(row[column_id])
+        if len(columns[column_ids[0]]) == batch_size:
+            yield columns
+            columns = {column_id: [] for column_id in column_ids}
+    if columns[column_ids[0]]:
+        yield columns
+
+
+def report(rows: int, start: float, done: bool = False, success: bool = True) -> Dict:
+    seconds = perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds else 0.0,
+            'done': done, 'success': success}
@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Set
+
+
+class Index(ABC):
+    kind: str
+
+    @abstractmethod
+    def add(self, value, row_id: int):
+        pass
+
+    @abstractmethod
+    def check(self, values: Iterable):
+        """Raises TypeError unless all the values can be indexed; called before the table changes."""
+
+    def add_many(self, values: Iterable, row_ids: Iterable[int]):
+        for value, row_id in zip(values, row_ids):
+            self.add(value, row_id)
+
+    @abstractmethod
+    def remove(self, value, row_id: int):
+        pass
+
+    @abstractmethod
+    def find(self, value) -> List[int]:
+        pass
+
+
+class HashIndex(Index):
+    """Equality lookups in O(1)."""
+    kind = 'hash'
+
+    def __init__(self):
+        self.buckets: Dict[object, Set[int]] = {}
+
+    def add(self, value, row_id: int):
+        self.buckets.setdefault(value, set()).add(row_id)
+
+    def check(self, values: Iterable):
+        for value in values:
+            hash(value)
+
+    def remove(self, value, row_id: int):
+        bucket = self.buckets[value]
+        bucket.remove(row_id)
+        if not bucket:
+            del self.buckets[value]
+
+    def find(self, value) -> List[int]:
+        return sorted(self.buckets.get(value, ()))
+
+
+class SortedIndex(Index):
+    """Equality and range lookups in O(log n); keys and row ids are kept sorted by (key, row id)."""
+    kind = 'sorted'
+
+    def __init__(self):
+        self.keys: List = []
+        self.row_ids: List[int] = []
+
+    def add(self, value, row_id: int):
+        # the row ids of equal keys are sorted too
+        low, high = bisect_left(self.keys, value), bisect_right(self.keys, value)
+        position = bisect_right(self.row_ids, row_id, low, high)
+        self.keys.insert(position, value)
+        self.row_ids.insert(position, row_id)
+
+    def check(self, values: Iterable):
+        # builtin types are ordered within families, so comparing with the smallest and largest key is enough
+        sorted([*values, *self.keys[:1], *self.keys[-1:]])
+
+    def add_many(self, values: Iterable, row_ids: Iterable[int]):
+        pairs = sorted(zip(self.keys + list(values), self.row_ids + list(row_ids)))
+        self.keys = [key for key, _ in pairs]
+        self.row_ids = [row_id for _, row_id in pairs]
+
+    def remove(self, value, row_id: int):
+        low, high = bisect_left(self.keys, value), bisect_right(self.keys, value)
+        position = bisect_left(self.row_ids, row_id, low, high)
+        assert position < high and self.row_ids[position] == row_id, row_id
+        del self.keys[position]
+        del self.row_ids[position]
+
+    def find(self, value) -> List[int]:
+        return self.row_ids[bisect_left(self.keys, value):bisect_right(self.keys, value)]
+
+    def find_range(self, low=None, high=None) -> List[int]:
+        """Row ids of keys in [low, high]; a missing bound is unbounded."""
+        start = 0 if low is None else bisect_left(self.keys, low)
+        stop = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.row_ids[start:stop]
+
+    def ordered(self, descending: bool = False) -> Iterator[int]:
+        """Row ids in key order, lazily; equal keys stay in row id order in both directions."""
+        if not descending:
+            yield from self.row_ids
+            return
+        stop = len(self.keys)
+        while stop:
+            start = bisect_left(self.keys, self.keys[stop - 1], 0, stop)
+            yield from self.row_ids[start:stop]
+            stop = start
+
+
+INDEX_TYPES = {index_type.kind: index_type for index_type in (HashIndex, SortedIndex)}
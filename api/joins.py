@@ -0,0 +1,58 @@
+from itertools import islice
+from operator import le
+from typing import List, Tuple, Sequence
+
+HASH = 'hash'
+MERGE = 'merge'
+
+Positions = Tuple[List[int], List[int]]
+
+
+def is_sorted(keys: Sequence) -> bool:
+    try:
+        return all(map(le, keys, islice(keys, 1, None)))
+    except TypeError:
+        return False
+
+
+def hash_join(left_keys: Sequence, right_keys: Sequence) -> Positions:
+    """Builds a hash table on the smaller side and probes it with the larger one."""
+    swap = len(left_keys) < len(right_keys)
+    build_keys, probe_keys = (left_keys, right_keys) if swap else (right_keys, left_keys)
+
+    buckets = {}
+    for position, key in enumerate(build_keys):
+        buckets.setdefault(key, []).append(position)
+
+    probe_positions, build_positions = [], []
+    for position, key in enumerate(probe_keys):
+        matches = buckets.get(key)
+        if matches:
+            probe_positions.extend([position] * len(matches))
+            build_positions.extend(matches)
+
+    return (build_positions, probe_positions) if swap else (probe_positions, build_positions)
+
+
+def merge_join(left_keys: Sequence, right_keys: Sequence) -> Positions:
+    """Joins two key sequences that are both sorted in ascending order."""
+    left_positions, right_positions = [], []
+    i, j = 0, 0
+    while i < len(left_keys) and j < len(right_keys):
+        if left_keys[i] < right_keys[j]:
+            i += 1
+        elif right_keys[j] < left_keys[i]:
+            j += 1
+        else:
+            key = left_keys[i]
+            i_end, j_end = i, j
+            while i_end < len(left_keys) and left_keys[i_end] == key:
+                i_end += 1
+            while j_end < len(right_keys) and right_keys[j_end] == key:
+                j_end += 1
+            for left_position in range(i, i_end):
+                left_positions.extend([left_position] * (j_end - j))
+                right_positions.extend(range(j, j_end))
+            i, j = i_end, j_end
+    return left_positions, right_positions
+
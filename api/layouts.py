@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from itertools import compress, groupby, repeat
+from typing import Dict, Iterator, List, Tuple
+
+from pymongo.collection import Collection as MongoCollection
+
+import query
+from write_behind import MongoWriter
+
+CHUNK_SIZE = 65536
+MONGO_BATCH_SIZE = 10_000
+
+
+class Layout(ABC):
+    """How the rows of a table are stored in its Mongo collection, next to the schema document."""
+    name: str
+    # whether queries can be pushed down to Mongo
+    pushdown: bool
+
+    def __init__(self, mongo_collection: MongoCollection, writer: MongoWriter, schema: Dict):
+        self.mongo_collection = mongo_collection
+        self.writer = writer
+        self.schema = schema
+
+    @abstractmethod
+    def load(self, column_ids: List[str]) -> Tuple[List[int], Dict[str, List]]:
+        """The ids of the live rows in increasing order and the aligned column values."""
+        pass
+
+    @abstractmethod
+    def insert(self, row_ids: List[int], columns: Dict[str, List]):
+        """Stores new rows; row ids are consecutive and greater than all stored ids."""
+        pass
+
+    @abstractmethod
+    def set_value(self, row_id: int, column_id: str, value):
+        pass
+
+    @abstractmethod
+    def delete_row(self, row_id: int):
+        pass
+
+    @abstractmethod
+    def add_column(self, column_id: str, row_ids: List[int], values: List):
+        pass
+
+    @abstractmethod
+    def drop_column(self, column_id: str):
+        pass
+
+    @abstractmethod
+    def iter_column(self, column_id: str, batch_size: int) -> Iterator:
+        """The values of the live rows in row id order."""
+        pass
+
+
+class RowLayout(Layout):
+    """One document per row: ``{'id': row_id, column_id: value, ...}``."""
+    name = 'rows'
+    pushdown = True
+
+    def load(self, column_ids: List[str]) -> Tuple[List[int], Dict[str, List]]:
+        documents = self.mongo_collection.find(query.mongo_filter({}),
+                                               {'_id': 0, 'id': 1, **{column_id: 1 for column_id in column_ids}})
+        row_ids, columns = [], {column_id: [] for column_id in column_ids}
+        for document in documents.sort('id', 1).batch_size(MONGO_BATCH_SIZE):
+            row_ids.append(document['id'])
+            for column_id in column_ids:
+                columns[column_id].append(document.get(column_id))
+        return row_ids, columns
+
+    def insert(self, row_ids: List[int], columns: Dict[str, List]):
+        column_ids = list(columns)
+        self.writer.insert_many(self.mongo_collection, [
+            {'id': row_id, **dict(zip(column_ids, values))}
+            for row_id, values in zip(row_ids, zip(*columns.values()) if columns else repeat(()))
+        ])
+
+    def set_value(self, row_id: int, column_id: str, value):
+        self.writer.update_one(self.mongo_collection, {'id': row_id}, {'$set': {column_id: value}})
+
+    def delete_row(self, row_id: int):
+        self.writer.delete_one(self.mongo_collection, {'id': row_id})
+
+    def add_column(self, column_id: str, row_ids: List[int], values: List):
+        for row_id, value in zip(row_ids, values):
+            self.set_value(row_id, column_id, value)
+
+    def drop_column(self, column_id: str):
+        # stale values are never read back, the row documents are only projected on schema columns
+        pass
+
+    def iter_column(self, column_id: str, batch_size: int) -> Iterator:
+        documents = self.mongo_collection.find(query.mongo_filter({}), {'_id': 0, column_id: 1})
+        return (document.get(column_id) for document in documents.sort('id', 1).batch_size(batch_size))
+
+
+class ChunkLayout(Layout):
+    """
+    One document per column and chunk of ``chunk_size`` consecutive row ids.
+
+    Chunk ``n`` of a column holds the values of the row ids ``n * chunk_size`` to
+    ``(n + 1) * chunk_size - 1`` in ``{'id': 'n:column_id', 'values': [...]}``, and
+    ``{'id': 'n', 'live': [...]}`` tells which of these rows are not deleted.
+    Row ids are allocated consecutively, so a row's chunk and offset follow from its id.
+    """
+    name = 'chunks'
+    pushdown = False
+
+    @property
+    def chunk_size(self) -> int:
+        return self.schema['chunk_size']
+
+    @staticmethod
+    def chunk_id(chunk: int, column_id: str) -> str:
+        return f'{chunk}:{column_id}'
+
+    def chunks(self) -> range:
+        return range(self.schema['row_index'] // self.chunk_size + 1)
+
+    def find_chunks(self, key: str, ids: List[str]) -> Dict[str, List]:
+        documents = self.mongo_collection.find({'id': {'$in': ids}}, {'_id': 0, 'id': 1, key: 1})
+        return {document['id']: document[key] for document in documents}
+
+    def find_lives(self) -> List[List[bool]]:
+        lives = self.find_chunks('live', [str(chunk) for chunk in self.chunks()])
+        return [lives.get(str(chunk), []) for chunk in self.chunks()]
+
+    @staticmethod
+    def live_values(live: List[bool], values: List) -> Iterator:
+        # rows added before the column was stored in the chunk have no value
+        return compress(values + [None] * (len(live) - len(values)), live)
+
+    def load(self, column_ids: List[str]) -> Tuple[List[int], Dict[str, List]]:
+        lives = self.find_lives()
+        row_ids = []
+        for chunk, live in enumerate(lives):
+            start = chunk * self.chunk_size
+            row_ids.extend(compress(range(start, start + len(live)), live))
+
+        columns = {}
+        for column_id in column_ids:
+            chunks = self.find_chunks('values', [self.chunk_id(chunk, column_id) for chunk in self.chunks()])
+            columns[column_id] = []
+            for chunk, live in enumerate(lives):
+                columns[column_id].extend(self.live_values(live, chunks.get(self.chunk_id(chunk, column_id), [])))
+        return row_ids, columns
+
+    def insert(self, row_ids: List[int], columns: Dict[str, List]):
+        start = 0
+        for chunk, chunk_row_ids in groupby(row_ids, key=lambda row_id: row_id // self.chunk_size):
+            end = start + len(list(chunk_row_ids))
+            self.writer.update_one(self.mongo_collection, {'id': str(chunk)},
+                                   {'$push': {'live': {'$each': [True] * (end - start)}}}, upsert=True)
+            for column_id, values in columns.items():
+                self.writer.update_one(self.mongo_collection, {'id': self.chunk_id(chunk, column_id)},
+                                       {'$push': {'values': {'$each': values[start:end]}}}, upsert=True)
+            start = end
+
+    def set_value(self, row_id: int, column_id: str, value):
+        chunk, offset = divmod(row_id, self.chunk_size)
+        self.writer.update_one(self.mongo_collection, {'id': self.chunk_id(chunk, column_id)},
+                               {'$set': {f'values.{offset}': value}})
+
+    def delete_row(self, row_id: int):
+        chunk, offset = divmod(row_id, self.chunk_size)
+        self.writer.update_one(self.mongo_collection, {'id': str(chunk)}, {'$set': {f'live.{offset}': False}})
+
+    def add_column(self, column_id: str, row_ids: List[int], values: List):
+        by_row_id = dict(zip(row_ids, values))
+        for chunk in self.chunks():
+            start = chunk * self.chunk_size
+            end = min(start + self.chunk_size, self.schema['row_index'] + 1)
+            self.writer.update_one(self.mongo_collection, {'id': self.chunk_id(chunk, column_id)},
+                                   {'$set': {'values': [by_row_id.get(row_id) for row_id in range(start, end)]}},
+                                   upsert=True)
+
+    def drop_column(self, column_id: str):
+        self.writer.delete_many(self.mongo_collection,
+                                {'id': {'$in': [self.chunk_id(chunk, column_id) for chunk in self.chunks()]}})
+
+    def iter_column(self, column_id: str, batch_size: int) -> Iterator:
+        # one chunk document in memory at a time
+        for chunk, live in enumerate(self.find_lives()):
+            chunk_id = self.chunk_id(chunk, column_id)
+            yield from self.live_values(live, self.find_chunks('values', [chunk_id]).get(chunk_id, []))
+
+
+LAYOUTS = {layout.name: layout for layout in (RowLayout, ChunkLayout)}
@@ -0,0 +1,108 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class RWLock:
+    """
+    Reader/writer lock: any number of readers or a single writer.
+
+    Waiting writers block new readers, so a stream of reads cannot starve a writer.
+    The lock is reentrant per thread, and a writer may also take read locks,
+    but a reader cannot upgrade to a write lock.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers: Dict[int, int] = {}
+        self.writer: Optional[int] = None
+        self.writer_depth = 0
+        self.waiting_writers = 0
+
+    def acquire_read(self):
+        thread_id = threading.get_ident()
+        with self.condition:
+            if thread_id not in self.readers and self.writer != thread_id:
+                while self.writer is not None or self.waiting_writers:
+                    self.condition.wait()
+            self.readers[thread_id] = self.readers.get(thread_id, 0) + 1
+
+    def release_read(self):
+        thread_id = threading.get_ident()
+        with self.condition:
+            self.readers[thread_id] -= 1
+            if not self.readers[thread_id]:
+                del self.readers[thread_id]
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        thread_id = threading.get_ident()
+        with self.condition:
+            if self.writer == thread_id:
+                self.writer_depth += 1
+                return
+            assert thread_id not in self.readers, 'a read lock cannot be upgraded'
+            self.waiting_writers += 1
+            while self.writer is not None or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer, self.writer_depth = thread_id, 1
+
+    def release_write(self):
+        with self.condition:
+            self.writer_depth -= 1
+            if not self.writer_depth:
+                self.writer = None
+                self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class TreeLocks:
+    """
+    A tree lock and one reader/writer lock per table.
+
+    Creating and deleting bases and tables write-locks the tree, everything else read-locks it
+    and then locks the tables it touches, in path order, so that locks are always taken in the same order.
+    """
+
+    def __init__(self):
+        self.tree = RWLock()
+        self.tables: Dict[Tuple[str, str], RWLock] = {}
+        self.guard = threading.Lock()
+
+    def table(self, table_path: List[str]) -> RWLock:
+        with self.guard:
+            return self.tables.setdefault(tuple(table_path), RWLock())
+
+    @contextmanager
+    def reading(self, table_paths: Iterable[List[str]]):
+        with self.tree.read(), ExitStack() as stack:
+            for table_path in sorted(set(map(tuple, table_paths))):
+                stack.enter_context(self.table(table_path).read())
+            yield
+
+    @contextmanager
+    def writing(self, table_path: List[str]):
+        with self.tree.read(), self.table(table_path).write():
+            yield
+
+    def discard(self, path: List[str]):
+        """Forgets the locks of the tables under the path; the tree must be write-locked."""
+        with self.guard:
+            for key in [key for key in self.tables if list(key[:len(path)]) == path]:
+                del self.tables[key]
@@ -0,0 +1,129 @@
+import threading
+from itertools import compress
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from columnar import MappedTable
+
+
+class History:
+    """
+    Undo records of the in-place writes to one generation of a table's column lists.
+
+    Appends never change what a snapshot sees, so only overwrites are recorded, and only
+    while snapshots are pinned. Records older than every pinned snapshot are dropped.
+    """
+
+    def __init__(self):
+        # (column id or None for the live flags, position, previous value)
+        self.records: List[Tuple[Optional[str], int, object]] = []
+        self.offset = 0
+        self.pins: Dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def pin(self) -> int:
+        with self.lock:
+            start = self.offset + len(self.records)
+            self.pins[start] = self.pins.get(start, 0) + 1
+            return start
+
+    def release(self, start: int):
+        with self.lock:
+            self.pins[start] -= 1
+            if not self.pins[start]:
+                del self.pins[start]
+            oldest = min(self.pins, default=self.offset + len(self.records))
+            del self.records[:oldest - self.offset]
+            self.offset = oldest
+
+    def record(self, column_id: Optional[str], position: int, value):
+        if self.pins:
+            with self.lock:
+                self.records.append((column_id, position, value))
+
+    def since(self, start: int) -> List[Tuple[Optional[str], int, object]]:
+        with self.lock:
+            return self.records[start - self.offset:]
+
+
+class Snapshot:
+    """
+    A consistent, read-only view of a table as of the moment it was pinned.
+
+    Pinning is O(columns) and has to happen under the table's read lock; reading does not lock,
+    writers keep going and the snapshot undoes what they overwrote since. Release it when done.
+    """
+
+    def __init__(self, table):
+        self.column_ids: List[str] = table.schema.column_ids
+        self.column_types: Dict[str, Optional[type]] = {column_id: table.schema.column_type(column_id)
+                                                        for column_id in self.column_ids}
+        self.history: History = table.history
+        self.start = self.history.pin()
+        self.length = len(table.row_ids)
+        self.row_ids: List[int] = table.row_ids
+        self.live: bytearray = table.live
+        self.columns: Dict[str, List] = dict(table.columns)
+
+    def release(self):
+        if self.history is not None:
+            self.history.release(self.start)
+            self.history = None
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _undo(self, column_id: Optional[str], values, start: int = 0,
+              records: Optional[List[Tuple[Optional[str], int, object]]] = None):
+        """Undoes the overwrites of the positions from start on that the values were copied from."""
+        end = start + len(values)
+        # the oldest record of a position holds its value at pin time
+        for record_column_id, position, value in reversed(self.history.since(self.start) if records is None
+                                                          else records):
+            if record_column_id == column_id and start <= position < end:
+                values[position - start] = value
+        return values
+
+    def _live(self) -> bytearray:
+        return self._undo(None, self.live[:self.length])
+
+    def keys(self) -> List[int]:
+        return list(compress(self.row_ids[:self.length], self._live()))
+
+    def column(self, column_id: str) -> List:
+        return list(compress(self._undo(column_id, self.columns[column_id][:self.length]), self._live()))
+
+    def __len__(self):
+        return sum(self._live())
+
+    def values(self) -> Iterator[List]:
+        return map(list, zip(*map(self.column, self.column_ids))) if self.column_ids else iter([[]] * len(self))
+
+    def items(self) -> Iterator[Tuple[int, List]]:
+        return zip(self.keys(), self.values())
+
+    def chunks(self, chunk_size: int,
+               column_ids: Optional[List[str]] = None) -> Iterator[Tuple[List[int], Dict[str, List]]]:
+        """
+        The live rows of every chunk_size positions as row ids and the values of the columns, all by default;
+        one chunk is copied at a time.
+        """
+        for start in range(0, self.length, chunk_size):
+            end = min(start + chunk_size, self.length)
+            records = [record for record in self.history.since(self.start) if start <= record[1] < end]
+            live = self._undo(None, self.live[start:end], start, records)
+            yield list(compress(self.row_ids[start:end], live)), {
+                column_id: list(compress(self._undo(column_id, self.columns[column_id][start:end], start, records),
+                                         live))
+                for column_id in column_ids or self.column_ids}
+
+
+def materialize(node):
+    """Turns the snapshots and mapped tables in a tree, base or table snapshot into plain row dicts."""
+    if isinstance(node, (Snapshot, MappedTable)):
+        return dict(node.items())
+    if isinstance(node, dict):
+        return {key: materialize(child) for key, child in node.items()}
+    return node
@@ -0,0 +1,234 @@
+from math import log2
+from time import perf_counter
+from itertools import compress, islice
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import joins
+import query
+from indexes import Index, SortedIndex
+
+# costs are in sequential row visits: a row fetched through an index or a hash table costs more
+INDEX_LOOKUP_COST = 4
+HASH_BUILD_COST = 2
+
+
+class Plan:
+    """
+    A physical operator with its estimated row count and cost, and once run, its actual row count
+    and the seconds it took, children included.
+    """
+
+    def __init__(self, operator: str, estimated_rows: Optional[float], cost: float = 0,
+                 children: Sequence['Plan'] = (), **details):
+        self.operator = operator
+        self.estimated_rows = estimated_rows
+        self.cost = cost + sum(child.cost for child in children)
+        self.children = list(children)
+        self.details = details
+        self.actual_rows: Optional[int] = None
+        self.seconds: Optional[float] = None
+
+    def run(self, function: Callable, *args, count: Callable = len):
+        """Runs the operator's implementation and records its actual row count, count(result), and time."""
+        start = perf_counter()
+        result = function(*args)
+        self.seconds = perf_counter() - start
+        self.actual_rows = count(result)
+        return result
+
+    def chain(self) -> List['Plan']:
+        """The operators of a plan without branches, from the leaf up."""
+        return (self.children[0].chain() if self.children else []) + [self]
+
+    def to_dict(self) -> Dict:
+        return {'operator': self.operator,
+                'estimated_rows': None if self.estimated_rows is None else round(self.estimated_rows),
+                'actual_rows': self.actual_rows, 'seconds': self.seconds, 'cost': round(self.cost), **self.details,
+                'children': [child.to_dict() for child in self.children]}
+
+
+def selectivity(table, column_id: str, condition: Dict) -> float:
+    return table.column_stats(column_id).estimate(condition) / max(len(table), 1)
+
+
+def serves(index, condition: Dict) -> bool:
+    """Whether the index can look up a superset of the rows matching the condition."""
+    if isinstance(index, SortedIndex) and condition.keys() & ({'$eq'} | query.RANGE_OPERATORS):
+        return True
+    return bool(condition.keys() & {'$eq', '$in'})
+
+
+def plan_scan(table, conditions: query.Conditions) -> Plan:
+    """
+    The cheapest access path: a scan of every live row, or a lookup of the most selective condition
+    an index serves; the conditions then filter, most selective first.
+    """
+    rows = len(table)
+    scans = [Plan('full_scan', rows, rows)]
+    for column_id, condition in conditions.items():
+        index = getattr(table, 'indexes', {}).get(column_id)
+        if index is not None and serves(index, condition):
+            estimate = table.column_stats(column_id).estimate(condition)
+            scans.append(Plan('index_scan', estimate, INDEX_LOOKUP_COST * estimate + log2(rows + 1),
+                              column_id=column_id, index=index.kind))
+    scan = min(scans, key=lambda plan: plan.cost + len(conditions) * plan.estimated_rows)
+    if not conditions:
+        return scan
+
+    selectivities = {column_id: selectivity(table, column_id, condition)
+                     for column_id, condition in conditions.items()}
+    estimate = rows
+    for value in selectivities.values():
+        estimate *= value
+    return Plan('filter', estimate, len(conditions) * scan.estimated_rows, [scan],
+                conditions=sorted(conditions, key=selectivities.get))
+
+
+def plan_aggregate(table, conditions: query.Conditions, group_by: List[str]) -> Plan:
+    """A snapshot scan, the filter of the conditions and a hash aggregation of its rows."""
+    rows = len(table)
+    plan = Plan('snapshot_scan', rows, rows)
+    if conditions:
+        estimate = rows
+        for column_id, condition in conditions.items():
+            estimate *= selectivity(table, column_id, condition)
+        plan = Plan('filter', estimate, len(conditions) * rows, [plan], conditions=list(conditions))
+    if not group_by:
+        return Plan('aggregate', 1, plan.estimated_rows, [plan])
+    groups = 1
+    for column_id in group_by:
+        groups *= max(table.column_stats(column_id).distinct, 1)
+    return Plan('hash_aggregate', min(groups, plan.estimated_rows), 2 * plan.estimated_rows, [plan],
+                group_by=group_by)
+
+
+def plan_sort(table, child: Plan, order: query.Order, stop: Optional[int]) -> Plan:
+    """Walking a sorted index until enough rows matched, a bounded heap of the top rows, or a full sort."""
+    rows = child.estimated_rows
+    column_ids = [column_id for column_id, _ in order]
+    if stop is None:
+        sorts = [Plan('sort', rows, rows * log2(rows + 1), [child], order=column_ids)]
+    else:
+        sorts = [Plan('top_k', min(stop, rows), rows * log2(stop + 1), [child], order=column_ids, k=stop)]
+
+    index = getattr(table, 'indexes', {}).get(order[0][0])
+    if len(order) == 1 and isinstance(index, SortedIndex):
+        # the child's rows are only tested for membership while the index is walked
+        walked = len(table) if stop is None else min(len(table), stop * len(table) / max(rows, 1))
+        sorts.append(Plan('index_order', rows if stop is None else min(stop, rows), walked, [child],
+                          order=column_ids, index=index.kind))
+    return min(sorts, key=lambda plan: plan.cost)
+
+
+def plan_join(table1, table2, by_column_ids: List[str], keys1: Sequence, keys2: Sequence,
+              algorithm: Optional[str] = None) -> Plan:
+    """
+    A hash join, a merge join of key columns already in order, or of two sorted indexes on the key;
+    no join at all when the statistics show that the key ranges do not overlap.
+    """
+    stats1, stats2 = ([table.column_stats(column_id) for column_id in by_column_ids] for table in (table1, table2))
+    rows1, rows2 = len(keys1), len(keys2)
+    if not all(map(lambda left, right: left.may_overlap(right), stats1, stats2)):
+        return Plan('empty_join', 0, 0, algorithm=algorithm or joins.HASH)
+
+    # each key value of the side with fewer of them matches rows of the other side
+    distinct = max(1, *(max(left.distinct, right.distinct) for left, right in zip(stats1, stats2)))
+    estimate = rows1 * rows2 / distinct
+
+    plans = [Plan('hash_join', estimate, HASH_BUILD_COST * min(rows1, rows2) + max(rows1, rows2),
+                  algorithm=joins.HASH, build='left' if rows1 < rows2 else 'right')]
+    indexes = [getattr(table, 'indexes', {}).get(by_column_ids[0]) for table in (table1, table2)]
+    if len(by_column_ids) == 1 and all(isinstance(index, SortedIndex) for index in indexes):
+        plans.append(Plan('merge_join', estimate, rows1 + rows2, algorithm=joins.MERGE, source='index',
+                          column_id=by_column_ids[0]))
+    elif algorithm != joins.HASH and joins.is_sorted(keys1) and joins.is_sorted(keys2):
+        plans.append(Plan('merge_join', estimate, rows1 + rows2, algorithm=joins.MERGE, source='columns'))
+
+    if algorithm is not None:
+        plans = [plan for plan in plans if plan.details['algorithm'] == algorithm]
+        if not plans:
+            raise ValueError(f'No {algorithm} join for unsorted keys')
+    return min(plans, key=lambda plan: plan.cost)
+
+
+class Executor:
+    """
+    Runs the plans of plan_scan and plan_sort over a table: its ``columns`` and ``row_ids`` by position,
+    the ``live`` flags of the positions, its ``column_ids``, ``indexes`` and ``position`` of a row id.
+    """
+
+    def select(self, where: Optional[Dict] = None) -> List[int]:
+        """Positions of the rows matching the where-predicate, in row order."""
+        conditions = query.normalize(where, self.column_ids)
+        return self.run(plan_scan(self, conditions), conditions)
+
+    def query(self, where: Optional[Dict] = None, column_ids: Optional[List[str]] = None,
+              limit: Optional[int] = None, offset: int = 0, order_by: Optional[List] = None,
+              explain: bool = False) -> Union[Dict[int, List], Tuple[Dict[int, List], Plan]]:
+        """
+        The matching rows in row order or sorted by order_by, see query.normalize_order;
+        with explain, also the executed plan.
+        """
+        stop = None if limit is None else offset + limit
+        conditions = query.normalize(where, self.column_ids)
+        order = query.normalize_order(order_by, self.column_ids)
+        query.check_columns(column_ids or [], self.column_ids)
+        plan = plan_scan(self, conditions)
+        if order:
+            plan = plan_sort(self, plan, order, stop)
+        positions = self.run(plan, conditions, order, stop)[offset:stop]
+        columns = [self.columns[column_id] for column_id in column_ids or self.column_ids]
+        rows = {self.row_ids[position]: [column[position] for column in columns] for position in positions}
+        return (rows, plan) if explain else rows
+
+    def run(self, plan: Plan, conditions: Dict, order: Optional[List] = None,
+            stop: Optional[int] = None) -> List[int]:
+        """Executes a plan of plan_scan or plan_sort and returns the row positions."""
+        children = [self.run(child, conditions, order, stop) for child in plan.children]
+        return plan.run(getattr(self, f'_{plan.operator}'), plan, conditions, order, stop, *children)
+
+    def _full_scan(self, plan: Plan, *_) -> List[int]:
+        return list(compress(range(len(self.row_ids)), self.live))
+
+    def _index_scan(self, plan: Plan, conditions: Dict, *_) -> List[int]:
+        column_id = plan.details['column_id']
+        index, condition = self.indexes[column_id], conditions[column_id]
+        if isinstance(index, SortedIndex) and condition.keys() & ({'$eq'} | query.RANGE_OPERATORS):
+            try:
+                row_ids = index.find_range(*query.bounds(condition))
+            except TypeError:
+                # operands the keys cannot be compared with match nothing, as in a scan
+                row_ids = []
+        else:
+            row_ids = [row_id for value in ([condition['$eq']] if '$eq' in condition else condition['$in'])
+                       for row_id in self._index_find(index, value)]
+        return sorted(set(map(self.position, row_ids)))
+
+    @staticmethod
+    def _index_find(index: Index, value) -> List[int]:
+        try:
+            return index.find(value)
+        except TypeError:
+            return []
+
+    def _filter(self, plan: Plan, conditions: Dict, order, stop,
+                positions: List[int]) -> List[int]:
+        for column_id in plan.details['conditions']:
+            test, column = query.compile_condition(conditions[column_id]), self.columns[column_id]
+            positions = [position for position in positions if test(column[position])]
+        return positions
+
+    def _sort(self, plan: Plan, conditions, order: List, stop: Optional[int],
+              positions: List[int]) -> List[int]:
+        return query.order(positions, [self.columns[column_id] for column_id, _ in order],
+                           [direction for _, direction in order], stop)
+
+    _top_k = _sort
+
+    def _index_order(self, plan: Plan, conditions, order: List, stop: Optional[int],
+                     positions: List[int]) -> List[int]:
+        # the index is already sorted, the first matches are the top rows
+        (column_id, direction), = order
+        selected = set(positions)
+        return list(islice(filter(selected.__contains__,
+                                  map(self.position, self.indexes[column_id].ordered(direction == -1))), stop))
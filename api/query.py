@@ -0,0 +1,137 @@
+import heapq
+from operator import eq, ne, lt, le, gt, ge
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def is_in(value, operand) -> bool:
+    return value in operand
+
+
+def not_in(value, operand) -> bool:
+    return value not in operand
+
+
+OPERATORS: Dict[str, Callable] = {
+    '$eq': eq, '$ne': ne, '$lt': lt, '$lte': le, '$gt': gt, '$gte': ge, '$in': is_in, '$nin': not_in,
+}
+RANGE_OPERATORS = {'$lt', '$lte', '$gt', '$gte'}
+
+Conditions = Dict[str, Dict[str, object]]
+Order = List[Tuple[str, int]]
+
+
+def check_columns(keys: Iterable[str], column_ids: Optional[Sequence[str]]):
+    """
+    Raises ValueError for keys that are not among the column ids, when those are given: row documents
+    in Mongo also hold the id field, and keys such as ``$expr`` would be Mongo operators.
+    """
+    if column_ids is not None:
+        unknown = [key for key in keys if key not in column_ids]
+        if unknown:
+            raise ValueError(f'Unknown columns {unknown}')
+
+
+def normalize(where: Dict, column_ids: Optional[Sequence[str]] = None) -> Conditions:
+    """
+    Brings a where-predicate to the ``{column_id: {operator: operand}}`` form.
+
+    The predicate is a conjunction over columns in a subset of the Mongo query language:
+    ``{'co1': 3, 'co2': {'$gte': 1, '$lt': 10}, 'co3': {'$in': ['a', 'b']}}``; see check_columns.
+    """
+    check_columns(where or {}, column_ids)
+    conditions = {}
+    for column_id, condition in (where or {}).items():
+        if not isinstance(condition, dict):
+            condition = {'$eq': condition}
+        for operator in condition:
+            if operator not in OPERATORS:
+                raise ValueError(f'Unsupported operator {operator}')
+        conditions[column_id] = condition
+    return conditions
+
+
+def compile_condition(condition: Dict[str, object]) -> Callable[[object], bool]:
+    tests: List[Tuple[Callable, object]] = [(OPERATORS[operator], operand) for operator, operand in condition.items()]
+
+    def test(value) -> bool:
+        try:
+            return all(operator(value, operand) for operator, operand in tests)
+        except TypeError:
+            return False
+
+    return test
+
+
+def bounds(condition: Dict[str, object]) -> Tuple[object, object]:
+    """The inclusive [low, high] range covering the condition; None stands for an open end."""
+    low = high = None
+    if '$eq' in condition:
+        low = high = condition['$eq']
+    for operator in ('$gt', '$gte'):
+        if operator in condition:
+            low = condition[operator]
+    for operator in ('$lt', '$lte'):
+        if operator in condition:
+            high = condition[operator]
+    return low, high
+
+
+def mongo_filter(conditions: Conditions, after: Optional[int] = None) -> Dict:
+    """Row documents matching the conditions, with ids greater than after; the schema document is excluded."""
+    id_filter = {'id': {'$type': 'number'}}
+    if after is not None:
+        id_filter['id']['$gt'] = after
+    return {'$and': [id_filter, conditions]} if conditions else id_filter
+
+
+def normalize_order(order_by: Optional[List], column_ids: Optional[Sequence[str]] = None) -> Order:
+    """
+    Brings a sort order to the ``[(column_id, direction)]`` form of pymongo, 1 ascending and -1 descending.
+
+    A bare column id sorts ascending: ``['co1', ['co2', -1]]``; see check_columns.
+    """
+    order = []
+    for key in order_by or []:
+        column_id, direction = (key, 1) if isinstance(key, str) else key
+        if direction not in (1, -1):
+            raise ValueError(f'Unsupported direction {direction}')
+        order.append((column_id, int(direction)))
+    check_columns([column_id for column_id, _ in order], column_ids)
+    return order
+
+
+class Descending:
+    """Reverses the comparison of a sort key part, so that mixed directions make one key."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other: 'Descending') -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: 'Descending') -> bool:
+        return other.value < self.value
+
+
+def sort_key(columns: List[Sequence], directions: List[int]) -> Callable[[int], Tuple]:
+    """The sort key of a position; nulls come first in ascending order and last in descending, as in Mongo."""
+    def key(position: int) -> Tuple:
+        return tuple((value is not None, value) if direction == 1 else Descending((value is not None, value))
+                     for value, direction in ((column[position], direction)
+                                              for column, direction in zip(columns, directions)))
+
+    return key
+
+
+def order(positions: List[int], columns: List[Sequence], directions: List[int],
+          limit: Optional[int] = None) -> List[int]:
+    """
+    The positions sorted by the columns' values, equal keys in position order.
+
+    With a limit only the first ``limit`` positions are kept in a bounded heap: O(n log k) instead of O(n log n).
+    """
+    key = sort_key(columns, directions)
+    if limit is None or limit >= len(positions):
+        return sorted(positions, key=key)
+    return heapq.nsmallest(limit, positions, key=key)
@@ -0,0 +1,221 @@
+import json
+from bisect import bisect_left, bisect_right
+from math import log
+from numbers import Number
+from typing import Dict, Iterable, List
+
+import query
+
+HLL_PRECISION = 10
+HISTOGRAM_BUCKETS = 32
+# the share of a column's values changed since the last build after which the estimates are rebuilt
+REBUILD_FRACTION = 0.2
+# values of other types have no order: a column holding them has no min, max and histogram
+ORDERED_TYPES = {int, float, str, bool}
+
+MASK = (1 << 64) - 1
+
+
+def fingerprint(value) -> int:
+    """A well-mixed 64-bit hash; small ints hash to themselves, so Python's hash is mixed with splitmix64."""
+    try:
+        h = hash(value)
+    except TypeError:
+        h = hash(json.dumps(value, sort_keys=True))
+    h = (h ^ (h >> 30)) * 0xbf58476d1ce4e5b9 & MASK
+    h = (h ^ (h >> 27)) * 0x94d049bb133111eb & MASK
+    return h ^ (h >> 31)
+
+
+class HyperLogLog:
+    """Distinct count estimate in 2 ** precision one-byte registers, about 1.04 / sqrt(2 ** precision) off."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = fingerprint(value)
+        register, rest = h >> (64 - self.precision), h & (MASK >> self.precision)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[register]:
+            self.registers[register] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        raw = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # linear counting is more precise for small cardinalities
+            return round(m * log(m / zeros))
+        return round(raw)
+
+
+class ColumnStats:
+    """
+    Statistics of one column: value and null counts, min and max, a HyperLogLog distinct estimate
+    and an equi-depth histogram of the non-null values.
+
+    Counts are exact. Bucket depths follow every write, but deleted values cannot be taken out of the
+    HyperLogLog and min and max only widen, so they are bounds; once more than REBUILD_FRACTION of the
+    values changed, ``stale`` tells the owner to rebuild the statistics from the column.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        values = list(values)
+        self.count = len(values)
+        present = [value for value in values if value is not None]
+        self.nulls = self.count - len(present)
+        self.ordered = set(map(type, present)) <= ORDERED_TYPES
+        self.min = self.max = None
+        self.hll = HyperLogLog()
+        for value in present:
+            self.hll.add(value)
+        # bucket i holds the values in (bounds[i - 1], bounds[i]], the first one from min
+        self.bounds: List = []
+        self.depths: List[int] = []
+        self.modified = 0
+        if self.ordered:
+            try:
+                present.sort()
+            except TypeError:
+                self.ordered = False
+            else:
+                self._build_histogram(present)
+                if present:
+                    self.min, self.max = present[0], present[-1]
+
+    def _build_histogram(self, present: List):
+        buckets = min(HISTOGRAM_BUCKETS, len(present))
+        bounds = sorted(set(present[(i + 1) * len(present) // buckets - 1] for i in range(buckets)))
+        ends = [bisect_right(present, bound) for bound in bounds]
+        self.bounds = bounds
+        self.depths = [end - start for start, end in zip([0] + ends, ends)]
+
+    @property
+    def stale(self) -> bool:
+        return self.modified > REBUILD_FRACTION * max(self.count, 1)
+
+    @property
+    def distinct(self) -> int:
+        return min(self.hll.estimate(), self.count - self.nulls)
+
+    def _widen(self, present: List):
+        if not self.ordered or not present:
+            return
+        try:
+            if not set(map(type, present)) <= ORDERED_TYPES:
+                raise TypeError
+            low, high = min(present), max(present)
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            self.ordered, self.min, self.max, self.bounds, self.depths = False, None, None, [], []
+
+    def add_many(self, values: List):
+        present = [value for value in values if value is not None]
+        self.count += len(values)
+        self.nulls += len(values) - len(present)
+        self._widen(present)
+        self.modified += len(values)
+        if self.stale:
+            # rebuilt before the next use anyway
+            return
+        for value in present:
+            self.hll.add(value)
+            if self.bounds:
+                bucket = bisect_left(self.bounds, value)
+                if bucket == len(self.bounds):
+                    self.bounds[-1] = value
+                    bucket -= 1
+                self.depths[bucket] += 1
+
+    def add(self, value):
+        self.add_many([value])
+
+    def remove(self, value):
+        self.count -= 1
+        self.modified += 1
+        if value is None:
+            self.nulls -= 1
+        elif self.bounds:
+            bucket = bisect_left(self.bounds, value)
+            if bucket < len(self.bounds) and self.depths[bucket]:
+                self.depths[bucket] -= 1
+
+    def estimate_eq(self, value) -> float:
+        """Estimated number of values equal to the value."""
+        present = self.count - self.nulls
+        if value is None:
+            return self.nulls
+        try:
+            if self.min is not None and not self.min <= value <= self.max:
+                return 0
+        except TypeError:
+            return 0
+        return present / max(self.distinct, 1)
+
+    def estimate_range(self, low=None, high=None) -> float:
+        """Estimated number of values in [low, high]; a missing bound is unbounded."""
+        present = self.count - self.nulls
+        if not self.bounds:
+            return present / 3
+        rows, start = 0.0, self.min
+        try:
+            for bound, depth in zip(self.bounds, self.depths):
+                rows += depth * _overlap(start, bound, low, high)
+                start = bound
+        except TypeError:
+            return 0
+        return min(rows, present)
+
+    def estimate(self, condition: Dict[str, object]) -> float:
+        """Estimated number of values matching a normalized query condition, see query.normalize."""
+        present = self.count - self.nulls
+        estimates = [present]
+        if '$eq' in condition:
+            estimates.append(self.estimate_eq(condition['$eq']))
+        if '$in' in condition:
+            estimates.append(sum(map(self.estimate_eq, condition['$in'])))
+        if condition.keys() & query.RANGE_OPERATORS:
+            estimates.append(self.estimate_range(*query.bounds(condition)))
+        if '$ne' in condition:
+            estimates.append(present - self.estimate_eq(condition['$ne']))
+        if '$nin' in condition:
+            estimates.append(present - sum(map(self.estimate_eq, condition['$nin'])))
+        return max(min(estimates), 0)
+
+    def may_overlap(self, other: 'ColumnStats') -> bool:
+        """Whether the two columns can share a value; joins match null keys like any other, as == does."""
+        if self.nulls and other.nulls:
+            return True
+        if self.count == self.nulls or other.count == other.nulls:
+            return False
+        if self.min is None or other.min is None:
+            return True
+        try:
+            return self.min <= other.max and other.min <= self.max
+        except TypeError:
+            return True
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'nulls': self.nulls, 'min': self.min, 'max': self.max,
+                'distinct': self.distinct, 'histogram': {'bounds': self.bounds, 'depths': self.depths}}
+
+
+def _overlap(start, end, low, high) -> float:
+    """The share of the bucket [start, end] inside [low, high], interpolated for numbers."""
+    if (low is not None and end < low) or (high is not None and high < start):
+        return 0.0
+    if (low is None or low <= start) and (high is None or end <= high):
+        return 1.0
+    if isinstance(start, Number) and isinstance(end, Number) and end > start:
+        covered = min(end, end if high is None else high) - max(start, start if low is None else low)
+        return max(covered, 0) / (end - start)
+    return 0.5
+
+
+def statistics(stats: Dict[str, ColumnStats], row_count: int) -> Dict:
+    return {'row_count': row_count, 'columns': {column_id: column_stats.to_dict()
+                                                for column_id, column_stats in stats.items()}}
+
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class Storage:
+    """
+    Embedded persistence: a write-ahead log of Root operations plus periodic snapshots of the tree.
+
+    Every successful mutation appends one JSON line to the current log segment before the call returns.
+    ``fsync`` decides when the segment is forced to disk:
+    ``always``: before the call returns; concurrent commits share one fsync (group commit).
+    ``interval``: at most every ``fsync_interval`` seconds, so a crash can lose that much.
+    ``never``: left to the OS.
+    A checkpoint writes the whole tree to ``snapshot.json`` and starts a new segment, older segments are
+    deleted; it runs in the background once ``snapshot_every`` records were logged since the last one.
+    Recovery loads the snapshot and replays the segments written after it; a torn last record is dropped.
+    """
+    ALWAYS, INTERVAL, NEVER = 'always', 'interval', 'never'
+    SNAPSHOT = 'snapshot.json'
+
+    def __init__(self, directory: str, fsync: str = ALWAYS, fsync_interval: float = 0.05,
+                 snapshot_every: int = 100_000):
+        assert fsync in (self.ALWAYS, self.INTERVAL, self.NEVER), fsync
+        self.directory = directory
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        self.replaying = False
+        self.file = None
+        self.segment = 0
+        self.lsn = 0
+        self.synced_lsn = 0
+        self.last_sync = time.monotonic()
+        self.since_snapshot = 0
+        # appends and rotations, then fsyncs: one fsync covers every record appended before it
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+
+        self.checkpoint_due = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f'wal.{segment:06d}.log')
+
+    def segments(self) -> List[int]:
+        return sorted(int(name.split('.')[1]) for name in os.listdir(self.directory)
+                      if name.startswith('wal.') and name.endswith('.log'))
+
+    def load_snapshot(self) -> Dict:
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        if not os.path.exists(path):
+            return {'segment': 0, 'bases': {}}
+        with open(path) as file:
+            return json.load(file)
+
+    def records(self, first_segment: int) -> Iterator[Tuple[str, Dict]]:
+        """The logged operations from the segment on, in order."""
+        for segment in self.segments():
+            if segment < first_segment:
+                continue
+            with open(self.segment_path(segment), 'rb+') as file:
+                end = 0
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # a record torn by a crash, nothing was acknowledged after it
+                        file.truncate(end)
+                        break
+                    end += len(line)
+                    yield record['op'], record['args']
+
+    def open(self, segment: int):
+        """Starts appending to a new segment after recovery."""
+        self.segment = max([segment - 1] + self.segments()) + 1
+        self.file = open(self.segment_path(self.segment), 'a')
+
+    @staticmethod
+    def encode(op: str, args: Dict) -> str:
+        """The log line of an operation; raises ValueError unless the record reads back as it is, so it replays."""
+        record = {'op': op, 'args': args}
+        line = json.dumps(record, allow_nan=False) + '\n'
+        if json.loads(line) != record:
+            raise ValueError(f'The {op} record does not survive JSON')
+        return line
+
+    def log(self, line: str):
+        with self.lock:
+            self.file.write(line)
+            self.lsn += 1
+            lsn = self.lsn
+            self.since_snapshot += 1
+            if self.since_snapshot >= self.snapshot_every:
+                self.checkpoint_due.set()
+
+        if self.fsync == self.ALWAYS:
+            self.sync(lsn)
+        elif self.fsync == self.INTERVAL and time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync(lsn)
+        elif self.fsync == self.NEVER:
+            with self.lock:
+                self.file.flush()
+
+    def sync(self, lsn: Optional[int] = None):
+        with self.sync_lock:
+            if lsn is not None and self.synced_lsn >= lsn:
+                # a concurrent commit's fsync covered this record
+                return
+            with self.lock:
+                self.file.flush()
+                file, target = self.file, self.lsn
+            os.fsync(file.fileno())
+            self.synced_lsn = max(self.synced_lsn, target)
+            self.last_sync = time.monotonic()
+
+    def rotate(self) -> int:
+        """Starts a new segment and returns its number; the caller must keep the tree from changing."""
+        with self.sync_lock, self.lock:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.synced_lsn = self.lsn
+            self.file.close()
+            self.segment += 1
+            self.file = open(self.segment_path(self.segment), 'a')
+            self.since_snapshot = 0
+            return self.segment
+
+    def write_snapshot(self, state: Dict):
+        """Atomically replaces the snapshot and deletes the segments it covers."""
+        path = os.path.join(self.directory, self.SNAPSHOT)
+        with open(path + '.tmp', 'w') as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + '.tmp', path)
+        for segment in self.segments():
+            if segment < state['segment']:
+                os.remove(self.segment_path(segment))
+
+    def start(self, checkpoint: Callable[[], None]):
+        """Runs the checkpoints in a background thread."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, args=(checkpoint,), daemon=True)
+            self.thread.start()
+
+    def _run(self, checkpoint: Callable[[], None]):
+        while True:
+            # the interval policy also needs a sync when no more writes come
+            if self.checkpoint_due.wait(self.fsync_interval if self.fsync == self.INTERVAL else None):
+                self.checkpoint_due.clear()
+                checkpoint()
+            elif self.file is not None and self.synced_lsn < self.lsn:
+                self.sync()
+
+    def close(self):
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
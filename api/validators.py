@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from itertools import repeat
 from pydoc import locate
+from typing import Iterable
 import re
 
 
@@ -8,18 +10,40 @@ class Validator(ABC):
     def __call__(self, value):
         pass
 
+    def validate_many(self, values: Iterable) -> bool:
+        return all(map(self, values))
+
 
 class TypeValidator(Validator):
     def __init__(self, type_descr: str):
         self.type_ = locate(type_descr)
+        assert isinstance(self.type_, type)
 
     def __call__(self, value):
-        assert isinstance(self.type_, type)
         return isinstance(value, self.type_)
 
+    def validate_many(self, values: Iterable) -> bool:
+        return all(map(isinstance, values, repeat(self.type_)))
+
 
 # https://html.spec.whatwg.org/multipage/input.html#email-state-(type=email)
 class EmailValidator(Validator):
+    pattern = re.compile(r"^[a-zA-Z0-9.!#$%&'*+\\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+                         r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$")
+
     def __call__(self, value):
-        return re.match(r"^[a-zA-Z0-9.!#$%&'*+\\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
-                        r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$", value)
+        return self.pattern.match(value)
+
+    def validate_many(self, values: Iterable) -> bool:
+        return all(map(self.pattern.match, values))
+
+
+class Pipeline(list):
+    """The compiled validators of one column."""
+
+    def __call__(self, value) -> bool:
+        return all(validator(value) for validator in self)
+
+    def validate_many(self, values: Iterable) -> bool:
+        values = values if isinstance(values, list) else list(values)
+        return all(validator.validate_many(values) for validator in self)
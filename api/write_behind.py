@@ -0,0 +1,185 @@
+import threading
+from contextlib import contextmanager
+from copy import deepcopy
+import time
+from itertools import groupby
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo.collection import Collection as MongoCollection
+from pymongo.database import Database as MongoDatabase
+
+# a queued drop of the collection or database it is queued for
+DROP = object()
+
+
+class MongoWriter:
+    """
+    Routes Mongo writes through an optional write-behind buffer.
+
+    ``sync``: every write is sent immediately (the default).
+    ``group``: writes are buffered and sent as ordered ``bulk_write`` batches once ``batch_size``
+    writes are pending or ``interval`` seconds have passed since the oldest pending write.
+    ``async``: like ``group``, but a background thread also flushes every ``interval`` seconds,
+    so writes never wait for Mongo.
+
+    ``flush`` sends everything pending; errors of background flushes are raised by the next call.
+    A failed flush keeps the writes it did not send queued, ahead of newer ones, for the next flush.
+    While ``holding``, nothing is sent, whatever the mode, until the block ends; see Root.batch.
+    """
+    SYNC, GROUP, ASYNC = 'sync', 'group', 'async'
+
+    def __init__(self, mode: str = SYNC, batch_size: int = 1000, interval: float = 0.05):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self.queue: List[Tuple[MongoCollection, object]] = []
+        self.pending_collections: Set[str] = set()
+        self.oldest_write: Optional[float] = None
+        self.error: Optional[Exception] = None
+        self.held = False
+        self.lock = threading.RLock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def configure(self, mode: Optional[str] = None, batch_size: Optional[int] = None,
+                  interval: Optional[float] = None):
+        assert mode in (None, self.SYNC, self.GROUP, self.ASYNC), mode
+        self.flush()
+        if mode is not None:
+            self.mode = mode
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if interval is not None:
+            self.interval = interval
+        if self.mode == self.ASYNC and self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def insert_one(self, collection: MongoCollection, document: Dict):
+        self._write(collection, InsertOne(document))
+
+    def insert_many(self, collection: MongoCollection, documents: List[Dict]):
+        if self.mode == self.SYNC and not self.held:
+            collection.insert_many(documents)
+        else:
+            for document in documents:
+                self._write(collection, InsertOne(document))
+
+    def update_one(self, collection: MongoCollection, filter_: Dict, update: Dict, upsert: bool = False):
+        if self.mode != self.SYNC:
+            # the update may reference live schema dicts that change before the flush
+            update = deepcopy(update)
+        self._write(collection, UpdateOne(filter_, update, upsert=upsert))
+
+    def delete_one(self, collection: MongoCollection, filter_: Dict):
+        self._write(collection, DeleteOne(filter_))
+
+    def delete_many(self, collection: MongoCollection, filter_: Dict):
+        self._write(collection, DeleteMany(filter_))
+
+    def drop(self, target: Union[MongoCollection, MongoDatabase]):
+        """Drops a collection or a database once the writes queued before it are sent."""
+        if not self.held:
+            self.flush()
+            _drop(target)
+            return
+        with self.lock:
+            self.queue.append((target, DROP))
+
+    def pending(self, collection: MongoCollection) -> bool:
+        return collection.full_name in self.pending_collections
+
+    @contextmanager
+    def holding(self):
+        """
+        Queues every write of the block, even in ``sync`` mode, and sends them when it ends;
+        when it raises, they are dropped instead. Only the writing thread may run meanwhile.
+        """
+        self.flush()
+        self.held = True
+        try:
+            yield
+        except BaseException:
+            with self.lock:
+                self.held = False
+                self.queue = []
+                self.pending_collections.clear()
+                self.oldest_write = None
+            raise
+        self.held = False
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.held:
+                return
+            error, self.error = self.error, None
+            queue, self.queue = self.queue, []
+            self.pending_collections.clear()
+            self.oldest_write = None
+            sent = 0
+            try:
+                # consecutive writes to the same collection go in one ordered batch
+                for (target, dropped), run in groupby(queue, key=lambda write: (write[0], write[1] is DROP)):
+                    requests = [request for _, request in run]
+                    if dropped:
+                        _drop(target)
+                    else:
+                        target.bulk_write(requests, ordered=True)
+                    sent += len(requests)
+            except BulkWriteError as e:
+                # an ordered batch stops at its first failed write, which would fail again
+                self._requeue(queue[sent + e.details['writeErrors'][0]['index'] + 1:])
+                raise
+            except Exception:
+                self._requeue(queue[sent:])
+                raise
+        if error is not None:
+            raise error
+
+    def _requeue(self, writes: List[Tuple[MongoCollection, object]]):
+        if not writes:
+            return
+        self.queue[:0] = writes
+        self.pending_collections.update(target.full_name for target, request in writes if request is not DROP)
+        self.oldest_write = time.monotonic()
+
+    def _write(self, collection: MongoCollection, request):
+        if self.mode == self.SYNC and not self.held:
+            collection.bulk_write([request])
+            return
+
+        with self.lock:
+            # queued first: the caller has already applied the write in memory, even if the flush raises
+            self.queue.append((collection, request))
+            self.pending_collections.add(collection.full_name)
+            if self.oldest_write is None:
+                self.oldest_write = time.monotonic()
+            due = len(self.queue) >= self.batch_size or time.monotonic() - self.oldest_write >= self.interval
+            failed = self.error is not None
+
+        if failed or due and self.mode == self.GROUP:
+            # raises the error of a background flush once the write is sent
+            self.flush()
+        elif due:
+            self.wakeup.set()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                with self.lock:
+                    self.error = e
+
+
+def _drop(target: Union[MongoCollection, MongoDatabase]):
+    if isinstance(target, MongoDatabase):
+        target.client.drop_database(target.name)
+    else:
+        target.drop()
@@ -0,0 +1,69 @@
+"""
+Struct + type pairs vs typed protobuf columns for 100k-row ReadRows and CreateRows payloads.
+
+Only the encoding, serialization and decoding are measured; no server is involved.
+Run from the repository root:
+    PYTHONPATH=api:grpc_/messages:. python -m benchmarks.grpc_codec
+"""
+from timeit import timeit
+
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.struct_pb2 import Struct
+
+import grpc_.messages.tree_pb2 as tree_messages
+from grpc_.services.tree import to_jsonable_rows, from_jsonable_rows, to_jsonable_row, from_jsonable_row, \
+    to_typed_rows, from_typed_rows
+
+ROWS = 100_000
+
+
+def make_rows():
+    return {i: [i, i * 0.5, f'value {i}'] for i in range(ROWS)}
+
+
+def read_rows_struct(rows):
+    resp = Struct()
+    resp.update(to_jsonable_rows(rows))
+    received = Struct.FromString(resp.SerializeToString())
+    return from_jsonable_rows(MessageToDict(received))
+
+
+def read_rows_typed(rows):
+    columns = dict(zip(['co1', 'co2', 'co3'], map(list, zip(*rows.values()))))
+    resp = to_typed_rows(rows.keys(), columns, {'co1': int, 'co2': float, 'co3': str})
+    received = tree_messages.TypedRows.FromString(resp.SerializeToString())
+    return from_typed_rows(received)
+
+
+def create_rows_struct(rows):
+    request = tree_messages.CreateRowsRequest()
+    for row in rows:
+        struct = Struct()
+        struct.update(to_jsonable_row(row))
+        request.rows.append(struct)
+    received = tree_messages.CreateRowsRequest.FromString(request.SerializeToString())
+    return [from_jsonable_row(MessageToDict(row_message)) for row_message in received.rows]
+
+
+def create_rows_typed(rows):
+    request = tree_messages.CreateTypedRowsRequest()
+    request.rows.CopyFrom(to_typed_rows([], {column_id: [row[column_id] for row in rows] for column_id in rows[0]}))
+    received = tree_messages.CreateTypedRowsRequest.FromString(request.SerializeToString())
+    return from_typed_rows(received.rows)
+
+
+def main():
+    rows = make_rows()
+    raw_rows = [dict(zip(['co1', 'co2', 'co3'], row)) for row in rows.values()]
+    cases = (
+        ('ReadRows struct', lambda: read_rows_struct(rows)),
+        ('ReadRows typed', lambda: read_rows_typed(rows)),
+        ('CreateRows struct', lambda: create_rows_struct(raw_rows)),
+        ('CreateRows typed', lambda: create_rows_typed(raw_rows)),
+    )
+    for name, case in cases:
+        print(f'{name:>18}: {timeit(case, number=1):8.3f} s')
+
+
+if __name__ == '__main__':
+    main()
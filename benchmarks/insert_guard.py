@@ -0,0 +1,39 @@
+"""
+Per-insert cost of the Branch mutation guard.
+
+Run from the repository root:
+    PYTHONPATH=api python -m benchmarks.insert_guard
+"""
+import inspect
+from timeit import timeit
+
+import api
+from api import Table
+
+ROWS = 10_000
+
+
+class InspectGuardTable(Table):
+    """The guard used before: inspects the caller's frame on every insert."""
+
+    def _insert(self, key, value):
+        call_func = inspect.stack()[1][3]
+        assert call_func == 'add'
+        dict.__setitem__(self, key, value)
+
+
+def insert_rows(table_type):
+    table = table_type('tb', raw_schema={'columns': {'co1': {'validator_defs': []}}, 'row_index': -1})
+    for i in range(ROWS):
+        table.add({'co1': i})
+
+
+def main():
+    api.mongo_client = None
+    for name, table_type in (('inspect.stack() guard', InspectGuardTable), ('_insert guard', Table)):
+        seconds = timeit(lambda: insert_rows(table_type), number=1)
+        print(f'{name:>24}: {seconds / ROWS * 1e6:8.2f} us/insert')
+
+
+if __name__ == '__main__':
+    main()
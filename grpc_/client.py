@@ -1,4 +1,5 @@
-from typing import Dict, List
+from functools import partial
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
 
 import grpc
 from google.protobuf.json_format import MessageToDict
@@ -6,8 +7,9 @@ from google.protobuf.struct_pb2 import Struct
 
 import grpc_.messages.tree_pb2 as tree_messages
 import grpc_.messages.tree_pb2_grpc as tree_service
-from grpc_.services.tree import to_type_pairs, from_type_pair, from_type_pairs, from_jsonable_rows, \
-    from_jsonable_base, from_jsonable_tree, to_jsonable_row, to_jsonable_column, from_jsonable_columns
+from grpc_.services.tree import from_type_pair, from_type_pairs, from_jsonable_rows, from_jsonable_base, \
+    from_jsonable_tree, to_jsonable_row, to_jsonable_column, to_values, to_typed_rows, from_typed_rows, \
+    from_typed_column, columns_to_rows, to_create_columns, from_table_stats
 
 channel = grpc.insecure_channel('127.0.0.1:50051')
 client = tree_service.TreeStub(channel)
@@ -39,13 +41,55 @@ def create_rows(base_id: str, table_id: str, rows: List[Dict]):
     return response
 
 
+def create_typed_rows(base_id: str, table_id: str, rows: List[Dict]):
+    request = tree_messages.CreateTypedRowsRequest()
+    request.table_path.extend([base_id, table_id])
+    column_ids = list(rows[0]) if rows else []
+    request.rows.CopyFrom(to_typed_rows([], {column_id: [row[column_id] for row in rows] for column_id in column_ids}))
+    response = client.CreateTypedRows(request)
+    return response
+
+
+def _ingest_request(base_id: str, table_id: str, rows: List[Dict]):
+    request = tree_messages.CreateTypedRowsRequest()
+    request.table_path.extend([base_id, table_id])
+    request.rows.CopyFrom(to_typed_rows([], {column_id: [row[column_id] for row in rows] for column_id in rows[0]}))
+    return request
+
+
+def _ingest_requests(base_id: str, table_id: str, rows: Iterable[Dict], chunk_size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield _ingest_request(base_id, table_id, chunk)
+            chunk = []
+    if chunk:
+        yield _ingest_request(base_id, table_id, chunk)
+
+
+def ingest_rows(base_id: str, table_id: str, rows: Iterable[Dict], chunk_size: int = 1000):
+    return client.IngestRows(_ingest_requests(base_id, table_id, rows, chunk_size))
+
+
+def _import_chunks(base_id: str, table_id: str, file: IO, format_: str, batch_size: Optional[int],
+                   chunk_size: int) -> Iterator[tree_messages.ImportChunk]:
+    yield tree_messages.ImportChunk(table_path=[base_id, table_id], format=format_, batch_size=batch_size or 0)
+    for data in iter(partial(file.read, chunk_size), file.read(0)):
+        yield tree_messages.ImportChunk(data=data.encode() if isinstance(data, str) else data)
+
+
+def import_rows(base_id: str, table_id: str, file: IO, format_: str = 'csv', batch_size: Optional[int] = None,
+                chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Uploads a CSV or JSON Lines file in chunks and yields the server's progress reports, see Root.import_rows."""
+    for report in client.ImportRows(_import_chunks(base_id, table_id, file, format_, batch_size, chunk_size)):
+        yield {field.name: getattr(report, field.name) for field in report.DESCRIPTOR.fields}
+
+
 def create_columns(base_id: str, table_id: str, columns: Dict[str, Dict]):
     request = tree_messages.CreateColumnsRequest()
     request.table_path.extend([base_id, table_id])
-    for column_id, column in columns.items():
-        if 'values' in column:
-            column['values'] = to_type_pairs(column['values'])
-        request.columns[column_id].update(column)
+    to_create_columns(request, columns)
     response = client.CreateColumns(request)
     return response
 
@@ -69,16 +113,71 @@ def read_rows(base_id: str, table_id: str):
     return from_jsonable_rows(_read(client.ReadRows, base_id, table_id))
 
 
+def read_typed_rows(base_id: str, table_id: str) -> Dict[int, List]:
+    request = tree_messages.PathRequest()
+    request.path.extend([base_id, table_id])
+    return columns_to_rows(*from_typed_rows(client.ReadTypedRows(request)))
+
+
+def read_rows_page(base_id: str, table_id: str, cursor: Optional[str] = None, page_size: Optional[int] = None):
+    request = tree_messages.ReadRowsPageRequest()
+    request.table_path.extend([base_id, table_id])
+    request.cursor = cursor or ''
+    request.page_size = page_size or 0
+    response = client.ReadRowsPage(request)
+    return from_jsonable_rows(MessageToDict(response.rows)), response.next_cursor or None
+
+
+def iter_rows_pages(base_id: str, table_id: str, page_size: Optional[int] = None) -> Iterator[Dict]:
+    cursor = None
+    while True:
+        rows, cursor = read_rows_page(base_id, table_id, cursor, page_size)
+        yield rows
+        if cursor is None:
+            break
+
+
+def _stream_request(base_id: str, table_id: str, column_id: str = '', chunk_size: Optional[int] = None):
+    request = tree_messages.StreamRequest()
+    request.table_path.extend([base_id, table_id])
+    request.column_id = column_id
+    request.chunk_size = chunk_size or 0
+    return request
+
+
+def stream_rows(base_id: str, table_id: str, chunk_size: Optional[int] = None) -> Iterator[Dict]:
+    for response in client.StreamRows(_stream_request(base_id, table_id, chunk_size=chunk_size)):
+        yield columns_to_rows(*from_typed_rows(response))
+
+
+def stream_column(base_id: str, table_id: str, column_id: str, chunk_size: Optional[int] = None) -> Iterator[List]:
+    for response in client.StreamColumn(_stream_request(base_id, table_id, column_id, chunk_size)):
+        yield from_typed_column(response)
+
+
+def export_table(base_id: str, table_id: str, format_: str = 'csv',
+                 chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """The table encoded as CSV, JSON Lines or the binary format one chunk at a time, see Root.export."""
+    request = tree_messages.ExportRequest(table_path=[base_id, table_id], format=format_, chunk_size=chunk_size or 0)
+    for response in client.ExportTable(request):
+        yield response.data
+
+
 def read_row(base_id: str, table_id: str, row_id: int):
     return from_type_pairs(_read(client.ReadRow, base_id, table_id, row_id))
 
 
 def read_columns(base_id: str, table_id: str):
-    return from_jsonable_columns(_read(client.ReadColumns, base_id, table_id))
+    request = tree_messages.PathRequest()
+    request.path.extend([base_id, table_id])
+    _, columns = from_typed_rows(client.ReadColumns(request))
+    return columns
 
 
 def read_column(base_id: str, table_id: str, column_id: str):
-    return from_type_pairs(_read(client.ReadColumn, base_id, table_id, column_id))
+    request = tree_messages.PathRequest()
+    request.path.extend([base_id, table_id, column_id])
+    return from_typed_column(client.ReadColumn(request))
 
 
 def read_value(base_id: str, table_id: str, row_id: int, column_id: str):
@@ -89,11 +188,65 @@ def read_schema(base_id: str, table_id):
     return _read(client.ReadSchema, base_id, table_id)
 
 
+def read_stats(base_id: str, table_id: str) -> Dict:
+    request = tree_messages.PathRequest()
+    request.path.extend([base_id, table_id])
+    return from_table_stats(client.ReadStats(request))
+
+
+def _query_request(base_id: str, table_id: str, where: Optional[Dict], columns: Optional[List[str]],
+                   limit: Optional[int], offset: int, order_by: Optional[List] = None):
+    request = tree_messages.QueryRowsRequest()
+    request.table_path.extend([base_id, table_id])
+    request.where.update(where or {})
+    request.columns.extend(columns or [])
+    request.limit = limit or 0
+    request.offset = offset
+    for key in order_by or []:
+        column_id, direction = (key, 1) if isinstance(key, str) else key
+        request.order_by.add(column_id=column_id, descending=direction == -1)
+    return request
+
+
+def query_rows(base_id: str, table_id: str, where: Optional[Dict] = None, columns: Optional[List[str]] = None,
+               limit: Optional[int] = None, offset: int = 0):
+    request = _query_request(base_id, table_id, where, columns, limit, offset)
+    return columns_to_rows(*from_typed_rows(client.QueryRows(request)))
+
+
+def query_sorted_rows(base_id: str, table_id: str, order_by: List, where: Optional[Dict] = None,
+                      columns: Optional[List[str]] = None, limit: Optional[int] = None, offset: int = 0,
+                      explain: bool = False):
+    """
+    The rows sorted by order_by, e.g. ``['co1', ('co2', -1)]``; with a limit only the top rows are sorted.
+    With explain, the rows and the executed plan.
+    """
+    request = _query_request(base_id, table_id, where, columns, limit, offset, order_by)
+    request.explain = explain
+    response = client.QueryRows(request)
+    rows = columns_to_rows(*from_typed_rows(response))
+    return (rows, MessageToDict(response.plan)) if explain else rows
+
+
+def aggregate(base_id: str, table_id: str, group_by: Optional[List[str]] = None,
+              aggregates: Optional[Dict] = None, where: Optional[Dict] = None, explain: bool = False):
+    request = tree_messages.AggregateRequest()
+    request.table_path.extend([base_id, table_id])
+    request.group_by.extend(group_by or [])
+    request.aggregates.update(aggregates or {})
+    request.where.update(where or {})
+    request.explain = explain
+    response = client.Aggregate(request)
+    columns = {column.column_id: from_typed_column(column) for column in response.columns}
+    groups = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    return (groups, MessageToDict(response.plan)) if explain else groups
+
+
 def update_row(base_id: str, table_id: str, row_id: int, sub_row: Dict):
     request = tree_messages.UpdateRowRequest()
     request.table_path.extend([base_id, table_id])
     request.row_id = row_id
-    request.sub_row.update(to_jsonable_row(sub_row))
+    to_values(request.sub_row, sub_row)
     response = client.UpdateRow(request)
     return response
 
@@ -130,11 +283,71 @@ def delete_column(base_id: str, table_id: str, column_id: str):
     return _delete(client.DeleteColumn, base_id, table_id, column_id)
 
 
-def intersect_tables(by_column_id: str, table1_path: List[str], table2_path: List[str], new_table_path: List[str]):
+def _index(f, base_id: str, table_id: str, column_id: str, kind: str = ''):
+    request = tree_messages.IndexRequest()
+    request.table_path.extend([base_id, table_id])
+    request.column_id = column_id
+    request.kind = kind
+    response = f(request)
+    return response
+
+
+def create_index(base_id: str, table_id: str, column_id: str, kind: str = 'hash'):
+    return _index(client.CreateIndex, base_id, table_id, column_id, kind)
+
+
+def delete_index(base_id: str, table_id: str, column_id: str):
+    return _index(client.DeleteIndex, base_id, table_id, column_id)
+
+
+def intersect_tables(by_column_id: Union[str, List[str]], table1_path: List[str], table2_path: List[str],
+                     new_table_path: List[str], algorithm: Optional[str] = None, explain: bool = False):
     request = tree_messages.IntersectTablesRequest()
-    request.by_column_id = by_column_id
+    request.explain = explain
+    if isinstance(by_column_id, str):
+        request.by_column_id = by_column_id
+    else:
+        request.by_column_ids.extend(by_column_id)
+    if algorithm:
+        request.algorithm = algorithm
     request.table1_path.extend(table1_path)
     request.table2_path.extend(table2_path)
     request.new_table_path.extend(new_table_path)
     response = client.IntersectTables(request)
     return response
+
+
+def _operation(op: str, args: Dict) -> tree_messages.Operation:
+    operation = tree_messages.Operation()
+    if op in ('create', 'delete'):
+        getattr(operation, op).path.extend(args['path'])
+        return operation
+
+    kind = 'create_typed_rows' if op == 'create_rows_from_columns' else op
+    request = getattr(operation, kind)
+    request.table_path.extend(args['table_path'])
+    if op == 'create_rows':
+        for row in args['rows']:
+            request.rows.add().update(to_jsonable_row(row))
+    elif op == 'create_rows_from_columns':
+        request.rows.CopyFrom(to_typed_rows([], args['columns']))
+    elif op == 'create_columns':
+        to_create_columns(request, args['columns'])
+    elif op in ('create_index', 'delete_index'):
+        request.column_id = args['column_id']
+        request.kind = args.get('kind', '')
+    elif op == 'update_row':
+        request.row_id = args['row_id']
+        to_values(request.sub_row, args['sub_row'])
+    else:
+        request.column_id = args['column_id']
+        request.sub_column.update(to_jsonable_column(args['sub_column']))
+    return operation
+
+
+def execute(operations: List[Dict]):
+    """Runs the operations in the form of Root.batch as one transaction."""
+    request = tree_messages.ExecuteRequest()
+    request.operations.extend(_operation(operation['op'], operation['args']) for operation in operations)
+    response = client.Execute(request)
+    return response
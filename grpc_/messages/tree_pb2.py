@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
 # source: tree.proto
+# Protobuf Python Version: 7.35.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'tree.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -14,632 +25,79 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='tree.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\ntree.proto\x1a\x1cgoogle/protobuf/struct.proto\"7\n\x0bPathRequest\x12(\n\x04path\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.ListValue\"\"\n\x0fSuccessResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"N\n\x11\x43reateRowsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12%\n\x04rows\x18\x02 \x03(\x0b\x32\x17.google.protobuf.Struct\"\xa8\x01\n\x14\x43reateColumnsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x33\n\x07\x63olumns\x18\x02 \x03(\x0b\x32\".CreateColumnsRequest.ColumnsEntry\x1aG\n\x0c\x43olumnsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct:\x02\x38\x01\"`\n\x10UpdateRowRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x0e\n\x06row_id\x18\x02 \x01(\x03\x12(\n\x07sub_row\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\"i\n\x13UpdateColumnRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x11\n\tcolumn_id\x18\x02 \x01(\t\x12+\n\nsub_column\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\"p\n\x16IntersectTablesRequest\x12\x14\n\x0c\x62y_column_id\x18\x01 \x01(\t\x12\x13\n\x0btable1_path\x18\x02 \x03(\t\x12\x13\n\x0btable2_path\x18\x03 \x03(\t\x12\x16\n\x0enew_table_path\x18\x04 \x03(\t2\xb7\x08\n\x04Tree\x12.\n\nCreateBase\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12/\n\x0b\x43reateTable\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12\x34\n\nCreateRows\x12\x12.CreateRowsRequest\x1a\x10.SuccessResponse\"\x00\x12:\n\rCreateColumns\x12\x15.CreateColumnsRequest\x1a\x10.SuccessResponse\"\x00\x12\x33\n\x08ReadTree\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x33\n\x08ReadBase\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x34\n\tReadTable\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x33\n\x08ReadRows\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x36\n\x0bReadColumns\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x35\n\x07ReadRow\x12\x0c.PathRequest\x1a\x1a.google.protobuf.ListValue\"\x00\x12\x38\n\nReadColumn\x12\x0c.PathRequest\x1a\x1a.google.protobuf.ListValue\"\x00\x12\x37\n\tReadValue\x12\x0c.PathRequest\x1a\x1a.google.protobuf.ListValue\"\x00\x12\x35\n\nReadSchema\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x32\n\tUpdateRow\x12\x11.UpdateRowRequest\x1a\x10.SuccessResponse\"\x00\x12\x38\n\x0cUpdateColumn\x12\x14.UpdateColumnRequest\x1a\x10.SuccessResponse\"\x00\x12.\n\nDeleteBase\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12/\n\x0b\x44\x65leteTable\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12-\n\tDeleteRow\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12\x30\n\x0c\x44\x65leteColumn\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12>\n\x0fIntersectTables\x12\x17.IntersectTablesRequest\x1a\x10.SuccessResponse\"\x00\x62\x06proto3'
-  ,
-  dependencies=[google_dot_protobuf_dot_struct__pb2.DESCRIPTOR,])
-
-
-
-
-_PATHREQUEST = _descriptor.Descriptor(
-  name='PathRequest',
-  full_name='PathRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='path', full_name='PathRequest.path', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=44,
-  serialized_end=99,
-)
-
-
-_SUCCESSRESPONSE = _descriptor.Descriptor(
-  name='SuccessResponse',
-  full_name='SuccessResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='success', full_name='SuccessResponse.success', index=0,
-      number=1, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=101,
-  serialized_end=135,
-)
-
-
-_CREATEROWSREQUEST = _descriptor.Descriptor(
-  name='CreateRowsRequest',
-  full_name='CreateRowsRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='table_path', full_name='CreateRowsRequest.table_path', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='rows', full_name='CreateRowsRequest.rows', index=1,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=137,
-  serialized_end=215,
-)
-
-
-_CREATECOLUMNSREQUEST_COLUMNSENTRY = _descriptor.Descriptor(
-  name='ColumnsEntry',
-  full_name='CreateColumnsRequest.ColumnsEntry',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='key', full_name='CreateColumnsRequest.ColumnsEntry.key', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='value', full_name='CreateColumnsRequest.ColumnsEntry.value', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=b'8\001',
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=315,
-  serialized_end=386,
-)
-
-_CREATECOLUMNSREQUEST = _descriptor.Descriptor(
-  name='CreateColumnsRequest',
-  full_name='CreateColumnsRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='table_path', full_name='CreateColumnsRequest.table_path', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='columns', full_name='CreateColumnsRequest.columns', index=1,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[_CREATECOLUMNSREQUEST_COLUMNSENTRY, ],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=218,
-  serialized_end=386,
-)
-
-
-_UPDATEROWREQUEST = _descriptor.Descriptor(
-  name='UpdateRowRequest',
-  full_name='UpdateRowRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='table_path', full_name='UpdateRowRequest.table_path', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='row_id', full_name='UpdateRowRequest.row_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='sub_row', full_name='UpdateRowRequest.sub_row', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=388,
-  serialized_end=484,
-)
-
-
-_UPDATECOLUMNREQUEST = _descriptor.Descriptor(
-  name='UpdateColumnRequest',
-  full_name='UpdateColumnRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='table_path', full_name='UpdateColumnRequest.table_path', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='column_id', full_name='UpdateColumnRequest.column_id', index=1,
-      number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='sub_column', full_name='UpdateColumnRequest.sub_column', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=486,
-  serialized_end=591,
-)
-
-
-_INTERSECTTABLESREQUEST = _descriptor.Descriptor(
-  name='IntersectTablesRequest',
-  full_name='IntersectTablesRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='by_column_id', full_name='IntersectTablesRequest.by_column_id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='table1_path', full_name='IntersectTablesRequest.table1_path', index=1,
-      number=2, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='table2_path', full_name='IntersectTablesRequest.table2_path', index=2,
-      number=3, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='new_table_path', full_name='IntersectTablesRequest.new_table_path', index=3,
-      number=4, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=593,
-  serialized_end=705,
-)
-
-_PATHREQUEST.fields_by_name['path'].message_type = google_dot_protobuf_dot_struct__pb2._LISTVALUE
-_CREATEROWSREQUEST.fields_by_name['rows'].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
-_CREATECOLUMNSREQUEST_COLUMNSENTRY.fields_by_name['value'].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
-_CREATECOLUMNSREQUEST_COLUMNSENTRY.containing_type = _CREATECOLUMNSREQUEST
-_CREATECOLUMNSREQUEST.fields_by_name['columns'].message_type = _CREATECOLUMNSREQUEST_COLUMNSENTRY
-_UPDATEROWREQUEST.fields_by_name['sub_row'].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
-_UPDATECOLUMNREQUEST.fields_by_name['sub_column'].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
-DESCRIPTOR.message_types_by_name['PathRequest'] = _PATHREQUEST
-DESCRIPTOR.message_types_by_name['SuccessResponse'] = _SUCCESSRESPONSE
-DESCRIPTOR.message_types_by_name['CreateRowsRequest'] = _CREATEROWSREQUEST
-DESCRIPTOR.message_types_by_name['CreateColumnsRequest'] = _CREATECOLUMNSREQUEST
-DESCRIPTOR.message_types_by_name['UpdateRowRequest'] = _UPDATEROWREQUEST
-DESCRIPTOR.message_types_by_name['UpdateColumnRequest'] = _UPDATECOLUMNREQUEST
-DESCRIPTOR.message_types_by_name['IntersectTablesRequest'] = _INTERSECTTABLESREQUEST
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-PathRequest = _reflection.GeneratedProtocolMessageType('PathRequest', (_message.Message,), {
-  'DESCRIPTOR' : _PATHREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:PathRequest)
-  })
-_sym_db.RegisterMessage(PathRequest)
-
-SuccessResponse = _reflection.GeneratedProtocolMessageType('SuccessResponse', (_message.Message,), {
-  'DESCRIPTOR' : _SUCCESSRESPONSE,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:SuccessResponse)
-  })
-_sym_db.RegisterMessage(SuccessResponse)
-
-CreateRowsRequest = _reflection.GeneratedProtocolMessageType('CreateRowsRequest', (_message.Message,), {
-  'DESCRIPTOR' : _CREATEROWSREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:CreateRowsRequest)
-  })
-_sym_db.RegisterMessage(CreateRowsRequest)
-
-CreateColumnsRequest = _reflection.GeneratedProtocolMessageType('CreateColumnsRequest', (_message.Message,), {
-
-  'ColumnsEntry' : _reflection.GeneratedProtocolMessageType('ColumnsEntry', (_message.Message,), {
-    'DESCRIPTOR' : _CREATECOLUMNSREQUEST_COLUMNSENTRY,
-    '__module__' : 'tree_pb2'
-    # @@protoc_insertion_point(class_scope:CreateColumnsRequest.ColumnsEntry)
-    })
-  ,
-  'DESCRIPTOR' : _CREATECOLUMNSREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:CreateColumnsRequest)
-  })
-_sym_db.RegisterMessage(CreateColumnsRequest)
-_sym_db.RegisterMessage(CreateColumnsRequest.ColumnsEntry)
-
-UpdateRowRequest = _reflection.GeneratedProtocolMessageType('UpdateRowRequest', (_message.Message,), {
-  'DESCRIPTOR' : _UPDATEROWREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:UpdateRowRequest)
-  })
-_sym_db.RegisterMessage(UpdateRowRequest)
-
-UpdateColumnRequest = _reflection.GeneratedProtocolMessageType('UpdateColumnRequest', (_message.Message,), {
-  'DESCRIPTOR' : _UPDATECOLUMNREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:UpdateColumnRequest)
-  })
-_sym_db.RegisterMessage(UpdateColumnRequest)
-
-IntersectTablesRequest = _reflection.GeneratedProtocolMessageType('IntersectTablesRequest', (_message.Message,), {
-  'DESCRIPTOR' : _INTERSECTTABLESREQUEST,
-  '__module__' : 'tree_pb2'
-  # @@protoc_insertion_point(class_scope:IntersectTablesRequest)
-  })
-_sym_db.RegisterMessage(IntersectTablesRequest)
-
-
-_CREATECOLUMNSREQUEST_COLUMNSENTRY._options = None
-
-_TREE = _descriptor.ServiceDescriptor(
-  name='Tree',
-  full_name='Tree',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=708,
-  serialized_end=1787,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='CreateBase',
-    full_name='Tree.CreateBase',
-    index=0,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='CreateTable',
-    full_name='Tree.CreateTable',
-    index=1,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='CreateRows',
-    full_name='Tree.CreateRows',
-    index=2,
-    containing_service=None,
-    input_type=_CREATEROWSREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='CreateColumns',
-    full_name='Tree.CreateColumns',
-    index=3,
-    containing_service=None,
-    input_type=_CREATECOLUMNSREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadTree',
-    full_name='Tree.ReadTree',
-    index=4,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadBase',
-    full_name='Tree.ReadBase',
-    index=5,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadTable',
-    full_name='Tree.ReadTable',
-    index=6,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadRows',
-    full_name='Tree.ReadRows',
-    index=7,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadColumns',
-    full_name='Tree.ReadColumns',
-    index=8,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadRow',
-    full_name='Tree.ReadRow',
-    index=9,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._LISTVALUE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadColumn',
-    full_name='Tree.ReadColumn',
-    index=10,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._LISTVALUE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadValue',
-    full_name='Tree.ReadValue',
-    index=11,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._LISTVALUE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ReadSchema',
-    full_name='Tree.ReadSchema',
-    index=12,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=google_dot_protobuf_dot_struct__pb2._STRUCT,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='UpdateRow',
-    full_name='Tree.UpdateRow',
-    index=13,
-    containing_service=None,
-    input_type=_UPDATEROWREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='UpdateColumn',
-    full_name='Tree.UpdateColumn',
-    index=14,
-    containing_service=None,
-    input_type=_UPDATECOLUMNREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='DeleteBase',
-    full_name='Tree.DeleteBase',
-    index=15,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='DeleteTable',
-    full_name='Tree.DeleteTable',
-    index=16,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='DeleteRow',
-    full_name='Tree.DeleteRow',
-    index=17,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='DeleteColumn',
-    full_name='Tree.DeleteColumn',
-    index=18,
-    containing_service=None,
-    input_type=_PATHREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='IntersectTables',
-    full_name='Tree.IntersectTables',
-    index=19,
-    containing_service=None,
-    input_type=_INTERSECTTABLESREQUEST,
-    output_type=_SUCCESSRESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_TREE)
-
-DESCRIPTOR.services_by_name['Tree'] = _TREE
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\ntree.proto\x1a\x1cgoogle/protobuf/struct.proto\"7\n\x0bPathRequest\x12(\n\x04path\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.ListValue\"\"\n\x0fSuccessResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"N\n\x11\x43reateRowsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12%\n\x04rows\x18\x02 \x03(\x0b\x32\x17.google.protobuf.Struct\"\xae\x01\n\x05Value\x12\x13\n\tint_value\x18\x01 \x01(\x03H\x00\x12\x15\n\x0b\x66loat_value\x18\x02 \x01(\x01H\x00\x12\x13\n\tstr_value\x18\x03 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x04 \x01(\x08H\x00\x12\x30\n\nnull_value\x18\x05 \x01(\x0e\x32\x1a.google.protobuf.NullValueH\x00\x12\x14\n\njson_value\x18\x06 \x01(\tH\x00\x42\x06\n\x04kind\"s\n\x0bTypedColumn\x12\x11\n\tcolumn_id\x18\x01 \x01(\t\x12\x0c\n\x04ints\x18\x02 \x03(\x03\x12\x0e\n\x06\x66loats\x18\x03 \x03(\x01\x12\x0c\n\x04strs\x18\x04 \x03(\t\x12\r\n\x05\x62ools\x18\x05 \x03(\x08\x12\x16\n\x06values\x18\x06 \x03(\x0b\x32\x06.Value\"b\n\tTypedRows\x12\x0f\n\x07row_ids\x18\x01 \x03(\x03\x12\x1d\n\x07\x63olumns\x18\x02 \x03(\x0b\x32\x0c.TypedColumn\x12%\n\x04plan\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\"F\n\x16\x43reateTypedRowsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x18\n\x04rows\x18\x02 \x01(\x0b\x32\n.TypedRows\"S\n\x0bImportChunk\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x12\n\nbatch_size\x18\x03 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\"e\n\x0cImportReport\x12\x0c\n\x04rows\x18\x01 \x01(\x03\x12\x0f\n\x07seconds\x18\x02 \x01(\x01\x12\x17\n\x0frows_per_second\x18\x03 \x01(\x01\x12\x0c\n\x04\x64one\x18\x04 \x01(\x08\x12\x0f\n\x07success\x18\x05 \x01(\x08\"\xda\x01\n\x14\x43reateColumnsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x33\n\x07\x63olumns\x18\x02 \x03(\x0b\x32\".CreateColumnsRequest.ColumnsEntry\x12\x1c\n\x06values\x18\x03 \x03(\x0b\x32\x0c.TypedColumn\x12\x12\n\ncolumn_ids\x18\x04 \x03(\t\x1aG\n\x0c\x43olumnsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct:\x02\x38\x01\"\x9d\x01\n\x10UpdateRowRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x0e\n\x06row_id\x18\x02 \x01(\x03\x12.\n\x07sub_row\x18\x03 \x03(\x0b\x32\x1d.UpdateRowRequest.SubRowEntry\x1a\x35\n\x0bSubRowEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x15\n\x05value\x18\x02 \x01(\x0b\x32\x06.Value:\x02\x38\x01\"i\n\x13UpdateColumnRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x11\n\tcolumn_id\x18\x02 \x01(\t\x12+\n\nsub_column\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\"L\n\x13ReadRowsPageRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\x11\n\tpage_size\x18\x03 \x01(\x03\"F\n\x08RowsPage\x12%\n\x04rows\x18\x01 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x13\n\x0bnext_cursor\x18\x02 \x01(\t\"J\n\rStreamRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x11\n\tcolumn_id\x18\x02 \x01(\t\x12\x12\n\nchunk_size\x18\x03 \x01(\x03\"G\n\rExportRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x12\n\nchunk_size\x18\x03 \x01(\x03\"\x1b\n\x0b\x45xportChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"8\n\x12IngestRowsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\trow_count\x18\x02 \x01(\x03\"0\n\x07SortKey\x12\x11\n\tcolumn_id\x18\x01 \x01(\t\x12\x12\n\ndescending\x18\x02 \x01(\x08\"\xab\x01\n\x10QueryRowsRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12&\n\x05where\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0f\n\x07\x63olumns\x18\x03 \x03(\t\x12\r\n\x05limit\x18\x04 \x01(\x03\x12\x0e\n\x06offset\x18\x05 \x01(\x03\x12\x1a\n\x08order_by\x18\x06 \x03(\x0b\x32\x08.SortKey\x12\x0f\n\x07\x65xplain\x18\x07 \x01(\x08\"\xa2\x01\n\x0b\x43olumnStats\x12\x11\n\tcolumn_id\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\x12\r\n\x05nulls\x18\x03 \x01(\x03\x12\x13\n\x03min\x18\x04 \x01(\x0b\x32\x06.Value\x12\x13\n\x03max\x18\x05 \x01(\x0b\x32\x06.Value\x12\x10\n\x08\x64istinct\x18\x06 \x01(\x03\x12\x16\n\x06\x62ounds\x18\x07 \x03(\x0b\x32\x06.Value\x12\x0e\n\x06\x64\x65pths\x18\x08 \x03(\x03\">\n\nTableStats\x12\x11\n\trow_count\x18\x01 \x01(\x03\x12\x1d\n\x07\x63olumns\x18\x02 \x03(\x0b\x32\x0c.ColumnStats\"\x9e\x01\n\x10\x41ggregateRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x10\n\x08group_by\x18\x02 \x03(\t\x12+\n\naggregates\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12&\n\x05where\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0f\n\x07\x65xplain\x18\x05 \x01(\x08\"Y\n\x11\x41ggregateResponse\x12\x1d\n\x07\x63olumns\x18\x01 \x03(\x0b\x32\x0c.TypedColumn\x12%\n\x04plan\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\"C\n\x0cIndexRequest\x12\x12\n\ntable_path\x18\x01 \x03(\t\x12\x11\n\tcolumn_id\x18\x02 \x01(\t\x12\x0c\n\x04kind\x18\x03 \x01(\t\"\x8b\x03\n\tOperation\x12\x1e\n\x06\x63reate\x18\x01 \x01(\x0b\x32\x0c.PathRequestH\x00\x12)\n\x0b\x63reate_rows\x18\x02 \x01(\x0b\x32\x12.CreateRowsRequestH\x00\x12\x34\n\x11\x63reate_typed_rows\x18\x03 \x01(\x0b\x32\x17.CreateTypedRowsRequestH\x00\x12/\n\x0e\x63reate_columns\x18\x04 \x01(\x0b\x32\x15.CreateColumnsRequestH\x00\x12%\n\x0c\x63reate_index\x18\x05 \x01(\x0b\x32\r.IndexRequestH\x00\x12\'\n\nupdate_row\x18\x06 \x01(\x0b\x32\x11.UpdateRowRequestH\x00\x12-\n\rupdate_column\x18\x07 \x01(\x0b\x32\x14.UpdateColumnRequestH\x00\x12\x1e\n\x06\x64\x65lete\x18\x08 \x01(\x0b\x32\x0c.PathRequestH\x00\x12%\n\x0c\x64\x65lete_index\x18\t \x01(\x0b\x32\r.IndexRequestH\x00\x42\x06\n\x04kind\"0\n\x0e\x45xecuteRequest\x12\x1e\n\noperations\x18\x01 \x03(\x0b\x32\n.Operation\"\xab\x01\n\x16IntersectTablesRequest\x12\x14\n\x0c\x62y_column_id\x18\x01 \x01(\t\x12\x13\n\x0btable1_path\x18\x02 \x03(\t\x12\x13\n\x0btable2_path\x18\x03 \x03(\t\x12\x16\n\x0enew_table_path\x18\x04 \x03(\t\x12\x15\n\rby_column_ids\x18\x05 \x03(\t\x12\x11\n\talgorithm\x18\x06 \x01(\t\x12\x0f\n\x07\x65xplain\x18\x07 \x01(\x08\"d\n\x17IntersectTablesResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\talgorithm\x18\x02 \x01(\t\x12%\n\x04plan\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct2\x9b\x0e\n\x04Tree\x12.\n\nCreateBase\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12/\n\x0b\x43reateTable\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12\x34\n\nCreateRows\x12\x12.CreateRowsRequest\x1a\x10.SuccessResponse\"\x00\x12:\n\rCreateColumns\x12\x15.CreateColumnsRequest\x1a\x10.SuccessResponse\"\x00\x12>\n\x0f\x43reateTypedRows\x12\x17.CreateTypedRowsRequest\x1a\x10.SuccessResponse\"\x00\x12>\n\nIngestRows\x12\x17.CreateTypedRowsRequest\x1a\x13.IngestRowsResponse\"\x00(\x01\x12/\n\nImportRows\x12\x0c.ImportChunk\x1a\r.ImportReport\"\x00(\x01\x30\x01\x12\x33\n\x08ReadTree\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x33\n\x08ReadBase\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x34\n\tReadTable\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12\x33\n\x08ReadRows\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12+\n\rReadTypedRows\x12\x0c.PathRequest\x1a\n.TypedRows\"\x00\x12\x31\n\x0cReadRowsPage\x12\x14.ReadRowsPageRequest\x1a\t.RowsPage\"\x00\x12)\n\x0bReadColumns\x12\x0c.PathRequest\x1a\n.TypedRows\"\x00\x12\x35\n\x07ReadRow\x12\x0c.PathRequest\x1a\x1a.google.protobuf.ListValue\"\x00\x12*\n\nReadColumn\x12\x0c.PathRequest\x1a\x0c.TypedColumn\"\x00\x12\x37\n\tReadValue\x12\x0c.PathRequest\x1a\x1a.google.protobuf.ListValue\"\x00\x12\x35\n\nReadSchema\x12\x0c.PathRequest\x1a\x17.google.protobuf.Struct\"\x00\x12(\n\tReadStats\x12\x0c.PathRequest\x1a\x0b.TableStats\"\x00\x12,\n\nStreamRows\x12\x0e.StreamRequest\x1a\n.TypedRows\"\x00\x30\x01\x12\x30\n\x0cStreamColumn\x12\x0e.StreamRequest\x1a\x0c.TypedColumn\"\x00\x30\x01\x12/\n\x0b\x45xportTable\x12\x0e.ExportRequest\x1a\x0c.ExportChunk\"\x00\x30\x01\x12,\n\tQueryRows\x12\x11.QueryRowsRequest\x1a\n.TypedRows\"\x00\x12\x31\n\x0eQueryTypedRows\x12\x11.QueryRowsRequest\x1a\n.TypedRows\"\x00\x12\x34\n\tAggregate\x12\x11.AggregateRequest\x1a\x12.AggregateResponse\"\x00\x12\x32\n\tUpdateRow\x12\x11.UpdateRowRequest\x1a\x10.SuccessResponse\"\x00\x12\x38\n\x0cUpdateColumn\x12\x14.UpdateColumnRequest\x1a\x10.SuccessResponse\"\x00\x12.\n\nDeleteBase\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12/\n\x0b\x44\x65leteTable\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12-\n\tDeleteRow\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12\x30\n\x0c\x44\x65leteColumn\x12\x0c.PathRequest\x1a\x10.SuccessResponse\"\x00\x12\x30\n\x0b\x43reateIndex\x12\r.IndexRequest\x1a\x10.SuccessResponse\"\x00\x12\x30\n\x0b\x44\x65leteIndex\x12\r.IndexRequest\x1a\x10.SuccessResponse\"\x00\x12\x46\n\x0fIntersectTables\x12\x17.IntersectTablesRequest\x1a\x18.IntersectTablesResponse\"\x00\x12.\n\x07\x45xecute\x12\x0f.ExecuteRequest\x1a\x10.SuccessResponse\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'tree_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CREATECOLUMNSREQUEST_COLUMNSENTRY']._loaded_options = None
+  _globals['_CREATECOLUMNSREQUEST_COLUMNSENTRY']._serialized_options = b'8\001'
+  _globals['_UPDATEROWREQUEST_SUBROWENTRY']._loaded_options = None
+  _globals['_UPDATEROWREQUEST_SUBROWENTRY']._serialized_options = b'8\001'
+  _globals['_PATHREQUEST']._serialized_start=44
+  _globals['_PATHREQUEST']._serialized_end=99
+  _globals['_SUCCESSRESPONSE']._serialized_start=101
+  _globals['_SUCCESSRESPONSE']._serialized_end=135
+  _globals['_CREATEROWSREQUEST']._serialized_start=137
+  _globals['_CREATEROWSREQUEST']._serialized_end=215
+  _globals['_VALUE']._serialized_start=218
+  _globals['_VALUE']._serialized_end=392
+  _globals['_TYPEDCOLUMN']._serialized_start=394
+  _globals['_TYPEDCOLUMN']._serialized_end=509
+  _globals['_TYPEDROWS']._serialized_start=511
+  _globals['_TYPEDROWS']._serialized_end=609
+  _globals['_CREATETYPEDROWSREQUEST']._serialized_start=611
+  _globals['_CREATETYPEDROWSREQUEST']._serialized_end=681
+  _globals['_IMPORTCHUNK']._serialized_start=683
+  _globals['_IMPORTCHUNK']._serialized_end=766
+  _globals['_IMPORTREPORT']._serialized_start=768
+  _globals['_IMPORTREPORT']._serialized_end=869
+  _globals['_CREATECOLUMNSREQUEST']._serialized_start=872
+  _globals['_CREATECOLUMNSREQUEST']._serialized_end=1090
+  _globals['_CREATECOLUMNSREQUEST_COLUMNSENTRY']._serialized_start=1019
+  _globals['_CREATECOLUMNSREQUEST_COLUMNSENTRY']._serialized_end=1090
+  _globals['_UPDATEROWREQUEST']._serialized_start=1093
+  _globals['_UPDATEROWREQUEST']._serialized_end=1250
+  _globals['_UPDATEROWREQUEST_SUBROWENTRY']._serialized_start=1197
+  _globals['_UPDATEROWREQUEST_SUBROWENTRY']._serialized_end=1250
+  _globals['_UPDATECOLUMNREQUEST']._serialized_start=1252
+  _globals['_UPDATECOLUMNREQUEST']._serialized_end=1357
+  _globals['_READROWSPAGEREQUEST']._serialized_start=1359
+  _globals['_READROWSPAGEREQUEST']._serialized_end=1435
+  _globals['_ROWSPAGE']._serialized_start=1437
+  _globals['_ROWSPAGE']._serialized_end=1507
+  _globals['_STREAMREQUEST']._serialized_start=1509
+  _globals['_STREAMREQUEST']._serialized_end=1583
+  _globals['_EXPORTREQUEST']._serialized_start=1585
+  _globals['_EXPORTREQUEST']._serialized_end=1656
+  _globals['_EXPORTCHUNK']._serialized_start=1658
+  _globals['_EXPORTCHUNK']._serialized_end=1685
+  _globals['_INGESTROWSRESPONSE']._serialized_start=1687
+  _globals['_INGESTROWSRESPONSE']._serialized_end=1743
+  _globals['_SORTKEY']._serialized_start=1745
+  _globals['_SORTKEY']._serialized_end=1793
+  _globals['_QUERYROWSREQUEST']._serialized_start=1796
+  _globals['_QUERYROWSREQUEST']._serialized_end=1967
+  _globals['_COLUMNSTATS']._serialized_start=1970
+  _globals['_COLUMNSTATS']._serialized_end=2132
+  _globals['_TABLESTATS']._serialized_start=2134
+  _globals['_TABLESTATS']._serialized_end=2196
+  _globals['_AGGREGATEREQUEST']._serialized_start=2199
+  _globals['_AGGREGATEREQUEST']._serialized_end=2357
+  _globals['_AGGREGATERESPONSE']._serialized_start=2359
+  _globals['_AGGREGATERESPONSE']._serialized_end=2448
+  _globals['_INDEXREQUEST']._serialized_start=2450
+  _globals['_INDEXREQUEST']._serialized_end=2517
+  _globals['_OPERATION']._serialized_start=2520
+  _globals['_OPERATION']._serialized_end=2915
+  _globals['_EXECUTEREQUEST']._serialized_start=2917
+  _globals['_EXECUTEREQUEST']._serialized_end=2965
+  _globals['_INTERSECTTABLESREQUEST']._serialized_start=2968
+  _globals['_INTERSECTTABLESREQUEST']._serialized_end=3139
+  _globals['_INTERSECTTABLESRESPONSE']._serialized_start=3141
+  _globals['_INTERSECTTABLESRESPONSE']._serialized_end=3241
+  _globals['_TREE']._serialized_start=3244
+  _globals['_TREE']._serialized_end=5063
 # @@protoc_insertion_point(module_scope)
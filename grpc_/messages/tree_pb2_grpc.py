@@ -1,12 +1,32 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
+import warnings
 
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 import tree_pb2 as tree__pb2
 
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
 
-class TreeStub(object):
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in tree_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class TreeStub:
     """Missing associated documentation comment in .proto file."""
 
     def __init__(self, channel):
@@ -19,105 +39,180 @@ class TreeStub(object):
                 '/Tree/CreateBase',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.CreateTable = channel.unary_unary(
                 '/Tree/CreateTable',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.CreateRows = channel.unary_unary(
                 '/Tree/CreateRows',
                 request_serializer=tree__pb2.CreateRowsRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.CreateColumns = channel.unary_unary(
                 '/Tree/CreateColumns',
                 request_serializer=tree__pb2.CreateColumnsRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
+        self.CreateTypedRows = channel.unary_unary(
+                '/Tree/CreateTypedRows',
+                request_serializer=tree__pb2.CreateTypedRowsRequest.SerializeToString,
+                response_deserializer=tree__pb2.SuccessResponse.FromString,
+                _registered_method=True)
+        self.IngestRows = channel.stream_unary(
+                '/Tree/IngestRows',
+                request_serializer=tree__pb2.CreateTypedRowsRequest.SerializeToString,
+                response_deserializer=tree__pb2.IngestRowsResponse.FromString,
+                _registered_method=True)
+        self.ImportRows = channel.stream_stream(
+                '/Tree/ImportRows',
+                request_serializer=tree__pb2.ImportChunk.SerializeToString,
+                response_deserializer=tree__pb2.ImportReport.FromString,
+                _registered_method=True)
         self.ReadTree = channel.unary_unary(
                 '/Tree/ReadTree',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                _registered_method=True)
         self.ReadBase = channel.unary_unary(
                 '/Tree/ReadBase',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                _registered_method=True)
         self.ReadTable = channel.unary_unary(
                 '/Tree/ReadTable',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                _registered_method=True)
         self.ReadRows = channel.unary_unary(
                 '/Tree/ReadRows',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                _registered_method=True)
+        self.ReadTypedRows = channel.unary_unary(
+                '/Tree/ReadTypedRows',
+                request_serializer=tree__pb2.PathRequest.SerializeToString,
+                response_deserializer=tree__pb2.TypedRows.FromString,
+                _registered_method=True)
+        self.ReadRowsPage = channel.unary_unary(
+                '/Tree/ReadRowsPage',
+                request_serializer=tree__pb2.ReadRowsPageRequest.SerializeToString,
+                response_deserializer=tree__pb2.RowsPage.FromString,
+                _registered_method=True)
         self.ReadColumns = channel.unary_unary(
                 '/Tree/ReadColumns',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
-                response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                response_deserializer=tree__pb2.TypedRows.FromString,
+                _registered_method=True)
         self.ReadRow = channel.unary_unary(
                 '/Tree/ReadRow',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-                )
+                _registered_method=True)
         self.ReadColumn = channel.unary_unary(
                 '/Tree/ReadColumn',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
-                response_deserializer=google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-                )
+                response_deserializer=tree__pb2.TypedColumn.FromString,
+                _registered_method=True)
         self.ReadValue = channel.unary_unary(
                 '/Tree/ReadValue',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-                )
+                _registered_method=True)
         self.ReadSchema = channel.unary_unary(
                 '/Tree/ReadSchema',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-                )
+                _registered_method=True)
+        self.ReadStats = channel.unary_unary(
+                '/Tree/ReadStats',
+                request_serializer=tree__pb2.PathRequest.SerializeToString,
+                response_deserializer=tree__pb2.TableStats.FromString,
+                _registered_method=True)
+        self.StreamRows = channel.unary_stream(
+                '/Tree/StreamRows',
+                request_serializer=tree__pb2.StreamRequest.SerializeToString,
+                response_deserializer=tree__pb2.TypedRows.FromString,
+                _registered_method=True)
+        self.StreamColumn = channel.unary_stream(
+                '/Tree/StreamColumn',
+                request_serializer=tree__pb2.StreamRequest.SerializeToString,
+                response_deserializer=tree__pb2.TypedColumn.FromString,
+                _registered_method=True)
+        self.ExportTable = channel.unary_stream(
+                '/Tree/ExportTable',
+                request_serializer=tree__pb2.ExportRequest.SerializeToString,
+                response_deserializer=tree__pb2.ExportChunk.FromString,
+                _registered_method=True)
+        self.QueryRows = channel.unary_unary(
+                '/Tree/QueryRows',
+                request_serializer=tree__pb2.QueryRowsRequest.SerializeToString,
+                response_deserializer=tree__pb2.TypedRows.FromString,
+                _registered_method=True)
+        self.QueryTypedRows = channel.unary_unary(
+                '/Tree/QueryTypedRows',
+                request_serializer=tree__pb2.QueryRowsRequest.SerializeToString,
+                response_deserializer=tree__pb2.TypedRows.FromString,
+                _registered_method=True)
+        self.Aggregate = channel.unary_unary(
+                '/Tree/Aggregate',
+                request_serializer=tree__pb2.AggregateRequest.SerializeToString,
+                response_deserializer=tree__pb2.AggregateResponse.FromString,
+                _registered_method=True)
         self.UpdateRow = channel.unary_unary(
                 '/Tree/UpdateRow',
                 request_serializer=tree__pb2.UpdateRowRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.UpdateColumn = channel.unary_unary(
                 '/Tree/UpdateColumn',
                 request_serializer=tree__pb2.UpdateColumnRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.DeleteBase = channel.unary_unary(
                 '/Tree/DeleteBase',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.DeleteTable = channel.unary_unary(
                 '/Tree/DeleteTable',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.DeleteRow = channel.unary_unary(
                 '/Tree/DeleteRow',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
         self.DeleteColumn = channel.unary_unary(
                 '/Tree/DeleteColumn',
                 request_serializer=tree__pb2.PathRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
+        self.CreateIndex = channel.unary_unary(
+                '/Tree/CreateIndex',
+                request_serializer=tree__pb2.IndexRequest.SerializeToString,
+                response_deserializer=tree__pb2.SuccessResponse.FromString,
+                _registered_method=True)
+        self.DeleteIndex = channel.unary_unary(
+                '/Tree/DeleteIndex',
+                request_serializer=tree__pb2.IndexRequest.SerializeToString,
+                response_deserializer=tree__pb2.SuccessResponse.FromString,
+                _registered_method=True)
         self.IntersectTables = channel.unary_unary(
                 '/Tree/IntersectTables',
                 request_serializer=tree__pb2.IntersectTablesRequest.SerializeToString,
+                response_deserializer=tree__pb2.IntersectTablesResponse.FromString,
+                _registered_method=True)
+        self.Execute = channel.unary_unary(
+                '/Tree/Execute',
+                request_serializer=tree__pb2.ExecuteRequest.SerializeToString,
                 response_deserializer=tree__pb2.SuccessResponse.FromString,
-                )
+                _registered_method=True)
 
 
-class TreeServicer(object):
+class TreeServicer:
     """Missing associated documentation comment in .proto file."""
 
     def CreateBase(self, request, context):
@@ -145,6 +240,24 @@ class TreeServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CreateTypedRows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def IngestRows(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportRows(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ReadTree(self, request, context):
         """Read
         """
@@ -170,6 +283,18 @@ class TreeServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReadTypedRows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReadRowsPage(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ReadColumns(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -200,6 +325,49 @@ class TreeServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReadStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamRows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamColumn(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExportTable(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryRows(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryTypedRows(self, request, context):
+        """The same as QueryRows, from when that returned a Struct
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Aggregate(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def UpdateRow(self, request, context):
         """Update
         """
@@ -238,12 +406,32 @@ class TreeServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CreateIndex(self, request, context):
+        """Indexes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeleteIndex(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def IntersectTables(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Execute(self, request, context):
+        """Transactions
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TreeServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -267,6 +455,21 @@ def add_TreeServicer_to_server(servicer, server):
                     request_deserializer=tree__pb2.CreateColumnsRequest.FromString,
                     response_serializer=tree__pb2.SuccessResponse.SerializeToString,
             ),
+            'CreateTypedRows': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateTypedRows,
+                    request_deserializer=tree__pb2.CreateTypedRowsRequest.FromString,
+                    response_serializer=tree__pb2.SuccessResponse.SerializeToString,
+            ),
+            'IngestRows': grpc.stream_unary_rpc_method_handler(
+                    servicer.IngestRows,
+                    request_deserializer=tree__pb2.CreateTypedRowsRequest.FromString,
+                    response_serializer=tree__pb2.IngestRowsResponse.SerializeToString,
+            ),
+            'ImportRows': grpc.stream_stream_rpc_method_handler(
+                    servicer.ImportRows,
+                    request_deserializer=tree__pb2.ImportChunk.FromString,
+                    response_serializer=tree__pb2.ImportReport.SerializeToString,
+            ),
             'ReadTree': grpc.unary_unary_rpc_method_handler(
                     servicer.ReadTree,
                     request_deserializer=tree__pb2.PathRequest.FromString,
@@ -287,10 +490,20 @@ def add_TreeServicer_to_server(servicer, server):
                     request_deserializer=tree__pb2.PathRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
             ),
+            'ReadTypedRows': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadTypedRows,
+                    request_deserializer=tree__pb2.PathRequest.FromString,
+                    response_serializer=tree__pb2.TypedRows.SerializeToString,
+            ),
+            'ReadRowsPage': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadRowsPage,
+                    request_deserializer=tree__pb2.ReadRowsPageRequest.FromString,
+                    response_serializer=tree__pb2.RowsPage.SerializeToString,
+            ),
             'ReadColumns': grpc.unary_unary_rpc_method_handler(
                     servicer.ReadColumns,
                     request_deserializer=tree__pb2.PathRequest.FromString,
-                    response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
+                    response_serializer=tree__pb2.TypedRows.SerializeToString,
             ),
             'ReadRow': grpc.unary_unary_rpc_method_handler(
                     servicer.ReadRow,
@@ -300,7 +513,7 @@ def add_TreeServicer_to_server(servicer, server):
             'ReadColumn': grpc.unary_unary_rpc_method_handler(
                     servicer.ReadColumn,
                     request_deserializer=tree__pb2.PathRequest.FromString,
-                    response_serializer=google_dot_protobuf_dot_struct__pb2.ListValue.SerializeToString,
+                    response_serializer=tree__pb2.TypedColumn.SerializeToString,
             ),
             'ReadValue': grpc.unary_unary_rpc_method_handler(
                     servicer.ReadValue,
@@ -312,6 +525,41 @@ def add_TreeServicer_to_server(servicer, server):
                     request_deserializer=tree__pb2.PathRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_struct__pb2.Struct.SerializeToString,
             ),
+            'ReadStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadStats,
+                    request_deserializer=tree__pb2.PathRequest.FromString,
+                    response_serializer=tree__pb2.TableStats.SerializeToString,
+            ),
+            'StreamRows': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamRows,
+                    request_deserializer=tree__pb2.StreamRequest.FromString,
+                    response_serializer=tree__pb2.TypedRows.SerializeToString,
+            ),
+            'StreamColumn': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamColumn,
+                    request_deserializer=tree__pb2.StreamRequest.FromString,
+                    response_serializer=tree__pb2.TypedColumn.SerializeToString,
+            ),
+            'ExportTable': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExportTable,
+                    request_deserializer=tree__pb2.ExportRequest.FromString,
+                    response_serializer=tree__pb2.ExportChunk.SerializeToString,
+            ),
+            'QueryRows': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueryRows,
+                    request_deserializer=tree__pb2.QueryRowsRequest.FromString,
+                    response_serializer=tree__pb2.TypedRows.SerializeToString,
+            ),
+            'QueryTypedRows': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueryTypedRows,
+                    request_deserializer=tree__pb2.QueryRowsRequest.FromString,
+                    response_serializer=tree__pb2.TypedRows.SerializeToString,
+            ),
+            'Aggregate': grpc.unary_unary_rpc_method_handler(
+                    servicer.Aggregate,
+                    request_deserializer=tree__pb2.AggregateRequest.FromString,
+                    response_serializer=tree__pb2.AggregateResponse.SerializeToString,
+            ),
             'UpdateRow': grpc.unary_unary_rpc_method_handler(
                     servicer.UpdateRow,
                     request_deserializer=tree__pb2.UpdateRowRequest.FromString,
@@ -342,19 +590,35 @@ def add_TreeServicer_to_server(servicer, server):
                     request_deserializer=tree__pb2.PathRequest.FromString,
                     response_serializer=tree__pb2.SuccessResponse.SerializeToString,
             ),
+            'CreateIndex': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateIndex,
+                    request_deserializer=tree__pb2.IndexRequest.FromString,
+                    response_serializer=tree__pb2.SuccessResponse.SerializeToString,
+            ),
+            'DeleteIndex': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeleteIndex,
+                    request_deserializer=tree__pb2.IndexRequest.FromString,
+                    response_serializer=tree__pb2.SuccessResponse.SerializeToString,
+            ),
             'IntersectTables': grpc.unary_unary_rpc_method_handler(
                     servicer.IntersectTables,
                     request_deserializer=tree__pb2.IntersectTablesRequest.FromString,
+                    response_serializer=tree__pb2.IntersectTablesResponse.SerializeToString,
+            ),
+            'Execute': grpc.unary_unary_rpc_method_handler(
+                    servicer.Execute,
+                    request_deserializer=tree__pb2.ExecuteRequest.FromString,
                     response_serializer=tree__pb2.SuccessResponse.SerializeToString,
             ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'Tree', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('Tree', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
-class Tree(object):
+class Tree:
     """Missing associated documentation comment in .proto file."""
 
     @staticmethod
@@ -368,11 +632,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/CreateBase',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateBase',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def CreateTable(request,
@@ -385,11 +659,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/CreateTable',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateTable',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def CreateRows(request,
@@ -402,11 +686,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/CreateRows',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateRows',
             tree__pb2.CreateRowsRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def CreateColumns(request,
@@ -419,11 +713,102 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/CreateColumns',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateColumns',
             tree__pb2.CreateColumnsRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateTypedRows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateTypedRows',
+            tree__pb2.CreateTypedRowsRequest.SerializeToString,
+            tree__pb2.SuccessResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def IngestRows(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/Tree/IngestRows',
+            tree__pb2.CreateTypedRowsRequest.SerializeToString,
+            tree__pb2.IngestRowsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportRows(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/Tree/ImportRows',
+            tree__pb2.ImportChunk.SerializeToString,
+            tree__pb2.ImportReport.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadTree(request,
@@ -436,11 +821,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadTree',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadTree',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadBase(request,
@@ -453,11 +848,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadBase',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadBase',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadTable(request,
@@ -470,11 +875,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadTable',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadTable',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadRows(request,
@@ -487,11 +902,75 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadRows',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadRows',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadTypedRows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadTypedRows',
+            tree__pb2.PathRequest.SerializeToString,
+            tree__pb2.TypedRows.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadRowsPage(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadRowsPage',
+            tree__pb2.ReadRowsPageRequest.SerializeToString,
+            tree__pb2.RowsPage.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadColumns(request,
@@ -504,11 +983,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadColumns',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadColumns',
             tree__pb2.PathRequest.SerializeToString,
-            google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            tree__pb2.TypedRows.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadRow(request,
@@ -521,11 +1010,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadRow',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadRow',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadColumn(request,
@@ -538,11 +1037,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadColumn',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadColumn',
             tree__pb2.PathRequest.SerializeToString,
-            google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            tree__pb2.TypedColumn.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadValue(request,
@@ -555,11 +1064,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadValue',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadValue',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.ListValue.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def ReadSchema(request,
@@ -572,11 +1091,210 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/ReadSchema',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadSchema',
             tree__pb2.PathRequest.SerializeToString,
             google_dot_protobuf_dot_struct__pb2.Struct.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/ReadStats',
+            tree__pb2.PathRequest.SerializeToString,
+            tree__pb2.TableStats.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamRows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/Tree/StreamRows',
+            tree__pb2.StreamRequest.SerializeToString,
+            tree__pb2.TypedRows.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamColumn(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/Tree/StreamColumn',
+            tree__pb2.StreamRequest.SerializeToString,
+            tree__pb2.TypedColumn.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExportTable(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/Tree/ExportTable',
+            tree__pb2.ExportRequest.SerializeToString,
+            tree__pb2.ExportChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryRows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/QueryRows',
+            tree__pb2.QueryRowsRequest.SerializeToString,
+            tree__pb2.TypedRows.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryTypedRows(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/QueryTypedRows',
+            tree__pb2.QueryRowsRequest.SerializeToString,
+            tree__pb2.TypedRows.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Aggregate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/Aggregate',
+            tree__pb2.AggregateRequest.SerializeToString,
+            tree__pb2.AggregateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def UpdateRow(request,
@@ -589,11 +1307,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/UpdateRow',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/UpdateRow',
             tree__pb2.UpdateRowRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def UpdateColumn(request,
@@ -606,11 +1334,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/UpdateColumn',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/UpdateColumn',
             tree__pb2.UpdateColumnRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def DeleteBase(request,
@@ -623,11 +1361,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/DeleteBase',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/DeleteBase',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def DeleteTable(request,
@@ -640,11 +1388,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/DeleteTable',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/DeleteTable',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def DeleteRow(request,
@@ -657,11 +1415,21 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/DeleteRow',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/DeleteRow',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def DeleteColumn(request,
@@ -674,11 +1442,75 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/DeleteColumn',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/DeleteColumn',
             tree__pb2.PathRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateIndex(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/CreateIndex',
+            tree__pb2.IndexRequest.SerializeToString,
+            tree__pb2.SuccessResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DeleteIndex(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/DeleteIndex',
+            tree__pb2.IndexRequest.SerializeToString,
+            tree__pb2.SuccessResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def IntersectTables(request,
@@ -691,8 +1523,45 @@ class Tree(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/Tree/IntersectTables',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/IntersectTables',
             tree__pb2.IntersectTablesRequest.SerializeToString,
+            tree__pb2.IntersectTablesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Execute(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Tree/Execute',
+            tree__pb2.ExecuteRequest.SerializeToString,
             tree__pb2.SuccessResponse.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
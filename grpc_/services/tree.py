@@ -1,3 +1,5 @@
+import json
+from itertools import chain
 from pydoc import locate
 from types import ModuleType
 
@@ -31,7 +33,8 @@ def to_jsonable_rows(rows):
 
 
 def from_jsonable_rows(rows):
-    return {int(row_id): from_type_pairs(pairs) for row_id, pairs in rows.items()}
+    # a Struct does not keep the order of its fields, and rows are in the order of their ids
+    return {row_id: from_type_pairs(rows[str(row_id)]) for row_id in sorted(map(int, rows))}
 
 
 def to_jsonable_base(base):
@@ -66,12 +69,116 @@ def from_jsonable_column(column):
     return {int(row_id): from_type_pair(pair) for row_id, pair in column.items()}
 
 
-def to_jsonable_columns(columns):
-    return {column_id: to_type_pairs(values) for column_id, values in columns.items()}
+TYPED_FIELDS = {bool: 'bools', int: 'ints', float: 'floats', str: 'strs'}
+VALUE_FIELDS = {bool: 'bool_value', int: 'int_value', float: 'float_value', str: 'str_value'}
 
 
-def from_jsonable_columns(columns):
-    return {column_id: from_type_pairs(pairs) for column_id, pairs in columns.items()}
+def to_value(value):
+    message = tree_messages.Value()
+    if value is None:
+        message.null_value = 0
+    elif type(value) in VALUE_FIELDS:
+        setattr(message, VALUE_FIELDS[type(value)], value)
+    else:
+        message.json_value = json.dumps(value)
+    return message
+
+
+def from_value(message):
+    kind = message.WhichOneof('kind')
+    if kind == 'json_value':
+        return json.loads(message.json_value)
+    return None if kind == 'null_value' else getattr(message, kind)
+
+
+def to_values(values_field, row):
+    """Fills a map<string, Value> field with the row's values."""
+    for column_id, value in row.items():
+        values_field[column_id].CopyFrom(to_value(value))
+
+
+def from_values(values_field):
+    return {column_id: from_value(value) for column_id, value in values_field.items()}
+
+
+def to_typed_column(column_id, values, type_=None):
+    """Packs a column into the repeated field of its type, falling back to Value per element for mixed columns."""
+    message = tree_messages.TypedColumn()
+    message.column_id = column_id
+    if type_ not in TYPED_FIELDS:
+        types = set(map(type, values))
+        type_ = types.pop() if len(types) == 1 else None
+    if type_ in TYPED_FIELDS:
+        getattr(message, TYPED_FIELDS[type_]).extend(values)
+    else:
+        message.values.extend(map(to_value, values))
+    return message
+
+
+def from_typed_column(message):
+    for field in ('ints', 'floats', 'strs', 'bools'):
+        values = getattr(message, field)
+        if values:
+            return list(values)
+    return list(map(from_value, message.values))
+
+
+def to_table_stats(statistics):
+    message = tree_messages.TableStats()
+    message.row_count = statistics['row_count']
+    for column_id, column_stats in statistics['columns'].items():
+        message.columns.add(column_id=column_id, count=column_stats['count'], nulls=column_stats['nulls'],
+                            min=to_value(column_stats['min']), max=to_value(column_stats['max']),
+                            distinct=column_stats['distinct'],
+                            bounds=map(to_value, column_stats['histogram']['bounds']),
+                            depths=column_stats['histogram']['depths'])
+    return message
+
+
+def from_table_stats(message):
+    return {'row_count': message.row_count, 'columns': {
+        column.column_id: {'count': column.count, 'nulls': column.nulls,
+                           'min': from_value(column.min), 'max': from_value(column.max), 'distinct': column.distinct,
+                           'histogram': {'bounds': list(map(from_value, column.bounds)), 'depths': list(column.depths)}}
+        for column in message.columns
+    }}
+
+
+def to_typed_rows(row_ids, columns, types=None):
+    message = tree_messages.TypedRows()
+    message.row_ids.extend(row_ids)
+    message.columns.extend(to_typed_column(column_id, values, (types or {}).get(column_id))
+                           for column_id, values in columns.items())
+    return message
+
+
+def from_typed_rows(message):
+    return list(message.row_ids), {column.column_id: from_typed_column(column) for column in message.columns}
+
+
+def rows_to_columns(rows, column_ids):
+    return {column_id: [row[idx] for row in rows.values()] for idx, column_id in enumerate(column_ids)}
+
+
+def columns_to_rows(row_ids, columns):
+    return dict(zip(row_ids, map(list, zip(*columns.values())) if columns else [[] for _ in row_ids]))
+
+
+def to_create_columns(request, columns):
+    """Fills a CreateColumnsRequest: the column definitions as Structs, their values as typed columns."""
+    request.column_ids.extend(columns)
+    for column_id, column in columns.items():
+        request.columns[column_id].update({key: value for key, value in column.items() if key != 'values'})
+        if 'values' in column:
+            request.values.append(to_typed_column(column_id, column['values']))
+
+
+def from_create_columns(request):
+    columns = {column_id: MessageToDict(request.columns[column_id])
+               for column_id in request.column_ids or request.columns}
+    for column in request.values:
+        columns[column.column_id]['values'] = from_typed_column(column)
+    return columns
 
 
 class TreeServicer(tree_service.TreeServicer):
@@ -98,18 +205,43 @@ class TreeServicer(tree_service.TreeServicer):
         resp.success = self.tree.create_rows(table_path, rows)
         return resp
 
+    def CreateTypedRows(self, request, context):
+        resp = tree_messages.SuccessResponse()
+        _, columns = from_typed_rows(request.rows)
+        resp.success = self.tree.create_rows_from_columns(list(request.table_path), columns)
+        return resp
+
+    def IngestRows(self, request_iterator, context):
+        resp = tree_messages.IngestRowsResponse()
+        resp.success = True
+        for request in request_iterator:
+            _, columns = from_typed_rows(request.rows)
+            if not self.tree.create_rows_from_columns(list(request.table_path), columns):
+                resp.success = False
+                break
+            resp.row_count += len(next(iter(columns.values()), []))
+        return resp
+
+    def ImportRows(self, request_iterator, context):
+        first = next(request_iterator, None)
+        if first is None:
+            # not even the table was named
+            yield tree_messages.ImportReport(done=True, success=False)
+            return
+        data = chain([first.data], (request.data for request in request_iterator))
+        for report in self.tree.import_rows(list(first.table_path), data, first.format or 'csv',
+                                            first.batch_size or None):
+            yield tree_messages.ImportReport(**report)
+
     def CreateColumns(self, request, context):
         resp = tree_messages.SuccessResponse()
-        columns = MessageToDict(request)['columns']
-        for column in columns.values():
-            if 'values' in column:
-                column['values'] = from_type_pairs(column['values'])
-        resp.success = self.tree.create_columns(list(request.table_path), columns)
+        resp.success = self.tree.create_columns(list(request.table_path), from_create_columns(request))
         return resp
 
     def _create_jsonable_struct(self, request, converter):
         resp = Struct()
-        resp.update(converter(self.tree.read(list(request.path))))
+        with self.tree.snapshot(list(request.path)) as node:
+            resp.update(converter(node))
         return resp
 
     def ReadTree(self, request, context):
@@ -121,11 +253,23 @@ class TreeServicer(tree_service.TreeServicer):
     def ReadRows(self, request, context):
         return self._create_jsonable_struct(request, to_jsonable_rows)
 
-    def ReadColumns(self, request, context):
-        resp = Struct()
-        resp.update(to_jsonable_columns(self.tree.read_columns(list(request.path))))
+    def ReadTypedRows(self, request, context):
+        with self.tree.snapshot(list(request.path)) as snapshot:
+            return to_typed_rows(snapshot.keys(), {column_id: snapshot.column(column_id)
+                                                   for column_id in snapshot.column_ids}, snapshot.column_types)
+
+    def ReadRowsPage(self, request, context):
+        resp = tree_messages.RowsPage()
+        rows, next_cursor = self.tree.read_rows_page(list(request.table_path), request.cursor or None,
+                                                     request.page_size or None)
+        resp.rows.update(to_jsonable_rows(rows))
+        if next_cursor is not None:
+            resp.next_cursor = next_cursor
         return resp
 
+    def ReadColumns(self, request, context):
+        return to_typed_rows([], self.tree.read_columns(list(request.path)))
+
     def ReadRow(self, request, context):
         row_path = list(request.path)
         row_path[self.ROW_DEPTH] = int(row_path[self.ROW_DEPTH])
@@ -137,10 +281,7 @@ class TreeServicer(tree_service.TreeServicer):
     def ReadColumn(self, request, context):
         column_path = list(request.path)
         table_path, column_id = column_path[:-1], column_path[-1]
-
-        resp = ListValue()
-        resp.extend(to_type_pairs(self.tree.read_column(table_path, column_id)))
-        return resp
+        return to_typed_column(column_id, self.tree.read_column(table_path, column_id))
 
     def ReadValue(self, request, context):
         value_path = list(request.path)
@@ -152,12 +293,59 @@ class TreeServicer(tree_service.TreeServicer):
 
     def ReadSchema(self, request, context):
         resp = Struct()
-        resp.update(self.tree.read_schema(table_path=list(request.path)))
+        table_path = list(request.path)
+        with self.tree.reading(table_path):
+            resp.update(self.tree.read_schema(table_path=table_path))
+        return resp
+
+    def _query(self, request):
+        order_by = [(key.column_id, -1 if key.descending else 1) for key in request.order_by]
+        return self.tree.query(list(request.table_path), MessageToDict(request.where), list(request.columns),
+                               request.limit or None, request.offset, order_by, explain=True)
+
+    def ReadStats(self, request, context):
+        return to_table_stats(self.tree.read_stats(list(request.path)))
+
+    def QueryRows(self, request, context):
+        rows, plan = self._query(request)
+        column_ids = list(request.columns) or self.tree.read_column_ids(list(request.table_path))
+        resp = to_typed_rows(rows.keys(), rows_to_columns(rows, column_ids))
+        if request.explain:
+            resp.plan.update(plan)
         return resp
 
+    def QueryTypedRows(self, request, context):
+        return self.QueryRows(request, context)
+
+    def Aggregate(self, request, context):
+        resp = tree_messages.AggregateResponse()
+        groups, plan = self.tree.aggregate(list(request.table_path), list(request.group_by),
+                                           MessageToDict(request.aggregates) or None, MessageToDict(request.where),
+                                           explain=True)
+        if request.explain:
+            resp.plan.update(plan)
+        column_ids = list(groups[0]) if groups else []
+        resp.columns.extend(to_typed_column(column_id, [group[column_id] for group in groups])
+                            for column_id in column_ids)
+        return resp
+
+    def StreamRows(self, request, context):
+        table_path = list(request.table_path)
+        column_ids = self.tree.read_column_ids(table_path)
+        for rows in self.tree.iter_rows(table_path, request.chunk_size or None):
+            yield to_typed_rows(rows.keys(), rows_to_columns(rows, column_ids))
+
+    def StreamColumn(self, request, context):
+        for values in self.tree.iter_column(list(request.table_path), request.column_id, request.chunk_size or None):
+            yield to_typed_column(request.column_id, values)
+
+    def ExportTable(self, request, context):
+        for data in self.tree.export(list(request.table_path), request.format or 'csv', request.chunk_size or None):
+            yield tree_messages.ExportChunk(data=data)
+
     def UpdateRow(self, request, context):
         resp = tree_messages.SuccessResponse()
-        sub_row = from_jsonable_row(MessageToDict(request.sub_row))
+        sub_row = from_values(request.sub_row)
         resp.success = self.tree.update_row(list(request.table_path), request.row_id, sub_row)
         return resp
 
@@ -187,8 +375,58 @@ class TreeServicer(tree_service.TreeServicer):
     def DeleteColumn(self, request, context):
         return self.delete(request.path)
 
+    def CreateIndex(self, request, context):
+        resp = tree_messages.SuccessResponse()
+        resp.success = self.tree.create_index(list(request.table_path), request.column_id, request.kind or 'hash')
+        return resp
+
+    def DeleteIndex(self, request, context):
+        resp = tree_messages.SuccessResponse()
+        resp.success = self.tree.delete_index(list(request.table_path), request.column_id)
+        return resp
+
     def IntersectTables(self, request, context):
+        resp = tree_messages.IntersectTablesResponse()
+        by_column_id = list(request.by_column_ids) or request.by_column_id
+        algorithm, plan = self.tree.intersect_tables(by_column_id, list(request.table1_path),
+                                                     list(request.table2_path), list(request.new_table_path),
+                                                     request.algorithm or None, explain=True)
+        resp.success = algorithm is not None
+        if algorithm is not None:
+            resp.algorithm = algorithm
+        if request.explain and plan is not None:
+            resp.plan.update(plan)
+        return resp
+
+    def _operation(self, operation):
+        """The Root.batch form of an Operation."""
+        kind = operation.WhichOneof('kind')
+        request = getattr(operation, kind)
+        if kind in ('create', 'delete'):
+            path = MessageToDict(request.path)
+            if len(path) > self.ROW_DEPTH and isinstance(path[self.ROW_DEPTH], float):
+                path[self.ROW_DEPTH] = int(path[self.ROW_DEPTH])
+            return {'op': kind, 'args': {'path': path}}
+
+        args = {'table_path': list(request.table_path)}
+        if kind == 'create_rows':
+            args['rows'] = [from_jsonable_row(MessageToDict(row_message)) for row_message in request.rows]
+        elif kind == 'create_typed_rows':
+            kind, (_, args['columns']) = 'create_rows_from_columns', from_typed_rows(request.rows)
+        elif kind == 'create_columns':
+            args['columns'] = from_create_columns(request)
+        elif kind in ('create_index', 'delete_index'):
+            args['column_id'] = request.column_id
+            if kind == 'create_index':
+                args['kind'] = request.kind or 'hash'
+        elif kind == 'update_row':
+            args.update(row_id=request.row_id, sub_row=from_values(request.sub_row))
+        else:
+            args.update(column_id=request.column_id,
+                        sub_column=from_jsonable_column(MessageToDict(request.sub_column)))
+        return {'op': kind, 'args': args}
+
+    def Execute(self, request, context):
         resp = tree_messages.SuccessResponse()
-        resp.success = self.tree.intersect_tables(request.by_column_id, list(request.table1_path),
-                                                  list(request.table2_path), list(request.new_table_path))
+        resp.success = self.tree.batch(list(map(self._operation, request.operations)))
         return resp
@@ -1,36 +1,80 @@
-from flask import Flask, jsonify, request
+import json
+from functools import partial
+
+from flask import Flask, Response, jsonify, request, stream_with_context
 
 import api
+import exporter
 
 # from pymongo import MongoClient
 # api.mongo_client = MongoClient()
+# or the embedded storage:
+# from storage import Storage
+# api.storage = Storage('data')
 
 tree = api.create_tree()
 
+# the request body of an import is read in pieces of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+
+def explain_requested() -> bool:
+    """The ?explain=true flag: the response also holds the executed plan with estimated and actual row counts."""
+    return request.args.get('explain', 'false').lower() in ('1', 'true')
+
 
 def create(**kwargs):
-    return jsonify(success=tree.create(path=list(kwargs.values())))
+    return jsonify(success=tree.create(path=list(kwargs.values()), layout=request.args.get('layout')))
 
 
 def create_rows(**kwargs):
     return jsonify(success=tree.create_rows(table_path=list(kwargs.values()), rows=request.get_json()))
 
 
+def import_rows(**kwargs):
+    """Streams a CSV or JSON Lines body into the table; the response streams the progress reports as JSON Lines."""
+    reports = tree.import_rows(table_path=list(kwargs.values()),
+                               data=iter(partial(request.stream.read, UPLOAD_CHUNK_SIZE), b''),
+                               format_=request.args.get('format', 'csv'),
+                               batch_size=request.args.get('batch_size', type=int))
+    return Response(stream_with_context(json.dumps(report) + '\n' for report in reports),
+                    mimetype='application/x-ndjson')
+
+
+def export(**kwargs):
+    """Streams the table in chunks as ?format=csv, jsonl or binary; see Root.export."""
+    format_ = request.args.get('format', 'csv')
+    chunks = tree.export(table_path=list(kwargs.values()), format_=format_,
+                         chunk_size=request.args.get('chunk_size', type=int))
+    return Response(chunks, mimetype=exporter.MIME_TYPES[format_])
+
+
 def create_columns(**kwargs):
     return jsonify(success=tree.create_columns(table_path=list(kwargs.values()), columns=request.get_json()))
 
 
 def read(**kwargs):
-    return jsonify(tree.read(list(kwargs.values())))
+    with tree.snapshot(list(kwargs.values())) as node:
+        return jsonify(api.materialize(node))
+
+
+def read_rows(**kwargs):
+    if 'cursor' not in request.args and 'page_size' not in request.args:
+        return read(**kwargs)
+    rows, next_cursor = tree.read_rows_page(table_path=list(kwargs.values()), cursor=request.args.get('cursor'),
+                                            page_size=request.args.get('page_size', type=int))
+    return jsonify(rows=rows, next_cursor=next_cursor)
 
 
 def read_columns(**kwargs):
-    return jsonify(tree.read_columns(table_path=list(kwargs.values())))
+    columns = tree.read_columns(table_path=list(kwargs.values()))
+    # the columns of mapped tables are views over their files
+    return jsonify({column_id: list(values) for column_id, values in columns.items()})
 
 
 def read_column(**kwargs):
     column_id = kwargs.pop('column_id')
-    return jsonify(tree.read_column(table_path=list(kwargs.values()), column_id=column_id))
+    return jsonify(list(tree.read_column(table_path=list(kwargs.values()), column_id=column_id)))
 
 
 def read_value(**kwargs):
@@ -40,8 +84,32 @@ def read_value(**kwargs):
     return jsonify(tree.read(path))
 
 
+def query(**kwargs):
+    body = request.get_json(silent=True) or {}
+    rows, plan = tree.query(table_path=list(kwargs.values()), where=body.get('where'), column_ids=body.get('columns'),
+                            limit=body.get('limit'), offset=body.get('offset', 0), order_by=body.get('order_by'),
+                            explain=True)
+    if body.get('order_by'):
+        # JSON objects are unordered, sorted rows come as [row_id, values] pairs
+        rows = list(rows.items())
+    return jsonify(rows=rows, plan=plan) if explain_requested() else jsonify(rows)
+
+
+def aggregate(**kwargs):
+    body = request.get_json(silent=True) or {}
+    groups, plan = tree.aggregate(table_path=list(kwargs.values()), group_by=body.get('group_by'),
+                                  aggregates=body.get('aggregates'), where=body.get('where'), explain=True)
+    return jsonify(groups=groups, plan=plan) if explain_requested() else jsonify(groups)
+
+
 def read_schema(**kwargs):
-    return jsonify(tree.read_schema(table_path=list(kwargs.values())))
+    table_path = list(kwargs.values())
+    with tree.reading(table_path):
+        return jsonify(tree.read_schema(table_path=table_path))
+
+
+def read_stats(**kwargs):
+    return jsonify(tree.read_stats(table_path=list(kwargs.values())))
 
 
 def update_row(**kwargs):
@@ -59,8 +127,26 @@ def delete(**kwargs):
     return jsonify(success=tree.delete(path=list(kwargs.values())))
 
 
+def create_index(**kwargs):
+    column_id = kwargs.pop('column_id')
+    kind = (request.get_json(silent=True) or {}).get('kind', 'hash')
+    return jsonify(success=tree.create_index(table_path=list(kwargs.values()), column_id=column_id, kind=kind))
+
+
+def delete_index(**kwargs):
+    column_id = kwargs.pop('column_id')
+    return jsonify(success=tree.delete_index(table_path=list(kwargs.values()), column_id=column_id))
+
+
 def intersect_tables():
-    return jsonify(success=tree.intersect_tables(**request.get_json()))
+    algorithm, plan = tree.intersect_tables(**request.get_json(), explain=True)
+    if explain_requested():
+        return jsonify(success=algorithm is not None, algorithm=algorithm, plan=plan)
+    return jsonify(success=algorithm is not None, algorithm=algorithm)
+
+
+def batch():
+    return jsonify(success=tree.batch(ops=request.get_json()['operations']))
 
 
 app = Flask(__name__)
@@ -72,7 +158,9 @@ app.add_url_rule(rule='/tree/<base_id>/', view_func=delete, methods=['DELETE'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/', view_func=create, methods=['POST'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/', view_func=delete, methods=['DELETE'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/', view_func=create_rows, methods=['POST'])
-app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/', view_func=read, methods=['GET'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/', view_func=read_rows, methods=['GET'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/import/', view_func=import_rows, methods=['POST'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/export/', view_func=export, methods=['GET'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/<int:row_id>/', view_func=read, methods=['GET'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/<int:row_id>/', view_func=update_row, methods=['PUT'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/rows/<int:row_id>/', view_func=delete, methods=['DELETE'])
@@ -84,7 +172,13 @@ app.add_url_rule(rule='/tree/<base_id>/<table_id>/columns/<column_id>/', view_fu
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/columns/<column_id>/', view_func=delete, methods=['DELETE'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/columns/<column_id>/<int:row_id>/', view_func=read_value, methods=['GET'])
 app.add_url_rule(rule='/tree/<base_id>/<table_id>/schema/', view_func=read_schema, methods=['GET'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/stats/', view_func=read_stats, methods=['GET'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/query/', view_func=query, methods=['POST'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/aggregate/', view_func=aggregate, methods=['POST'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/indexes/<column_id>/', view_func=create_index, methods=['POST'])
+app.add_url_rule(rule='/tree/<base_id>/<table_id>/indexes/<column_id>/', view_func=delete_index, methods=['DELETE'])
 app.add_url_rule(rule='/tree/intersect_tables/', view_func=intersect_tables, methods=['POST'])
+app.add_url_rule(rule='/tree/batch/', view_func=batch, methods=['POST'])
 
 
 @app.route('/')
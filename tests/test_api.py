@@ -1,10 +1,27 @@
+import io
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
+import mongomock
 import requests
+from pymongo.errors import BulkWriteError
 
 import api
+import exporter
+import importer
 import grpc_.client as client
+import grpc_.messages.tree_pb2 as tree_messages
+import grpc_.services.tree as grpc_tree
+from grpc_.services.tree import TreeServicer
 from api import Root, Base, Table
+from storage import Storage
+from write_behind import MongoWriter
 
 
 class TestTable(TestCase):
@@ -39,12 +56,655 @@ class TestTable(TestCase):
         t = self.tree['db2', 'tb1']
         assert list(t.values()) == [[1, 4], [2, 5]]
 
+    def test_intersect_algorithms(self):
+        by_column_ids = ['co1', 'co2']
+        assert self.tree.intersect_tables(by_column_ids, ['db1', 'tb1'], ['db1', 'tb2'], ['db2', 'tb1']) == 'merge'
+        assert self.tree.read_columns(['db2', 'tb1']) == {'co1': [1, 2], 'co2': [4, 5]}
+        assert self.tree.intersect_tables(by_column_ids, ['db1', 'tb1'], ['db1', 'tb2'], ['db2', 'tb2'],
+                                          algorithm='hash') == 'hash'
+        assert self.tree.read_columns(['db2', 'tb2']) == {'co1': [1, 2], 'co2': [4, 5]}
+        # null keys match each other whichever plan is chosen
+        for table_id, values in (('tb3', [None, 1]), ('tb4', [None, 2])):
+            assert self.tree.create(['db2', table_id]) and self.tree.create_columns(['db2', table_id], {'co1': {}})
+            assert self.tree.create_rows(['db2', table_id], [{'co1': value} for value in values])
+        algorithm, plan = self.tree.intersect_tables('co1', ['db2', 'tb3'], ['db2', 'tb4'], ['db2', 'tb5'],
+                                                     explain=True)
+        assert algorithm == 'hash' and plan['operator'] == 'hash_join', plan
+        assert self.tree.read_columns(['db2', 'tb5']) == {'co1': [None]}
+
     def test_read(self):
         assert list(self.tree.read(['db1', 'tb1', 'co1']).values()) == [1, 2, 3]
 
     def test_create(self):
         assert self.tree.create(['db1', 'tb3'])
         self.tree.read(['db1', 'tb3'])
+        assert self.tree.read_schema(['db1', 'tb3']).layout == 'rows'
+        assert self.tree.create(['db1', 'tb4'], layout='chunks')
+        assert self.tree.read_schema(['db1', 'tb4']).layout == 'chunks'
+        assert not self.tree.create(['db1', 'tb5'], layout='pages')
+        assert not self.tree.create(['db3'], layout='chunks')
+
+    def test_columns(self):
+        t = self.tree['db1', 'tb1']
+        t.add_column('co3', {'values': [7, 8, 9]})
+        assert t.columns['co3'] == [7, 8, 9]
+        assert self.tree.read_column(['db1', 'tb1'], 'co3') == [7, 8, 9]
+        t.pop('co1')
+        assert self.tree.read_columns(['db1', 'tb1']) == {'co2': [4, 5, 6], 'co3': [7, 8, 9]}
+        assert list(t.values()) == [[4, 7], [5, 8], [6, 9]]
+
+    def test_add_many(self):
+        t = self.tree['db1', 'tb1']
+        assert self.tree.create_rows(['db1', 'tb1'], [{'co1': 7, 'co2': 8}, {'co1': 9, 'co2': 10}])
+        assert t.schema.row_index == 7 and list(t.keys())[-2:] == [6, 7]
+        assert t.columns == {'co1': [1, 2, 3, 7, 9], 'co2': [4, 5, 6, 8, 10]}
+
+        t.schema['columns']['co1']['validator_defs'] = [{'name': 'TypeValidator', 'params': {'type_descr': 'int'}}]
+        assert not self.tree.create_rows(['db1', 'tb1'], [{'co1': 11, 'co2': 12}, {'co1': 'x', 'co2': 13}])
+        assert len(t) == 5 and t.schema.row_index == 7
+
+    def test_validators(self):
+        t = self.tree['db1', 'tb1']
+        email_validator_def = {'name': 'EmailValidator', 'params': {}}
+        t.add_column('co3', {'validator_defs': [email_validator_def], 'values': ['a@b.c', 'd@e.f', 'g@h.i']})
+        pipeline = t.schema.validators('co3')
+        assert pipeline is t.schema.validators('co3')
+        assert pipeline.validate_many(['j@k.l']) and not pipeline.validate_many(['j@k.l', 'm n'])
+        t.pop('co3')
+        t.add_column('co3', {'values': ['m n'] * 3})
+        assert t.schema.validators('co3') == []
+
+    def test_add_only(self):
+        with self.assertRaises(TypeError):
+            self.tree['db3'] = Base('db3')
+        with self.assertRaises(TypeError):
+            self.tree['db1']['tb3'] = Table('tb3')
+        with self.assertRaises(TypeError):
+            self.tree['db1', 'tb1'][6] = 0
+        self.tree.add(Base('db3'))
+        assert 'db3' in self.tree
+
+    def test_indexes(self):
+        t = self.tree['db1', 'tb1']
+        assert self.tree.create_index(['db1', 'tb1'], 'co1')
+        assert self.tree.create_index(['db1', 'tb1'], 'co2', kind='sorted')
+        assert t.schema['indexes'] == {'co1': 'hash', 'co2': 'sorted'}
+        t.add({'co1': 1, 'co2': 7})
+        t[4]['co2'] = 8
+        t.pop(3)
+        assert t.find('co1', 1) == [6] and t.find('co1', 2) == [4]
+        assert t.find_range('co2', 6, 8) == [5, 6, 4]
+        t.pop('co1')
+        assert t.schema['indexes'] == {'co2': 'sorted'} and list(t.indexes) == ['co2']
+        assert self.tree.delete_index(['db1', 'tb1'], 'co2')
+        assert 'indexes' not in t.schema and t.find_range('co2', 6, 8) == [4, 5, 6]
+
+    def test_unindexable_values(self):
+        t = self.tree['db1', 'tb1']
+        assert self.tree.create_index(['db1', 'tb1'], 'co1', kind='sorted')
+        assert self.tree.create_index(['db1', 'tb1'], 'co2')
+        # nothing is changed by a value an index cannot take
+        assert not self.tree.create_rows(['db1', 'tb1'], [{'co1': None, 'co2': 1}])
+        assert not self.tree.create_rows_from_columns(['db1', 'tb1'], {'co1': [4], 'co2': [[1]]})
+        assert self.tree.create_rows(['db1', 'tb1'], [{'co1': 4, 'co2': 7}])
+        assert dict(t.items()) == {3: [1, 4], 4: [2, 5], 5: [3, 6], 6: [4, 7]}
+        assert self.tree.query(['db1', 'tb1'], where={'co2': 7}) == {6: [4, 7]}
+        assert not self.tree.update_row(['db1', 'tb1'], 4, {'co2': 0, 'co1': None})
+        assert not self.tree.update_column(['db1', 'tb1'], 'co1', {3: 0, 4: 'x'})
+        assert self.tree.query(['db1', 'tb1'], where={'co1': 2, 'co2': 5}) == {4: [2, 5]}
+        assert t.find_range('co1') == [3, 4, 5, 6] and t.find('co2', 0) == []
+
+    def test_query(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': 4, 'co2': 7}, {'co1': 5, 'co2': 8}])
+        where = {'co1': {'$gte': 2, '$lt': 5}, 'co2': {'$ne': 6}}
+        assert self.tree.query(['db1', 'tb1'], where) == {4: [2, 5], 6: [4, 7]}
+        assert self.tree.query(['db1', 'tb1'], where, column_ids=['co2'], offset=1) == {6: [7]}
+        t.create_index('co1', kind='sorted')
+        t.create_index('co2')
+        assert self.tree.query(['db1', 'tb1'], where) == {4: [2, 5], 6: [4, 7]}
+        assert self.tree.query(['db1', 'tb1'], {'co2': {'$in': [8, 4]}}, limit=1) == {3: [1, 4]}
+        with self.assertRaises(ValueError):
+            self.tree.query(['db1', 'tb1'], {'co1': {'$where': 'true'}})
+        for where, order_by in [({'id': 3}, None), ({'$expr': {}}, None), (None, ['co3'])]:
+            with self.assertRaises(ValueError):
+                self.tree.query(['db1', 'tb1'], where, order_by=order_by)
+        # operands of another type match nothing, through an index or not
+        assert self.tree.query(['db1', 'tb1'], {'co1': {'$gt': 'a'}}) == self.tree.query(['db1', 'tb1'], {'co1': 'a'}) \
+            == {}
+        assert self.tree.query(['db1', 'tb1'], {'co2': {'$in': [[1], 4]}}) == {3: [1, 4]}
+
+    def test_stats(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': i % 10, 'co2': None if i % 4 else str(i)} for i in range(1000)])
+        t.pop(3)
+        t[4]['co1'] = 20
+        stats = self.tree.read_stats(['db1', 'tb1'])
+        assert stats['row_count'] == 1002
+        co1, co2 = stats['columns']['co1'], stats['columns']['co2']
+        assert (co1['count'], co1['nulls'], co1['min'], co1['max']) == (1002, 0, 0, 20)
+        assert 9 <= co1['distinct'] <= 13 and sum(co1['histogram']['depths']) == 1002
+        # ints and strings have no order
+        assert (co2['count'], co2['nulls'], co2['min'], co2['histogram']['bounds']) == (1002, 750, None, [])
+        assert 230 <= co2['distinct'] <= 252
+        assert 80 <= t.column_stats('co1').estimate({'$gte': 2, '$lt': 4}) <= 320
+        assert t.column_stats('co1').estimate({'$eq': 30}) == 0
+
+        t.pop(5)
+        assert t.stats['co1'].count == 1001 and not t.stats['co1'].stale
+        assert self.tree.query(['db1', 'tb1'], {'co1': {'$gte': 0}, 'co2': '8'}) == {14: [8, '8']}
+        # the key ranges do not overlap, the join is skipped
+        assert self.tree.update_column(['db1', 'tb2'], 'co1', {3: 100, 4: 101, 5: 102})
+        assert self.tree.delete(['db1', 'tb2', 'co2'])
+        assert self.tree.intersect_tables('co1', ['db1', 'tb1'], ['db1', 'tb2'], ['db2', 'tb1'])
+        assert self.tree.read_stats(['db2', 'tb1'])['row_count'] == 0
+
+    def test_order_by(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': 2, 'co2': 3}, {'co1': None, 'co2': 5}, {'co1': 1, 'co2': 6}])
+        assert list(self.tree.query(['db1', 'tb1'], order_by=['co1'])) == [7, 3, 8, 4, 6, 5]
+        assert list(self.tree.query(['db1', 'tb1'], order_by=[['co1', -1]], limit=2)) == [5, 4]
+        assert self.tree.query(['db1', 'tb1'], {'co2': {'$gt': 3}}, order_by=[('co2', -1), 'co1'], limit=3, offset=1) \
+            == {5: [3, 6], 7: [None, 5], 4: [2, 5]}
+        t.create_index('co2', kind='sorted')
+        assert list(self.tree.query(['db1', 'tb1'], order_by=[('co2', -1)])) == [5, 8, 4, 7, 3, 6]
+        assert list(self.tree.query(['db1', 'tb1'], {'co1': {'$ne': 3}}, order_by=['co2'], limit=2)) == [6, 3]
+        # an updated key goes among the equal ones by row id, as without the index
+        assert self.tree.update_row(['db1', 'tb1'], 3, {'co2': 5})
+        rows, plan = self.tree.query(['db1', 'tb1'], order_by=['co2'], limit=4, explain=True)
+        assert list(rows) == [6, 3, 4, 7] and plan['operator'] == 'index_order', plan
+        with self.assertRaises(ValueError):
+            self.tree.query(['db1', 'tb1'], order_by=[('co2', 0)])
+
+    def test_aggregate(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': 1, 'co2': 7.5}, {'co1': 3, 'co2': None}])
+        assert self.tree.aggregate(['db1', 'tb1']) == [{'count': 5}]
+        aggregates = {'rows': {'$count': {}}, 'values': {'$count': 'co2'}, 'total': {'$sum': 'co2'},
+                      'low': {'$min': 'co2'}, 'high': {'$max': 'co2'}, 'mean': {'$avg': 'co2'}}
+        assert self.tree.aggregate(['db1', 'tb1'], ['co1'], aggregates) == [
+            {'co1': 1, 'rows': 2, 'values': 2, 'total': 11.5, 'low': 4, 'high': 7.5, 'mean': 5.75},
+            {'co1': 2, 'rows': 1, 'values': 1, 'total': 5, 'low': 5, 'high': 5, 'mean': 5.0},
+            {'co1': 3, 'rows': 2, 'values': 1, 'total': 6, 'low': 6, 'high': 6, 'mean': 6.0},
+        ]
+        assert self.tree.aggregate(['db1', 'tb1'], ['co1', 'co2'], where={'co1': {'$ne': 2}, 'co2': {'$gt': 5}}) \
+            == [{'co1': 3, 'co2': 6, 'count': 1}, {'co1': 1, 'co2': 7.5, 'count': 1}]
+        assert self.tree.aggregate(['db1', 'tb1'], aggregates={'total': {'$sum': 'co1'}, 'low': {'$min': 'co1'}},
+                                   where={'co1': 0}) == [{'total': 0, 'low': None}]
+        with self.assertRaises(ValueError):
+            self.tree.aggregate(['db1', 'tb1'], aggregates={'total': {'$median': 'co1'}})
+        for group_by, aggregates in [(['co3'], None), (None, {'total': {'$sum': 'co3'}}), (['id'], None)]:
+            with self.assertRaises(ValueError):
+                self.tree.aggregate(['db1', 'tb1'], group_by, aggregates)
+
+    def test_explain(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': i, 'co2': i % 7} for i in range(200)])
+        where = {'co1': 5, 'co2': {'$lt': 6}}
+        rows, plan = self.tree.query(['db1', 'tb1'], where, explain=True)
+        assert rows == {11: [5, 5]} and plan['children'][0]['operator'] == 'full_scan'
+        t.create_index('co1')
+        rows, plan = self.tree.query(['db1', 'tb1'], where, explain=True)
+        assert rows == {11: [5, 5]} and (plan['operator'], plan['conditions'], plan['actual_rows']) \
+            == ('filter', ['co1', 'co2'], 1)
+        assert plan['children'][0]['operator'] == 'index_scan' and plan['children'][0]['cost'] < 203
+        _, plan = self.tree.query(['db1', 'tb1'], order_by=['co2'], limit=3, explain=True)
+        assert (plan['operator'], plan['actual_rows']) == ('top_k', 3)
+        t.create_index('co2', kind='sorted')
+        rows, plan = self.tree.query(['db1', 'tb1'], order_by=['co2'], limit=3, explain=True)
+        assert list(rows) == [6, 13, 20] and plan['operator'] == 'index_order'
+        _, plan = self.tree.aggregate(['db1', 'tb1'], ['co2'], where={'co1': {'$gt': 100}}, explain=True)
+        assert [plan['operator'], plan['children'][0]['operator']] == ['hash_aggregate', 'filter']
+        assert (plan['estimated_rows'], plan['actual_rows']) == (7, 7)
+
+        tables = ['db1', 'tb1'], ['db1', 'tb2']
+        # the keys of tb1 are out of order now
+        assert self.tree.intersect_tables(['co1', 'co2'], *tables, ['db2', 'tb1'], 'merge', explain=True) \
+            == (None, None)
+        algorithm, plan = self.tree.intersect_tables(['co1', 'co2'], *tables, ['db2', 'tb2'], explain=True)
+        assert algorithm == 'hash' \
+            and (plan['operator'], plan['build'], plan['actual_rows']) == ('hash_join', 'right', 2)
+        assert self.tree.read(['db2']).keys() == {'tb2'}
+        assert self.tree.delete_index(['db1', 'tb1'], 'co1')
+        for path in tables:
+            assert self.tree.delete([*path, 'co2'])
+            assert self.tree.create_index(list(path), 'co1', kind='sorted')
+        algorithm, plan = self.tree.intersect_tables('co1', *tables, ['db2', 'tb3'], explain=True)
+        assert (algorithm, plan['operator'], plan['source']) == ('merge', 'merge_join', 'index')
+        assert self.tree.read_column(['db2', 'tb3'], 'co1') == [1, 1, 2, 2, 3, 3]
+
+    def test_batch(self):
+        t = self.tree['db1', 'tb1']
+        t.create_index('co1', kind='sorted')
+        int_column = {'validator_defs': [{'name': 'TypeValidator', 'params': {'type_descr': 'int'}}]}
+        assert self.tree.batch([
+            {'op': 'create', 'args': {'path': ['db2', 'tb1']}},
+            {'op': 'create_columns', 'args': {'table_path': ['db2', 'tb1'], 'columns': {'co1': int_column}}},
+            {'op': 'create_rows', 'args': {'table_path': ['db2', 'tb1'], 'rows': [{'co1': 1}, {'co1': 2}]}},
+            {'op': 'update_row', 'args': {'table_path': ['db1', 'tb1'], 'row_id': 3, 'sub_row': {'co1': 10}}},
+            {'op': 'delete', 'args': {'path': ['db1', 'tb1', 4]}},
+            # JSON object keys are strings
+            {'op': 'update_column', 'args': {'table_path': ['db1', 'tb1'], 'column_id': 'co2',
+                                             'sub_column': {'5': 60}}},
+        ])
+        rows = {3: [10, 4], 5: [3, 60]}
+        assert self.tree.read_column(['db2', 'tb1'], 'co1') == [1, 2] and dict(t.items()) == rows
+
+        # the last operation fails, the ones before are undone
+        assert not self.tree.batch([
+            {'op': 'create_rows', 'args': {'table_path': ['db1', 'tb1'], 'rows': [{'co1': 7, 'co2': 8}]}},
+            {'op': 'update_row', 'args': {'table_path': ['db1', 'tb1'], 'row_id': 3, 'sub_row': {'co1': 0}}},
+            {'op': 'delete', 'args': {'path': ['db1', 'tb2']}},
+            {'op': 'create', 'args': {'path': ['db3']}},
+            {'op': 'delete', 'args': {'path': ['db2', 'tb1', 0]}},
+            {'op': 'create_rows', 'args': {'table_path': ['db2', 'tb1'], 'rows': [{'co1': 'x'}]}},
+        ])
+        t = self.tree['db1', 'tb1']
+        assert dict(t.items()) == rows and t.schema.row_index == 5 and t.find_range('co1', 0, 100) == [5, 3]
+        assert list(self.tree) == ['db1', 'db2'] and list(self.tree['db1']) == ['tb1', 'tb2']
+        assert self.tree.read_column(['db2', 'tb1'], 'co1') == [1, 2]
+        assert not self.tree.batch([{'op': 'intersect_tables', 'args': {}}])
+
+    def test_import(self):
+        int_column = {'validator_defs': [{'name': 'TypeValidator', 'params': {'type_descr': 'int'}}]}
+        assert self.tree.create(['db2', 'tb1'])
+        assert self.tree.create_columns(['db2', 'tb1'], {'co1': int_column, 'co2': {}})
+        text = 'co2,co1\n' + ''.join(f'{"é" if i % 2 else i / 2},{i}\n' for i in range(25))
+        # UTF-8 cut inside a character and quoted fields
+        data = text.encode() + b'"x\n\xc3', b'\xa9",25\n'
+        reports = list(self.tree.import_rows(['db2', 'tb1'], data, batch_size=10))
+        assert [(report['rows'], report['done']) for report in reports] == [(10, False), (20, False), (26, False),
+                                                                            (26, True)]
+        assert all(report['success'] and report['rows_per_second'] > 0 for report in reports)
+        assert self.tree.read_column(['db2', 'tb1'], 'co1') == list(range(26))
+        assert self.tree.read_column(['db2', 'tb1'], 'co2')[:3] + self.tree.read_column(['db2', 'tb1'], 'co2')[-1:] \
+            == [0.0, 'é', 1.0, 'x\né']
+
+        lines = ['{"co1": 26, "co2": null}\n', '\n', '{"co1": 27, "co2": [1]}\n', '{"co1": "28", "co2": 2}\n']
+        reports = list(self.tree.import_rows(['db2', 'tb1'], iter(lines), 'jsonl', batch_size=2))
+        assert [(report['rows'], report['success']) for report in reports] == [(2, True), (2, False)]
+        assert self.tree.read_column(['db2', 'tb1'], 'co2')[-2:] == [None, [1]]
+        assert not list(self.tree.import_rows(['db2', 'tb1'], ['co1\n1\n']))[-1]['success']
+        reports = list(TreeServicer(api).ImportRows(iter([]), None))
+        assert [(report.done, report.success) for report in reports] == [(True, False)]
+
+        # only plain numbers are numbers in untyped columns
+        fields = ['-3', '0', '2.5', '-.5', '1e3', '1_000', ' 5 ', '+5', '007', 'nan', 'inf', '-Infinity', '٣', '0x1f']
+        assert [importer.infer(field) for field in fields] == [-3, 0, 2.5, -0.5, 1000.0, *fields[5:]]
+
+    def test_export(self):
+        assert self.tree.create_columns(['db1', 'tb1'], {'co3': {'values': ['a,b', True, None]}})
+        export = self.tree.export(['db1', 'tb1'], chunk_size=2)
+        assert next(export) == b'co1,co2,co3\n1,4,"a,b"\n2,5,true\n'
+        # the rest comes from the snapshot pinned by the first chunk
+        assert self.tree.update_row(['db1', 'tb1'], 5, {'co1': 7}) and self.tree.delete(['db1', 'tb1', 5])
+        assert b''.join(export) == b'3,6,\n'
+        assert self.tree.create_rows(['db1', 'tb1'], [{'co1': 8, 'co2': 1.5, 'co3': [1]}])
+
+        lines = b''.join(self.tree.export(['db1', 'tb1'], 'jsonl')).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [{'co1': 1, 'co2': 4, 'co3': 'a,b'},
+                                                         {'co1': 2, 'co2': 5, 'co3': True},
+                                                         {'co1': 8, 'co2': 1.5, 'co3': [1]}]
+        assert self.tree.create(['db2', 'tb1'])
+        assert self.tree.create_columns(['db2', 'tb1'], {'co1': {}, 'co2': {}, 'co3': {}})
+        assert list(self.tree.import_rows(['db2', 'tb1'], self.tree.export(['db1', 'tb1'], 'jsonl'), 'jsonl'))[-1][
+            'success']
+        assert self.tree.read_columns(['db2', 'tb1']) == self.tree.read_columns(['db1', 'tb1'])
+
+        batches = list(exporter.decode_binary(self.tree.export(['db1', 'tb1'], 'binary', chunk_size=2)))
+        assert batches == [([3, 4], {'co1': [1, 2], 'co2': [4, 5], 'co3': ['a,b', True]}),
+                           ([6], {'co1': [8], 'co2': [1.5], 'co3': [[1]]})]
+        # fixed-width columns are sent as raw buffers
+        assert array('q', [1, 2]).tobytes() in list(self.tree.export(['db1', 'tb1'], 'binary', chunk_size=2))[1]
+
+    def test_pages(self):
+        t = self.tree['db1', 'tb1']
+        t.add_many([{'co1': i, 'co2': i} for i in range(4)])
+        t.pop(4)
+        rows, cursor = self.tree.read_rows_page(['db1', 'tb1'], page_size=2)
+        assert rows == {3: [1, 4], 5: [3, 6]} and cursor
+        pages = [rows]
+        while cursor:
+            rows, cursor = self.tree.read_rows_page(['db1', 'tb1'], cursor, page_size=2)
+            pages.append(rows)
+        assert pages[1:] == [{6: [0, 0], 7: [1, 1]}, {8: [2, 2], 9: [3, 3]}]
+
+    def test_iter(self):
+        t = self.tree['db1', 'tb1']
+        t.pop(4)
+        assert list(self.tree.iter_rows(['db1', 'tb1'], chunk_size=1)) == [{3: [1, 4]}, {5: [3, 6]}]
+        assert list(self.tree.iter_column(['db1', 'tb1'], 'co2', chunk_size=1)) == [[4], [6]]
+        chunks = self.tree.iter_column(['db1', 'tb1'], 'co2', chunk_size=1)
+        assert next(chunks) == [4] and t.history.pins
+        # the rest comes from the snapshot pinned by the first chunk instead of a copy of the column
+        assert self.tree.update_row(['db1', 'tb1'], 5, {'co2': 0})
+        assert self.tree.create_rows(['db1', 'tb1'], [{'co1': 7, 'co2': 7}])
+        assert list(chunks) == [[6]] and not t.history.pins
+
+    def test_delete_row(self):
+        t = self.tree['db1', 'tb1']
+        t.pop(4)
+        assert self.tree.read_column(['db1', 'tb1'], 'co1') == [1, 3]
+        assert t['co2'] == {3: 4, 5: 6}
+        t[5]['co1'] = 10
+        assert t.columns['co1'][t.position(5)] == 10
+        t.pop(3)
+        assert t.row_ids == [5] and dict(t.items()) == {5: [10, 6]}
+
+    def test_snapshots(self):
+        t = self.tree['db1', 'tb1']
+        with self.tree.snapshot(['db1', 'tb1']) as snapshot:
+            assert self.tree.update_column(['db1', 'tb1'], 'co1', {3: 7, 4: 8})
+            assert self.tree.create_rows(['db1', 'tb1'], [{'co1': 9, 'co2': 9}])
+            assert self.tree.delete(['db1', 'tb1', 3]) and self.tree.delete(['db1', 'tb1', 4])
+            assert self.tree.create_columns(['db1', 'tb1'], {'co3': {'values': [0, 0]}})
+            assert self.tree.read_columns(['db1', 'tb1']) == {'co1': [3, 9], 'co2': [6, 9], 'co3': [0, 0]}
+            assert dict(snapshot.items()) == {3: [1, 4], 4: [2, 5], 5: [3, 6]}
+            with self.tree.snapshot(['db1']) as base_snapshot:
+                assert api.materialize(base_snapshot['tb1']) == {5: [3, 6, 0], 6: [9, 9, 0]}
+        assert not t.history.records and not snapshot.history
+
+        with self.tree.snapshot(['db1', 'tb1']):
+            assert self.tree.update_row(['db1', 'tb1'], 5, {'co1': 1})
+            assert len(t.history.records) == 1
+        assert not t.history.records and not t.history.pins
+
+    def test_mapped_tables(self):
+        assert self.tree.create_columns(['db1', 'tb1'], {'co3': {'values': ['a', 'bé', '']},
+                                                         'co4': {'values': [None, 1.5, [1]]}})
+        self.tree['db1', 'tb1'].pop(4)
+        with TemporaryDirectory() as directory:
+            assert self.tree.save_table(['db1', 'tb1'], directory)
+            assert self.tree.open_table(['db2', 'tb1'], directory)
+            assert not self.tree.open_table(['db2', 'tb1'], directory)
+            t = self.tree['db2', 'tb1']
+            assert isinstance(t.column('co1'), memoryview) and list(t.keys()) == [3, 5]
+            assert self.tree.read_column(['db2', 'tb1'], 'co1').tolist() == [1, 3]
+            assert {column_id: list(values) for column_id, values in self.tree.read_columns(['db2', 'tb1']).items()} \
+                == {'co1': [1, 3], 'co2': [4, 6], 'co3': ['a', ''], 'co4': [None, [1]]}
+            assert list(self.tree.iter_column(['db2', 'tb1'], 'co3', chunk_size=1)) == [['a'], ['']]
+            assert list(exporter.decode_binary(self.tree.export(['db2', 'tb1'], 'binary'))) \
+                == [([3, 5], {'co1': [1, 3], 'co2': [4, 6], 'co3': ['a', ''], 'co4': [None, [1]]})]
+            with self.tree.snapshot(['db2']) as base_snapshot:
+                assert api.materialize(base_snapshot)['tb1'] == {3: [1, 4, 'a', None], 5: [3, 6, '', [1]]}
+            # mounted tables serve the reads of tree tables
+            assert self.tree.query(['db2', 'tb1'], {'co1': {'$gt': 1}}) == {5: [3, 6, '', [1]]}
+            rows, plan = self.tree.query(['db2', 'tb1'], order_by=[('co2', -1)], column_ids=['co3'], limit=1,
+                                         explain=True)
+            assert rows == {5: ['']} and plan['operator'] == 'top_k', plan
+            assert self.tree.read_rows_page(['db2', 'tb1'], page_size=1) \
+                == ({3: [1, 4, 'a', None]}, api.encode_cursor(3))
+            assert list(self.tree.iter_rows(['db2', 'tb1'], chunk_size=1)) == [{3: [1, 4, 'a', None]},
+                                                                               {5: [3, 6, '', [1]]}]
+            assert self.tree.read(['db2', 'tb1', 5]) == [3, 6, '', [1]]
+            assert self.tree.read(['db2', 'tb1', 5, 'co3']) == ''
+            with self.assertRaises(KeyError):
+                self.tree.read(['db2', 'tb1', 4])
+            assert self.tree.intersect_tables(['co1', 'co2'], ['db2', 'tb1'], ['db1', 'tb2'], ['db2', 'tb2']) == 'merge'
+            assert self.tree.read_columns(['db2', 'tb2']) == {'co1': [1], 'co2': [4], 'co3': ['a'], 'co4': [None]}
+            assert not self.tree.create_rows(['db2', 'tb1'], [{'co1': 0, 'co2': 0, 'co3': '', 'co4': None}])
+            with self.assertRaises(AssertionError):
+                self.tree['db2'].add(self.tree['db1', 'tb2'].snapshot(), 'tb3')
+            assert self.tree.read_schema(['db2', 'tb1'])['columns'].keys() == {'co1', 'co2', 'co3', 'co4'}
+            # a rolled back batch mounts the table again, open
+            assert not self.tree.batch([{'op': 'delete', 'args': {'path': ['db2', 'tb1']}},
+                                        {'op': 'delete', 'args': {'path': ['db2', 'tb9']}}])
+            assert self.tree['db2', 'tb1'] is t and not any(map_.closed for map_ in t.maps)
+            # deleting it closes the files, once the readers streaming from it are done
+            stream = self.tree.iter_column(['db2', 'tb1'], 'co3', chunk_size=1)
+            assert next(stream) == ['a']
+            assert self.tree.delete(['db2', 'tb1'])
+            assert not any(map_.closed for map_ in t.maps) and list(stream) == [['']]
+            assert t.maps and all(map_.closed for map_ in t.maps)
+
+
+class TestStorage(TestCase):
+    def setUp(self):
+        api.mongo_client = None
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        api.storage.close()
+        api.storage = None
+        self.directory.cleanup()
+
+    def restart(self, **kwargs) -> Root:
+        if api.storage is not None:
+            api.storage.close()
+        api.storage = Storage(self.directory.name, **kwargs)
+        return api.create_tree()
+
+    def test_recovery(self):
+        tree = self.restart()
+        assert tree.create(['db']) and tree.create(['db', 'tb']) and tree.create(['db', 'tb2'])
+        assert tree.create_columns(['db', 'tb'], {'co1': {}, 'co2': {}})
+        assert tree.create_rows(['db', 'tb'], [{'co1': i, 'co2': str(i)} for i in range(5)])
+        assert tree.update_column(['db', 'tb'], 'co1', {0: 10, 1: 11})
+        assert tree.delete(['db', 'tb', 2]) and tree.delete(['db', 'tb2'])
+        assert tree.create_index(['db', 'tb'], 'co1', 'sorted')
+        rows = dict(tree.read(['db', 'tb']).items())
+
+        tree = self.restart(fsync='never')
+        assert dict(tree.read(['db', 'tb']).items()) == rows and list(tree['db']) == ['tb']
+        assert tree.read(['db', 'tb']).find_range('co1', 10, 11) == [0, 1]
+
+        tree.checkpoint()
+        assert tree.update_row(['db', 'tb'], 3, {'co1': 13})
+        assert tree.create_rows_from_columns(['db', 'tb'], {'co1': [5], 'co2': ['5']})
+        rows = dict(tree.read(['db', 'tb']).items())
+        segments = api.storage.segments()
+        assert len(segments) == 1 and os.path.exists(os.path.join(self.directory.name, 'snapshot.json'))
+
+        # a record torn by a crash is dropped
+        with open(api.storage.segment_path(segments[0]), 'a') as file:
+            file.write('{"op": "delete", "ar')
+        tree = self.restart(fsync='interval')
+        assert dict(tree.read(['db', 'tb']).items()) == rows
+        assert tree.read_schema(['db', 'tb']).row_index == 5
+
+    def test_failed_insert_recovery(self):
+        tree = self.restart()
+        assert tree.create(['db']) and tree.create(['db', 'tb'])
+        assert tree.create_columns(['db', 'tb'], {'co1': {}})
+        assert tree.create_index(['db', 'tb'], 'co1', 'sorted')
+        assert tree.create_rows(['db', 'tb'], [{'co1': 1}])
+        assert not tree.create_rows(['db', 'tb'], [{'co1': None}])
+        assert tree.create_rows(['db', 'tb'], [{'co1': 2}])
+        rows = dict(tree.read(['db', 'tb']).items())
+        assert rows == {0: [1], 1: [2]}
+        tree = self.restart()
+        assert dict(tree.read(['db', 'tb']).items()) == rows
+
+    def test_unloggable_values(self):
+        tree = self.restart()
+        assert tree.create(['db']) and tree.create(['db', 'tb']) and tree.create_columns(['db', 'tb'], {'co1': {}})
+        assert tree.create_rows(['db', 'tb'], [{'co1': [1]}])
+        # not JSON, or read back as something else: rejected before anything changes
+        assert not tree.create_rows(['db', 'tb'], [{'co1': object()}])
+        assert not tree.create_rows(['db', 'tb'], [{'co1': (1, 2)}])
+        assert not tree.update_row(['db', 'tb'], 0, {'co1': float('nan')})
+        assert not tree.update_column(['db', 'tb'], 'co1', {0: {1: 2}})
+        assert not tree.batch([{'op': 'update_row', 'args': {'table_path': ['db', 'tb'], 'row_id': 0,
+                                                             'sub_row': {'co1': (3,)}}}])
+        assert dict(tree.read(['db', 'tb']).items()) == {0: [[1]]}
+        tree = self.restart()
+        assert dict(tree.read(['db', 'tb']).items()) == {0: [[1]]}
+
+    def test_batch_recovery(self):
+        tree = self.restart()
+        assert tree.create(['db'])
+        assert tree.batch([{'op': 'create', 'args': {'path': ['db', 'tb']}},
+                           {'op': 'create_columns', 'args': {'table_path': ['db', 'tb'], 'columns': {'co1': {}}}},
+                           {'op': 'create_rows', 'args': {'table_path': ['db', 'tb'],
+                                                          'rows': [{'co1': 1}, {'co1': 2}]}},
+                           {'op': 'update_column', 'args': {'table_path': ['db', 'tb'], 'column_id': 'co1',
+                                                            'sub_column': {0: 3}}}])
+        assert not tree.batch([{'op': 'delete', 'args': {'path': ['db', 'tb', 1]}},
+                               {'op': 'delete', 'args': {'path': ['db', 'tb', 5]}}])
+        # the batch is one record, the failed one none
+        assert [op for op, _ in api.storage.records(0)] == ['create', 'batch']
+        tree = self.restart()
+        assert dict(tree.read(['db', 'tb']).items()) == {0: [3], 1: [2]}
+
+
+class TestMongoWriter(TestCase):
+    def setUp(self):
+        database = mongomock.MongoClient().db
+        self.a, self.b = database.a, database.b
+        self.a.create_index('id', unique=True)
+
+    def ids(self, collection) -> list:
+        return sorted(document['id'] for document in collection.find())
+
+    def test_group(self):
+        writer = MongoWriter(MongoWriter.GROUP, batch_size=3, interval=60)
+        writer.insert_one(self.a, {'id': 0})
+        writer.update_one(self.a, {'id': 0}, {'$set': {'x': 1}})
+        assert writer.pending(self.a) and not self.ids(self.a)
+        # the batch size is reached
+        writer.insert_one(self.b, {'id': 1})
+        assert not writer.queue and not writer.pending(self.a)
+        assert list(self.a.find({}, {'_id': 0})) == [{'id': 0, 'x': 1}] and self.ids(self.b) == [1]
+
+        writer.configure(interval=0)
+        writer.insert_one(self.a, {'id': 2})
+        assert self.ids(self.a) == [0, 2]
+
+    def test_async(self):
+        writer = MongoWriter()
+        writer.configure(MongoWriter.ASYNC, interval=0.01)
+        writer.insert_many(self.a, [{'id': i} for i in range(3)])
+        # sent by the background thread
+        for _ in range(500):
+            if self.ids(self.a) == [0, 1, 2]:
+                break
+            time.sleep(0.01)
+        assert self.ids(self.a) == [0, 1, 2] and not writer.queue
+
+    def test_failed_flush(self):
+        writer = MongoWriter(MongoWriter.GROUP, interval=60)
+        self.a.insert_one({'id': 1})
+        for collection, id_ in [(self.a, 2), (self.a, 1), (self.a, 3), (self.b, 4)]:
+            writer.insert_one(collection, {'id': id_})
+        with self.assertRaises(BulkWriteError):
+            writer.flush()
+        # the writes after the failed one are sent by the next flush
+        assert self.ids(self.a) == [1, 2] and writer.pending(self.b)
+        writer.flush()
+        assert self.ids(self.a) == [1, 2, 3] and self.ids(self.b) == [4]
+
+    def test_failed_background_flush(self):
+        writer = MongoWriter()
+        writer.configure(MongoWriter.ASYNC, batch_size=1, interval=60)
+        self.a.insert_one({'id': 1})
+        writer.insert_one(self.a, {'id': 1})
+        for _ in range(500):
+            if writer.error is not None:
+                break
+            time.sleep(0.01)
+        # the next write reports the error, but is sent all the same
+        with self.assertRaises(BulkWriteError):
+            writer.insert_one(self.a, {'id': 2})
+        assert self.ids(self.a) == [1, 2] and not writer.queue and writer.error is None
+
+    def test_holding(self):
+        writer = MongoWriter()
+        with writer.holding():
+            writer.insert_one(self.a, {'id': 0})
+            writer.drop(self.b)
+            assert writer.held and not self.ids(self.a)
+        assert self.ids(self.a) == [0]
+        self.b.insert_one({'id': 1})
+        with self.assertRaises(ValueError), writer.holding():
+            writer.insert_one(self.a, {'id': 1})
+            writer.drop(self.b)
+            raise ValueError
+        assert self.ids(self.a) == [0] and self.ids(self.b) == [1] and not writer.queue
+
+
+class TestMongo(TestCase):
+    def setUp(self):
+        api.mongo_client = mongomock.MongoClient()
+        api.mongo_writer.configure(MongoWriter.SYNC)
+        api.table_cache.clear()
+        self.tree = api.create_tree()
+        assert self.tree.create(['db']) and self.tree.create(['db', 'tb'])
+        assert self.tree.create_columns(['db', 'tb'], {'co1': {}, 'co2': {}})
+        assert self.tree.create_rows(['db', 'tb'], [{'co1': i, 'co2': -i} for i in range(3)])
+
+    def tearDown(self):
+        api.mongo_client = None
+        api.table_cache.clear()
+
+    def test_query_keys(self):
+        assert self.tree.query(['db', 'tb'], {'co1': {'$gte': 1}}, order_by=[('co2', -1)]) == {1: [1, -1], 2: [2, -2]}
+        assert self.tree.delete(['db', 'tb', 'co2'])
+        # the id field, Mongo operators and dropped columns are not columns
+        for where, order_by, column_ids in [({'id': 'schema'}, None, None), ({'$expr': {'$eq': [1, 1]}}, None, None),
+                                            ({'co2': 0}, None, None), (None, ['co2'], None), (None, None, ['co2'])]:
+            with self.assertRaises(ValueError):
+                self.tree.query(['db', 'tb'], where, column_ids, order_by=order_by)
+        with self.assertRaises(ValueError):
+            self.tree.aggregate(['db', 'tb'], where={'id': 'schema'})
+        # nor are they grouped or aggregated from stale document fields
+        for group_by, aggregates in [(['id'], None), (['co2'], None), (None, {'total': {'$sum': 'co2'}})]:
+            with self.assertRaises(ValueError):
+                self.tree.aggregate(['db', 'tb'], group_by, aggregates)
+
+    def test_servicer_pushdown(self):
+        servicer = TreeServicer(api)
+        api.table_cache.clear()
+        request = tree_messages.QueryRowsRequest(table_path=['db', 'tb'])
+        request.where.update({'co1': {'$gte': 1}})
+        assert grpc_tree.from_typed_rows(servicer.QueryRows(request, None)) \
+            == ([1, 2], {'co1': [1, 2], 'co2': [-1, -2]})
+        request = tree_messages.StreamRequest(table_path=['db', 'tb'], chunk_size=2)
+        assert [grpc_tree.from_typed_rows(rows)[0] for rows in servicer.StreamRows(request, None)] == [[0, 1], [2]]
+        # the table was never loaded
+        assert not api.table_cache.tables
+
+    def test_table_cache(self):
+        collection = api.mongo_client['db']['tb']
+        t = self.tree['db', 'tb']
+        assert self.tree['db', 'tb'] is t and self.tree.read(['db', 'tb', 1]) == [1, -1]
+        # another process writes and bumps the version
+        collection.update_one({'id': 1}, {'$set': {'co1': 10}})
+        assert self.tree['db', 'tb'] is t
+        collection.update_one({'id': 'schema'}, {'$inc': {'version': 1}})
+        assert self.tree['db', 'tb'] is not t and self.tree.read(['db', 'tb', 1]) == [10, -1]
+
+    def test_table_cache_concurrent_writer(self):
+        collection = api.mongo_client['db']['tb']
+        t = self.tree['db', 'tb']
+        assert self.tree.update_row(['db', 'tb'], 0, {'co1': 5})
+        # our own write keeps the copy current
+        assert self.tree['db', 'tb'] is t and t.version == collection.find_one({'id': 'schema'})['version']
+        collection.update_one({'id': 2}, {'$set': {'co2': 20}})
+        collection.update_one({'id': 'schema'}, {'$inc': {'version': 1}})
+        # a write through the copy after that sees that someone else wrote in between
+        t.touch()
+        assert t.version is None and self.tree['db', 'tb'] is not t
+        assert self.tree.update_row(['db', 'tb'], 0, {'co1': 6})
+        assert self.tree.read_columns(['db', 'tb']) == {'co1': [6, 1, 2], 'co2': [0, -1, 20]}
+
+    def test_table_cache_eviction(self):
+        cache = api.TableCache(max_size=2)
+        base = api.mongo_client['db']
+        for table_id in ['tb1', 'tb2']:
+            assert self.tree.create(['db', table_id])
+        t, t1 = cache.get('db', 'tb', base['tb']), cache.get('db', 'tb1', base['tb1'])
+        # the least recently used table goes first
+        assert cache.get('db', 'tb', base['tb']) is t
+        cache.get('db', 'tb2', base['tb2'])
+        assert list(cache.tables) == [('db', 'tb'), ('db', 'tb2')]
+        assert cache.get('db', 'tb', base['tb']) is t and cache.get('db', 'tb1', base['tb1']) is not t1
+        assert not api.TableCache(max_size=0).tables
+
+    def test_targeted_loads(self):
+        collection = api.mongo_client['db']['tb']
+        assert collection.index_information()['id_1']['unique']
+        with self.assertRaises(Exception):
+            collection.insert_one({'id': 1})
 
 
 class TestRest(TestCase):
@@ -106,14 +766,53 @@ class TestRest(TestCase):
         assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/').ok
         assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co1/').ok
         assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co1/0/').ok
+        r = requests.get('http://localhost:5000/tree/db_test/tb_test/rows/?page_size=1')
+        assert r.json()['rows'] == {'0': [1, 2, 5]} and r.json()['next_cursor'], (r.ok, r.json())
+        r = requests.get(f'http://localhost:5000/tree/db_test/tb_test/rows/?cursor={r.json()["next_cursor"]}')
+        assert r.json() == {'rows': {'1': [3, 4, 6]}, 'next_cursor': None}, (r.ok, r.json())
+        r = requests.post('http://localhost:5000/tree/db_test/tb_test/query/',
+                          json={'where': {'co1': {'$gt': 1}}, 'columns': ['co2']})
+        assert r.json() == {'1': [4]}, (r.ok, r.json())
+        r = requests.post('http://localhost:5000/tree/db_test/tb_test/query/',
+                          json={'order_by': [['co1', -1]], 'limit': 1, 'columns': ['co1']})
+        assert r.json() == [[1, [3]]], (r.ok, r.json())
+        r = requests.post('http://localhost:5000/tree/db_test/tb_test/query/?explain=true',
+                          json={'where': {'co1': {'$gt': 1}}, 'columns': ['co2']})
+        assert r.json()['rows'] == {'1': [4]} and r.json()['plan']['actual_rows'] == 1, (r.ok, r.json())
+        r = requests.get('http://localhost:5000/tree/db_test/tb_test/stats/')
+        assert r.json()['row_count'] == 2 and r.json()['columns']['co3']['max'] == 6, (r.ok, r.json())
+        r = requests.post('http://localhost:5000/tree/db_test/tb_test/aggregate/',
+                          json={'group_by': ['co3'], 'aggregates': {'total': {'$sum': 'co1'}}})
+        assert r.json() == [{'co3': 5, 'total': 1}, {'co3': 6, 'total': 3}], (r.ok, r.json())
+        r = requests.get('http://localhost:5000/tree/db_test/tb_test/export/?chunk_size=1')
+        assert r.headers['Content-Type'].startswith('text/csv') and r.content == b'co1,co2,co3\n1,2,5\n3,4,6\n', \
+            (r.ok, r.content)
+        r = requests.get('http://localhost:5000/tree/db_test/tb_test/export/?format=binary', stream=True)
+        assert list(exporter.decode_binary(r.iter_content(7))) \
+            == [([0, 1], {'co1': [1, 3], 'co2': [2, 4], 'co3': [5, 6]})], (r.ok, r.content)
 
     def test3_update(self):
         assert requests.put('http://localhost:5000/tree/db_test/tb_test/rows/0/', json={'co1': 7}).json()['success']
         assert requests.get('http://localhost:5000/tree/db_test/tb_test/rows/0/co1/').json() == 7
         assert requests.put('http://localhost:5000/tree/db_test/tb_test/columns/co1/', json={0: 8}).json()['success']
         assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co1/0/').json() == 8
+        ops = [{'op': 'update_row', 'args': {'table_path': ['db_test', 'tb_test'], 'row_id': 0, 'sub_row': {'co1': 9}}},
+               {'op': 'delete', 'args': {'path': ['db_test', 'tb_test', 99]}}]
+        assert not requests.post('http://localhost:5000/tree/batch/', json={'operations': ops}).json()['success']
+        assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co1/0/').json() == 8
+        assert requests.post('http://localhost:5000/tree/batch/', json={'operations': ops[:1]}).json()['success']
+        assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co1/0/').json() == 9
+        r = requests.post('http://localhost:5000/tree/db_test/tb_test/import/?format=jsonl&batch_size=1',
+                          data=(line.encode() for line in ['{"co1": 10, "co2": 11, ', '"co3": 12}\n'] * 2))
+        reports = list(map(json.loads, r.iter_lines()))
+        assert [(report['rows'], report['done'], report['success']) for report in reports] \
+            == [(1, False, True), (2, False, True), (2, True, True)], reports
+        assert requests.get('http://localhost:5000/tree/db_test/tb_test/columns/co3/').json()[-2:] == [12, 12]
 
     def test4_delete(self):
+        assert requests.post('http://localhost:5000/tree/db_test/tb_test/indexes/co1/',
+                             json={'kind': 'sorted'}).json()['success']
+        assert requests.delete('http://localhost:5000/tree/db_test/tb_test/indexes/co1/').json()['success']
         assert requests.delete('http://localhost:5000/tree/db_test/tb_test/columns/co1/').json()['success']
         assert requests.delete('http://localhost:5000/tree/db_test/tb_test/rows/0/').json()['success']
         assert requests.delete('http://localhost:5000/tree/db_test/tb_test/').json()['success']
@@ -173,15 +872,115 @@ class TestGRPC(TestCase):
         client.read_columns('db_test', 'tb_test')
         client.read_column('db_test', 'tb_test', 'co1')
         client.read_value('db_test', 'tb_test', row_id=0, column_id='co1')
+        assert len(list(client.iter_rows_pages('db_test', 'tb_test', page_size=1))) == 2
+        assert [list(rows) for rows in client.stream_rows('db_test', 'tb_test', chunk_size=1)] == [[0], [1]]
+        assert list(client.stream_column('db_test', 'tb_test', 'co1', chunk_size=1)) == [[1], [3]]
+        assert client.query_rows('db_test', 'tb_test', {'co1': {'$gt': 1}}, columns=['co2']) == {1: [4]}
+        assert client.create_table('db_test', 'tb_ingest').success
+        assert client.create_columns('db_test', 'tb_ingest', {'co1': {}}).success
+        response = client.ingest_rows('db_test', 'tb_ingest', ({'co1': i} for i in range(5)), chunk_size=2)
+        assert response.success and response.row_count == 5, response
+        assert client.read_column('db_test', 'tb_ingest', 'co1') == list(range(5))
+        assert client.create_typed_rows('db_test', 'tb_ingest', [{'co1': 5.5}, {'co1': None}]).success
+        assert client.read_typed_rows('db_test', 'tb_ingest') == {**{i: [i] for i in range(5)}, 5: [5.5], 6: [None]}
+        aggregates = {'total': {'$sum': 'co1'}, 'high': {'$max': 'co1'}}
+        assert client.aggregate('db_test', 'tb_ingest', aggregates=aggregates) == [{'total': 15.5, 'high': 5.5}]
+        assert client.aggregate('db_test', 'tb_ingest', ['co1'], where={'co1': {'$gt': 3}}) \
+            == [{'co1': 4, 'count': 1}, {'co1': 5.5, 'count': 1}]
+        assert client.query_sorted_rows('db_test', 'tb_ingest', [('co1', -1)], limit=3) == {5: [5.5], 4: [4], 3: [3]}
+        assert client.query_sorted_rows('db_test', 'tb_ingest', ['co1'], limit=2) == {6: [None], 0: [0]}
+        rows, plan = client.query_sorted_rows('db_test', 'tb_ingest', ['co1'], limit=2, explain=True)
+        assert list(rows) == [6, 0] and (plan['operator'], plan['actual_rows']) == ('top_k', 2), plan
+        groups, plan = client.aggregate('db_test', 'tb_ingest', where={'co1': {'$lt': 2}}, explain=True)
+        assert groups == [{'count': 2}] and plan['operator'] == 'aggregate', plan
+        stats = client.read_stats('db_test', 'tb_ingest')
+        assert stats['row_count'] == 7 and {key: stats['columns']['co1'][key] for key in ('nulls', 'min', 'max')} \
+            == {'nulls': 1, 'min': 0, 'max': 5.5}, stats
 
     def test3_put(self):
         assert client.update_row('db_test', 'tb_test', row_id=0, sub_row={'co1': 7}).success
         assert client.read_value('db_test', 'tb_test', row_id=0, column_id='co1') == 7
         assert client.update_column('db_test', 'tb_test', column_id='co1', sub_column={0: 8}).success
         assert client.read_value('db_test', 'tb_test', row_id=0, column_id='co1') == 8
+        assert client.update_row('db_test', 'tb_test', row_id=1, sub_row={'co2': [1, {'a': None}], 'co3': None}).success
+        assert client.read_columns('db_test', 'tb_test')['co2'] == [2, [1, {'a': None}]]
+        assert list(client.stream_column('db_test', 'tb_test', 'co3')) == [[5, None]]
+        table_path = ['db_test', 'tb_ingest']
+        ops = [{'op': 'create_rows', 'args': {'table_path': table_path, 'rows': [{'co1': 7}]}},
+               {'op': 'update_column', 'args': {'table_path': table_path, 'column_id': 'co1', 'sub_column': {0: 10}}},
+               {'op': 'delete', 'args': {'path': [*table_path, 6]}}]
+        assert client.execute(ops).success
+        assert client.read_column(*table_path, 'co1') == [10, 1, 2, 3, 4, 5.5, 7]
+        reports = list(client.import_rows(*table_path, io.BytesIO(b'co1\n8\n9.5\n\n'), chunk_size=3))
+        assert [(report['rows'], report['done'], report['success']) for report in reports] \
+            == [(2, False, True), (2, True, True)], reports
+        assert client.read_column(*table_path, 'co1')[-2:] == [8, 9.5]
+        ops = [{'op': 'delete', 'args': {'path': [*table_path, 0]}},
+               {'op': 'create_index', 'args': {'table_path': table_path, 'column_id': 'co9'}}]
+        assert not client.execute(ops).success
+        assert client.read_column(*table_path, 'co1') == [10, 1, 2, 3, 4, 5.5, 7, 8, 9.5]
+        assert b''.join(client.export_table(*table_path, chunk_size=4)) == b'co1\n10\n1\n2\n3\n4\n5.5\n7\n8\n9.5\n'
+        batches = list(exporter.decode_binary(client.export_table(*table_path, 'binary')))
+        assert [columns['co1'] for _, columns in batches] == [[10, 1, 2, 3, 4, 5.5, 7, 8, 9.5]], batches
 
     def test4_delete(self):
+        assert client.create_index('db_test', 'tb_test', 'co1', kind='sorted').success
+        assert client.delete_index('db_test', 'tb_test', 'co1').success
         assert client.delete_column('db_test', 'tb_test', 'co1').success
         assert client.delete_row('db_test', 'tb_test', row_id=0).success
         assert client.delete_table('db_test', 'tb_test').success
         assert client.delete_base('db_test').success
+
+
+class TestConcurrency(TestCase):
+    def setUp(self):
+        api.mongo_client = None
+        self.servicer = TreeServicer(api)
+        self.tree = self.servicer.tree
+        assert self.tree.create(['db_stress']) and self.tree.create(['db_stress', 'tb1'])
+        assert self.tree.create_columns(['db_stress', 'tb1'], {'co1': {}})
+        assert self.tree.create_index(['db_stress', 'tb1'], 'co1', 'sorted')
+        # switch threads as often as possible to surface races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_servicer(self):
+        def write(i):
+            for j in range(25):
+                request = tree_messages.CreateRowsRequest()
+                request.table_path.extend(['db_stress', 'tb1'])
+                for k in range(4):
+                    request.rows.add().update({'co1': ['int', 100 * i + 4 * j + k]})
+                assert self.servicer.CreateRows(request, None).success
+
+        def read(_):
+            request = tree_messages.PathRequest()
+            request.path.extend(['db_stress', 'tb1'])
+            for _ in range(25):
+                assert len(self.servicer.ReadRows(request, None)) % 4 == 0
+                assert len(self.tree.query(['db_stress', 'tb1'], {'co1': {'$lt': 10 ** 6}})) % 4 == 0
+
+        def create(i):
+            assert self.tree.create(['db_stress', f'tb_new{i}'])
+            assert self.tree.delete(['db_stress', f'tb_new{i}'])
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [executor.submit(function, i) for i in range(8) for function in (write, read, create)]
+            for future in futures:
+                future.result()
+
+        table = self.tree.read(['db_stress', 'tb1'])
+        assert sorted(table.keys()) == list(range(800))
+        assert sorted(table.column('co1')) == sorted(100 * i + j for i in range(8) for j in range(100))
+        assert len(table.find_range('co1', 0, 99)) == 100
+
+    def test_snapshot_does_not_block_writers(self):
+        assert self.tree.create_rows(['db_stress', 'tb1'], [{'co1': i} for i in range(4)])
+        with self.tree.snapshot([]) as tree_snapshot, ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.tree.update_column, ['db_stress', 'tb1'], 'co1', {0: 10, 1: 11})
+            assert future.result(timeout=10)
+            assert tree_snapshot['db_stress']['tb1'].column('co1') == [0, 1, 2, 3]
+        assert self.tree.read_column(['db_stress', 'tb1'], 'co1') == [10, 11, 2, 3]